@@ -0,0 +1,397 @@
+# src/cli.py
+# -*- coding: utf-8 -*-
+"""
+Ejecución de diseños por lotes, sin interfaz gráfica.
+
+Lee diseños de un CSV o JSONL (una fila por diseño, con los mismos campos que
+la GUI pasa a DisenoTransformador: tipo, S, E1, E2, f, acero, conn, taps,
+ciclo_carga, b_opcional, ...), los calcula en un pool de procesos y escribe los
+resultados fila a fila en CSV o JSONL, en el orden de entrada. La entrada se lee
+como flujo y el número de bloques en vuelo está acotado, así que la memoria no
+depende del número de filas. Un error en una fila se informa en su columna
+'error' sin detener el lote; la columna 'estado' vale 'ok', 'error' (falló el
+cálculo) o 'error_reporte' (el cálculo está bien pero falló su reporte o PDF).
+
+Ejemplos:
+    python cli.py disenos.csv -o resultados.csv --procesos 4
+    python cli.py disenos.jsonl -o - --formato-salida jsonl
+    python cli.py disenos.csv -o resultados.csv --reportes reportes --filas-reporte 1,10-12 --pdf
+    python cli.py disenos.csv -o resultados.csv --cache ~/.cache/trafos
+
+Con --cache (o la variable TRAFOS_CACHE) los diseños y reportes ya calculados
+se toman de la caché persistente de core/cache.py.
+
+--verificar-arranque comprueba que importar el motor y la CLI no cargue
+matplotlib, PyLaTeX ni PyMuPDF y quede dentro del presupuesto de core/arranque.py.
+
+Código de salida: 0 si todas las filas se calcularon (y sus reportes se
+generaron), 1 si alguna falló y 2 ante errores de uso o de lectura de la entrada.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.entradas import CAMPOS, normalizar_parametros
+from ui.figures import PERFIL_DEFECTO, PERFILES
+
+# Resultados que se escriben por defecto (atributos de DisenoTransformador)
+CAMPOS_RESULTADO = (
+    'B_kgauss', 'J', 'C', 'Kc', 'flujo', 'An', 'Ab', 'num_escalones', 'Kr', 'D',
+    'b', 'c', 'M', 'N1_fase', 'N2_fase', 'I1_fase_nom', 'I2_fase', 's1', 's2',
+    'awg1', 'awg2', 'Qc_total', 'Qr', 'Pc', 'Pf', 'Wc', 'Wf', 'rendimiento',
+    'rendimiento_diario',
+)
+TAM_BLOQUE_DEFECTO = 256
+_EXTENSIONES_JSONL = ('.jsonl', '.ndjson', '.json')
+
+# Opciones de cada proceso trabajador (se fijan una sola vez en _inicializar_trabajador)
+_opciones_trabajador = {}
+
+
+# ----------------------------------------------------------------------
+# Entrada
+# ----------------------------------------------------------------------
+
+def _formato(ruta, formato):
+    if formato:
+        return formato
+    return 'jsonl' if ruta != '-' and os.path.splitext(ruta)[1].lower() in _EXTENSIONES_JSONL else 'csv'
+
+@contextlib.contextmanager
+def _abrir(ruta, modo):
+    if ruta == '-':
+        yield sys.stdin if 'r' in modo else sys.stdout
+        return
+    with open(ruta, modo, newline='' if 'b' not in modo else None, encoding='utf-8-sig' if 'r' in modo else 'utf-8') as f:
+        yield f
+
+def leer_filas(archivo, formato, columna_id):
+    """
+    Devuelve un generador de (numero, id, fila) por cada diseño de la entrada. El
+    encabezado CSV se valida aquí mismo; si una línea JSONL no se puede
+    interpretar, 'fila' es la excepción (se informa como error de esa fila).
+    """
+    if formato == 'csv':
+        lector = csv.DictReader(archivo)
+        desconocidos = [c for c in (lector.fieldnames or []) if c and c != columna_id and c not in CAMPOS]
+        if desconocidos:
+            raise KeyError(f"Columnas desconocidas: {', '.join(desconocidos)}. Campos válidos: {', '.join(CAMPOS)}")
+        return _filas_csv(lector, columna_id)
+    return _filas_jsonl(archivo, columna_id)
+
+def _filas_csv(lector, columna_id):
+    for numero, fila in enumerate(lector, start=1):
+        fila.pop(None, None)  # celdas sobrantes sin encabezado
+        yield numero, fila.pop(columna_id, ''), fila
+
+def _filas_jsonl(archivo, columna_id):
+    numero = 0
+    for linea in archivo:
+        if not linea.strip():
+            continue
+        numero += 1
+        try:
+            fila = json.loads(linea)
+            if not isinstance(fila, dict):
+                raise ValueError("cada línea debe ser un objeto JSON")
+        except ValueError as e:
+            yield numero, '', ValueError(f"JSON no válido: {e}")
+            continue
+        yield numero, fila.pop(columna_id, ''), fila
+
+
+def parsear_filas_reporte(spec):
+    """'1,5,10-20' -> lista de rangos (inicio, fin) incluidos."""
+    rangos = []
+    for parte in (p.strip() for p in spec.split(',') if p.strip()):
+        inicio, _, fin = parte.partition('-')
+        try:
+            rangos.append((int(inicio), int(fin or inicio)))
+        except ValueError:
+            raise ValueError(f"Rango de filas no válido: '{parte}'") from None
+    return rangos
+
+def _en_rangos(numero, rangos):
+    return any(inicio <= numero <= fin for inicio, fin in rangos)
+
+
+# ----------------------------------------------------------------------
+# Cálculo de una fila
+# ----------------------------------------------------------------------
+
+def _valor(valor):
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+def _mensajes(verboso):
+    """Destino de los avisos que las fases imprimen por stdout (no deben mezclarse con la salida)."""
+    return contextlib.redirect_stdout(sys.stderr if verboso else io.StringIO())
+
+def evaluar_fila(numero, id_fila, fila, campos, dir_reportes=None, filas_reporte=(), pdf=False, verboso=False,
+                 procesos_figuras=None, calidad=None):
+    """Calcula un diseño y devuelve su fila de resultados (nunca lanza excepciones)."""
+    from core.engine import DisenoTransformador
+
+    resultado = {'fila': numero, 'id': id_fila, 'estado': 'ok', 'error': ''}
+    try:
+        if isinstance(fila, Exception):
+            raise fila
+        params = normalizar_parametros(fila)
+        with _mensajes(verboso):
+            diseno = DisenoTransformador(**params)
+            diseno.ejecutar_calculo_completo()
+        for campo in campos:
+            resultado[campo] = _valor(getattr(diseno, campo, None))
+        if dir_reportes and _en_rangos(numero, filas_reporte):
+            resultado['reporte'] = _exportar(diseno, numero, dir_reportes, pdf, verboso, resultado,
+                                            procesos_figuras, calidad)
+    except Exception as e:
+        resultado['estado'] = 'error'
+        resultado['error'] = f"{type(e).__name__}: {e}"
+    return resultado
+
+def _exportar(diseno, numero, dir_reportes, pdf, verboso, resultado, procesos_figuras=None, calidad=None):
+    from ui.report_export import exportar_reporte
+    try:
+        with _mensajes(verboso):
+            rutas = exportar_reporte(diseno, os.path.join(dir_reportes, f'fila_{numero}'), pdf=pdf,
+                                     procesos=procesos_figuras, calidad=calidad)
+        return rutas['pdf'] or rutas['tex']
+    except Exception as e:
+        resultado['estado'] = 'error_reporte'
+        resultado['error'] = f"Reporte: {type(e).__name__}: {e}"
+        return ''
+
+def _evaluar_bloque(bloque, opciones):
+    return [evaluar_fila(numero, id_fila, fila, **opciones) for numero, id_fila, fila in bloque]
+
+def _inicializar_trabajador(opciones):
+    _opciones_trabajador.update(opciones)
+
+def _evaluar_bloque_trabajador(bloque):
+    return _evaluar_bloque(bloque, _opciones_trabajador)
+
+
+def _bloques(filas, tam_bloque):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tam_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+def procesar(filas, opciones, procesos=1, tam_bloque=TAM_BLOQUE_DEFECTO, max_pendientes=None):
+    """Calcula las filas por bloques y entrega sus resultados en el orden de entrada."""
+    if procesos == 1:
+        for bloque in _bloques(filas, tam_bloque):
+            yield from _evaluar_bloque(bloque, opciones)
+        return
+
+    max_pendientes = max_pendientes or 2 * procesos
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(opciones,)) as pool:
+        pendientes = deque()
+        try:
+            for bloque in _bloques(filas, tam_bloque):
+                pendientes.append(pool.submit(_evaluar_bloque_trabajador, bloque))
+                if len(pendientes) >= max_pendientes:
+                    yield from pendientes.popleft().result()
+            while pendientes:
+                yield from pendientes.popleft().result()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+def _compilar_en_orden(resultados, servicio, max_pendientes):
+    """
+    Envía al servicio de reportes los .tex de las filas con reporte y entrega
+    las filas en el mismo orden, cada una cuando su PDF está listo. Como mucho
+    'max_pendientes' filas esperan detrás de una compilación en curso.
+    """
+    pendientes = deque()
+    for resultado in resultados:
+        reporte = resultado.get('reporte') or ''
+        trabajo = servicio.enviar(reporte) if reporte.endswith('.tex') else None
+        pendientes.append((resultado, trabajo))
+        while pendientes and (pendientes[0][1] is None or pendientes[0][1].terminado()
+                              or len(pendientes) > max_pendientes):
+            yield _con_pdf(*pendientes.popleft())
+    while pendientes:
+        yield _con_pdf(*pendientes.popleft())
+
+def _con_pdf(resultado, trabajo):
+    if trabajo is not None:
+        trabajo.esperar()
+        if trabajo.error:
+            resultado['estado'] = 'error_reporte'
+            resultado['error'] = f"Reporte: {trabajo.error}"
+        else:
+            resultado['reporte'] = trabajo.pdf
+    return resultado
+
+
+# ----------------------------------------------------------------------
+# Salida
+# ----------------------------------------------------------------------
+
+class _EscritorCSV:
+    def __init__(self, archivo, columnas):
+        self._escritor = csv.DictWriter(archivo, fieldnames=columnas, extrasaction='ignore')
+        self._escritor.writeheader()
+
+    def escribir(self, resultado):
+        self._escritor.writerow({k: json.dumps(v, ensure_ascii=False) if isinstance(v, (list, dict, tuple)) else v
+                                 for k, v in resultado.items()})
+
+class _EscritorJSONL:
+    def __init__(self, archivo, columnas):
+        self._archivo = archivo
+
+    def escribir(self, resultado):
+        self._archivo.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+
+def _crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description='Calcula diseños de transformadores por lotes desde CSV/JSONL.')
+    parser.add_argument('entrada', nargs='?', help="archivo CSV o JSONL de diseños ('-' para stdin)")
+    parser.add_argument('-o', '--salida', default='-', help="archivo de resultados ('-' para stdout, por defecto)")
+    parser.add_argument('--formato-entrada', choices=('csv', 'jsonl'), help='por defecto, según la extensión')
+    parser.add_argument('--formato-salida', choices=('csv', 'jsonl'), help='por defecto, según la extensión')
+    parser.add_argument('--procesos', type=int, default=None, help='procesos trabajadores (por defecto, uno por CPU)')
+    parser.add_argument('--tam-bloque', type=int, default=TAM_BLOQUE_DEFECTO, help='filas por tarea enviada a cada proceso')
+    parser.add_argument('--campos', help='resultados a escribir, separados por comas (por defecto: %s)' % ','.join(CAMPOS_RESULTADO))
+    parser.add_argument('--columna-id', default='id', help="columna de la entrada que se copia a la salida (por defecto 'id')")
+    parser.add_argument('--catalogo', help='directorio de un catálogo de materiales compilado (core/catalog.py)')
+    parser.add_argument('--cache', help='directorio de la caché de resultados (por defecto, TRAFOS_CACHE si está definida)')
+    parser.add_argument('--cache-mb', type=float, default=None, help='tamaño máximo de la caché en MB (por defecto 512)')
+    parser.add_argument('--sin-cache', action='store_true', help='no usar la caché aunque TRAFOS_CACHE esté definida')
+    parser.add_argument('--reportes', help='directorio donde generar los reportes de las filas seleccionadas')
+    parser.add_argument('--filas-reporte', help="filas con reporte, ej: '1,5,10-20' (numeradas desde 1)")
+    parser.add_argument('--pdf', action='store_true', help='compilar los reportes a PDF con pdflatex')
+    parser.add_argument('--calidad', choices=tuple(PERFILES), default=PERFIL_DEFECTO,
+                        help='perfil de las figuras de los reportes (por defecto %(default)s: PDF vectorial)')
+    parser.add_argument('--verboso', action='store_true', help='mostrar por stderr los avisos de las fases de cálculo')
+    parser.add_argument('--progreso', type=int, default=0, metavar='N', help='informar el avance por stderr cada N filas')
+    parser.add_argument('--verificar-arranque', type=float, nargs='?', const=-1.0, metavar='SEGUNDOS',
+                        help='sólo medir la importación de los módulos de arranque frente a un presupuesto '
+                             '(por defecto el de core/arranque.py) y salir')
+    return parser
+
+
+def verificar_arranque(presupuesto_s=None):
+    """Informa el tiempo de importación de core/arranque.MODULOS. 0 si todos cumplen, 1 si no."""
+    from core import arranque
+    presupuesto_s = arranque.PRESUPUESTO_S if presupuesto_s is None else presupuesto_s
+    try:
+        resultados = arranque.verificar(presupuesto_s)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    for modulo, segundos, prohibidos, ok in resultados:
+        detalle = f" (carga {', '.join(prohibidos)})" if prohibidos else ''
+        print(f"{'ok   ' if ok else 'FALLA'} {modulo:<20} {segundos * 1000:7.1f} ms{detalle}", file=sys.stderr)
+    fallas = sum(not ok for *_, ok in resultados)
+    print(f"{len(resultados) - fallas}/{len(resultados)} módulos dentro del presupuesto de "
+          f"{presupuesto_s * 1000:.0f} ms", file=sys.stderr)
+    return 1 if fallas else 0
+
+
+def main(argv=None):
+    parser = _crear_parser()
+    args = parser.parse_args(argv)
+    if args.verificar_arranque is not None:
+        return verificar_arranque(args.verificar_arranque if args.verificar_arranque >= 0 else None)
+    if args.entrada is None:
+        parser.error('falta el archivo de entrada')
+    if args.reportes and not args.filas_reporte:
+        parser.error('--reportes requiere --filas-reporte')
+    if args.procesos is not None and args.procesos < 1 or args.tam_bloque < 1:
+        parser.error('--procesos y --tam-bloque deben ser al menos 1')
+
+    try:
+        filas_reporte = parsear_filas_reporte(args.filas_reporte) if args.filas_reporte else []
+        if args.catalogo:
+            from core import catalog
+            catalog.usar_catalogo(args.catalogo)
+        if args.sin_cache:
+            from core import cache
+            cache.usar_cache(None)
+        elif args.cache or args.cache_mb is not None:
+            from core import cache
+            cache.usar_cache(args.cache or os.environ.get(cache.VARIABLE_ENTORNO) or cache.directorio_por_defecto(),
+                             args.cache_mb)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    campos = [c.strip() for c in args.campos.split(',') if c.strip()] if args.campos else list(CAMPOS_RESULTADO)
+    columnas = ['fila', 'id', 'estado', 'error'] + campos + (['reporte'] if args.reportes else [])
+    opciones = {
+        'campos': campos,
+        'dir_reportes': os.path.abspath(args.reportes) if args.reportes else None,
+        'filas_reporte': filas_reporte,
+        'pdf': args.pdf,
+        'calidad': args.calidad,
+        'verboso': args.verboso,
+    }
+    procesos = args.procesos or os.cpu_count() or 1
+    # Con varios trabajadores de cálculo las CPU ya están ocupadas: cada uno dibuja
+    # sus figuras en su propio proceso en lugar de abrir otro pool (ui/figures.py).
+    opciones['procesos_figuras'] = 1 if procesos > 1 else None
+    formato_entrada = _formato(args.entrada, args.formato_entrada)
+    formato_salida = _formato(args.salida, args.formato_salida)
+
+    # Los PDF se compilan en el proceso principal con el servicio de reportes
+    # (un pdflatex por CPU); los trabajadores de cálculo sólo escriben el .tex.
+    servicio = None
+    if args.pdf and args.reportes:
+        from ui.report_service import ServicioReportes
+        opciones['pdf'] = False
+        servicio = ServicioReportes(trabajadores=procesos)
+
+    total = errores = 0
+    inicio = time.perf_counter()
+    try:
+        with _abrir(args.entrada, 'r') as entrada, _abrir(args.salida, 'w') as salida:
+            filas = leer_filas(entrada, formato_entrada, args.columna_id)
+            escritor = (_EscritorJSONL if formato_salida == 'jsonl' else _EscritorCSV)(salida, columnas)
+            resultados = procesar(filas, opciones, procesos=procesos, tam_bloque=args.tam_bloque)
+            if servicio is not None:
+                resultados = _compilar_en_orden(resultados, servicio, max_pendientes=args.tam_bloque)
+            for resultado in resultados:
+                escritor.escribir(resultado)
+                total += 1
+                errores += resultado['estado'] != 'ok'
+                if args.progreso and total % args.progreso == 0:
+                    print(f"{total} filas procesadas ({errores} con error)", file=sys.stderr)
+    except (OSError, KeyError, csv.Error) as e:
+        print(f"Error: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+    finally:
+        if servicio is not None:
+            servicio.cerrar()
+
+    print(f"{total} filas: {total - errores} correctas, {errores} con error ({time.perf_counter() - inicio:.1f} s)",
+          file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# src/core/arranque.py
+# -*- coding: utf-8 -*-
+"""
+Presupuesto de arranque de los módulos que se importan a menudo.
+
+Los procesos trabajadores (cli.py, pools de figuras y de rasterizado) y las
+invocaciones de la CLI arrancan muchas más veces que la GUI, así que importar
+el motor de cálculo debe costar sólo math, los catálogos y NumPy. matplotlib,
+PyLaTeX, PyMuPDF, PIL y PySimpleGUI se importan dentro de las funciones que
+dibujan, arman o muestran el reporte, la primera vez que se usan.
+
+verificar() importa cada módulo de MODULOS en un intérprete nuevo y comprueba
+que no cargue ninguno de PROHIBIDOS y que tarde menos que el presupuesto. Se
+ejecuta con:
+    python cli.py --verificar-arranque [SEGUNDOS]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PRESUPUESTO_S = 0.5
+MODULOS = ('core.engine', 'core.results', 'core.cache', 'ui.figures', 'ui.report_export', 'cli')
+PROHIBIDOS = ('matplotlib', 'pylatex', 'fitz', 'pymupdf', 'PIL', 'PySimpleGUI')
+
+# Directorio src/, desde donde se importan los módulos
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CODIGO = (
+    "import json, sys, time\n"
+    "inicio = time.perf_counter()\n"
+    "import {modulo}\n"
+    "segundos = time.perf_counter() - inicio\n"
+    "print(json.dumps([segundos, [m for m in {prohibidos!r} if m in sys.modules]]))\n"
+)
+
+
+def medir_importacion(modulo, repeticiones=3):
+    """
+    Importa 'modulo' en 'repeticiones' intérpretes nuevos. Devuelve (segundos,
+    prohibidos): el menor tiempo de importación y los módulos de PROHIBIDOS que
+    quedaron cargados.
+    """
+    codigo = _CODIGO.format(modulo=modulo, prohibidos=PROHIBIDOS)
+    mejor, cargados = None, set()
+    for _ in range(repeticiones):
+        proc = subprocess.run([sys.executable, '-c', codigo], cwd=_RAIZ,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"No se pudo importar '{modulo}':\n{proc.stderr[-2000:]}")
+        segundos, prohibidos = json.loads(proc.stdout.strip().splitlines()[-1])
+        mejor = segundos if mejor is None else min(mejor, segundos)
+        cargados.update(prohibidos)
+    return mejor, sorted(cargados)
+
+
+def verificar(presupuesto_s=PRESUPUESTO_S, modulos=MODULOS):
+    """Lista de (módulo, segundos, prohibidos cargados, ok) para cada módulo."""
+    resultados = []
+    for modulo in modulos:
+        segundos, prohibidos = medir_importacion(modulo)
+        resultados.append((modulo, segundos, prohibidos, segundos <= presupuesto_s and not prohibidos))
+    return resultados
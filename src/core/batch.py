@@ -0,0 +1,419 @@
+# src/core/batch.py
+# -*- coding: utf-8 -*-
+"""
+Motor de diseño por lotes.
+
+Evalúa miles de transformadores a la vez operando sobre columnas NumPy en lugar
+de atributos escalares de DisenoTransformador. Las fórmulas replican el camino
+escalar de design_phases operación por operación (mismo orden de evaluación),
+de modo que los resultados coinciden con ejecutar_calculo_completo hasta el
+último dígito.
+
+Los redondeos que el camino escalar hace con round() y Decimal se aplican sobre
+los valores únicos de la columna para conservar exactamente la misma semántica.
+"""
+
+import math
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from . import database as db, utils
+from . import catalog
+from design_phases.nucleus_and_window.calculation import parsear_conexion
+from design_phases.losses_and_performance.calculation import MODELOS_PERDIDAS_HIERRO
+
+MAX_ESCALONES = 6
+
+# Valores por defecto: los mismos que DisenoTransformador.__init__
+_DEFAULTS = {
+    'tipo': 'trifasico', 'S': 25, 'E1': 10000, 'E2': 400, 'f': 60,
+    'acero': '35M6', 'conn': 'Dyn5', 'rel_rw': 3.0, 'refrig': 'ONAN',
+    'material_conductor': 'Cobre', 'cut_type': 'Recto',
+    'redondear_2_decimales': False, 'usar_valores_opcionales': False,
+    'modelo_perdidas_hierro': 'tabla',
+}
+
+_COLUMNAS_OPCIONALES = (
+    'b_man', 'c_man', 'kc_man',
+    'b_opcional', 'c_opcional', 'kc_opcional', 'j_opcional',
+    'fa_opcional', 'kr_opcional', 'pf_opcional',
+    'rho_acero_opcional', 'rho_cobre_opcional',
+    'pc_manual', 'pf_manual',
+)
+
+# Factores de la Tabla 2.4 en un arreglo (6 x 6) rellenado con ceros.
+_FACTORES_ESCALONES = np.zeros((MAX_ESCALONES, MAX_ESCALONES))
+for _n, _factores in db.dimensiones_escalones_db.items():
+    _FACTORES_ESCALONES[_n - 1, :len(_factores)] = _factores
+
+
+def _num_filas(entradas):
+    n = 1
+    for valor in entradas.values():
+        if not np.isscalar(valor) and valor is not None:
+            n = max(n, len(valor))
+    return n
+
+def _columna(entradas, nombre, n, dtype):
+    valor = entradas.get(nombre, _DEFAULTS.get(nombre))
+    if valor is None and dtype is float:
+        return np.full(n, np.nan)
+    if valor is None or np.isscalar(valor):
+        valor = [valor] * n
+    if dtype is float:
+        arr = np.asarray(valor)
+        if arr.dtype == object:
+            # None -> NaN (equivale a "no proporcionado")
+            arr = np.array([np.nan if v is None else v for v in arr], dtype=float)
+        return arr.astype(float)
+    if dtype is bool:
+        return np.asarray(valor, dtype=bool)
+    return np.asarray(valor, dtype=object)
+
+def _presente(col):
+    """Equivalente a la condición de veracidad 'if valor:' del camino escalar."""
+    return ~np.isnan(col) & (col != 0)
+
+def _no_nulo(col):
+    """Equivalente a 'valor is not None' del camino escalar."""
+    return ~np.isnan(col)
+
+def _redondear(col, mask, ndigits=2):
+    """Aplica round(valor, ndigits) de Python sólo donde 'mask' es verdadero."""
+    if not mask.any():
+        return col
+    out = col.copy()
+    valores, inversa = np.unique(col[mask], return_inverse=True)
+    out[mask] = np.array([round(float(v), ndigits) for v in valores])[inversa]
+    return out
+
+def _cuadrado(col):
+    """
+    x**2 con la misma semántica que el operador de Python (pow de libm).
+    El atajo x*x de NumPy difiere en el último bit en algunos valores.
+    """
+    return np.float_power(col, 2.0)
+
+def _redondear_entero(col):
+    """round(valor) de Python (redondeo bancario) como enteros."""
+    return np.rint(col).astype(np.int64)
+
+def _cuantizar(col, mask, exponente):
+    """Decimal(str(v)).quantize(exponente, ROUND_HALF_UP) sobre los valores únicos de col[mask]."""
+    out = col.copy()
+    if not mask.any():
+        return out
+    valores, inversa = np.unique(col[mask], return_inverse=True)
+    q = Decimal(exponente)
+    out[mask] = np.array([float(Decimal(str(float(v))).quantize(q, rounding=ROUND_HALF_UP)) for v in valores])[inversa]
+    return out
+
+def _por_valor(col, funcion):
+    """Aplica 'funcion' a cada valor único de una columna de texto."""
+    valores, inversa = np.unique(col.astype(str), return_inverse=True)
+    return [funcion(v) for v in valores], inversa
+
+
+def ejecutar_lote(entradas, ciclo_carga=None, taps=None):
+    """
+    Ejecuta las fases de núcleo/ventana, devanados, peso del núcleo, pérdidas y
+    rendimiento diario sobre columnas de entradas.
+
+    Args:
+        entradas (dict): columnas con los mismos nombres que los kwargs de
+            DisenoTransformador (S, E1, E2, f, acero, conn, rel_rw, refrig,
+            b_opcional, j_opcional, c_opcional, kc_opcional, ...). Los escalares
+            se difunden a todas las filas; None/NaN equivale a "no proporcionado".
+        ciclo_carga (list): ciclo de carga común a todas las filas [(carga_frac, horas), ...].
+        taps (list): porcentajes de TAP comunes a todas las filas.
+
+    Returns:
+        dict: tabla columnar {nombre: np.ndarray}. Las columnas por escalón
+        ('anchos', 'espesores', 'peso_escalon', ...) tienen forma (n, 6) rellenas
+        con ceros; 'mascara_escalones' indica qué escalones existen.
+    """
+    n = _num_filas(entradas)
+    taps = list(taps or [])
+    cat = catalog.activo()
+
+    tipo = _columna(entradas, 'tipo', n, str)
+    acero = _columna(entradas, 'acero', n, str)
+    conn = _columna(entradas, 'conn', n, str)
+    refrig = _columna(entradas, 'refrig', n, str)
+    material = _columna(entradas, 'material_conductor', n, str)
+    cut_type = _columna(entradas, 'cut_type', n, str)
+    modelo_pf = _columna(entradas, 'modelo_perdidas_hierro', n, str)
+    redondear = _columna(entradas, 'redondear_2_decimales', n, bool)
+    usar_opc = _columna(entradas, 'usar_valores_opcionales', n, bool)
+    S = _columna(entradas, 'S', n, float)
+    E1_linea = _columna(entradas, 'E1', n, float)
+    E2_linea = _columna(entradas, 'E2', n, float)
+    f = _columna(entradas, 'f', n, float)
+    rel_rw = _columna(entradas, 'rel_rw', n, float)
+    opc = {nombre: _columna(entradas, nombre, n, float) for nombre in _COLUMNAS_OPCIONALES}
+
+    fases = np.where(tipo == 'trifasico', 3, 1)
+    trifasico = fases == 3
+
+    # ------------------------------------------------------------------
+    # FASE 1: NÚCLEO Y VENTANA
+    # ------------------------------------------------------------------
+    # B (kGauss): opcional > manual > tabla por potencia
+    b_tabla = cat.densidades_flujo(S)
+    B_kgauss = np.where(_presente(opc['b_man']), opc['b_man'], b_tabla)
+    B_kgauss = np.where(usar_opc & _presente(opc['b_opcional']), opc['b_opcional'], B_kgauss)
+    B_tesla = B_kgauss / 10.0
+
+    # J (A/mm²): opcional > tabla por refrigeración y material
+    pares = np.char.add(np.char.add(refrig.astype(str), '|'), material.astype(str))
+    j_valores, j_inv = _por_valor(pares, lambda p: utils.get_promedio(db.densidad_corriente_db[p.split('|')[0]][p.split('|')[1]]))
+    J = np.array(j_valores, dtype=float)[j_inv]
+    J = np.where(usar_opc & _presente(opc['j_opcional']), opc['j_opcional'], J)
+
+    # Datos del acero (clave principal o designación antigua) resueltos en el catálogo indexado
+    idx_acero = cat.indices_aceros(acero)
+    if (idx_acero < 0).any():
+        clave = acero[np.flatnonzero(idx_acero < 0)[0]]
+        raise ValueError(f"El tipo de acero '{clave}' no es válido o no se encuentra en la base de datos.")
+    fa_original = cat.columna_acero('fa', 0.975)[idx_acero]
+    fa_original = np.where(usar_opc & _no_nulo(opc['fa_opcional']), opc['fa_opcional'], fa_original)
+    merma_idx = cat.merma_acero[idx_acero]
+    # calculation.py de pesos busca el acero sólo por clave principal (0.35 mm por defecto)
+    idx_principal = cat.indices_aceros(acero, solo_principal=True)
+    espesor_lamina_mm = np.where(idx_principal >= 0, cat.columna_acero('espesor_mm', 0.35)[idx_principal], 0.35)
+
+    # C: opcional > manual > tabla por tipo de núcleo
+    c_tabla = np.where(trifasico, utils.get_promedio(db.constante_flujo_db['trifasico_columnas']),
+                       utils.get_promedio(db.constante_flujo_db['monofasico_columnas']))
+    C = np.where(_presente(opc['c_man']), opc['c_man'], c_tabla)
+    C = np.where(usar_opc & _presente(opc['c_opcional']), opc['c_opcional'], C)
+
+    # Tensiones de fase según el grupo de conexión
+    conexiones, conn_inv = _por_valor(conn, parsear_conexion)
+    primario_delta = np.array(['D' in c[0] for c in conexiones], dtype=bool)[conn_inv]
+    secundario_delta = np.array(['D' in c[1] for c in conexiones], dtype=bool)[conn_inv]
+    E1_fase = np.where(trifasico & ~primario_delta, E1_linea / math.sqrt(3), E1_linea)
+    E2_fase = np.where(trifasico & ~secundario_delta, E2_linea / math.sqrt(3), E2_linea)
+
+    # Kc: opcional > manual > fórmula, luego cuantizado con ROUND_HALF_UP
+    kc_n = np.where(S <= 10, 8, np.where(S <= 250, 10, 12))
+    Kc_original = (kc_n / (30 + E1_fase / 1000.0)) * 1.15
+    Kc_original = np.where(_presente(opc['kc_man']), opc['kc_man'], Kc_original)
+    Kc_original = np.where(usar_opc & _presente(opc['kc_opcional']), opc['kc_opcional'], Kc_original)
+    Kc = _cuantizar(_cuantizar(Kc_original, redondear, '1e-2'), ~redondear, '1e-4')
+
+    # Flujo y áreas
+    flujo_original = C * np.sqrt(S / f) * 1e6
+    flujo_kilolineas = flujo_original / 1000
+    flujo_kl_redondeado = _redondear(flujo_kilolineas, redondear, 2)
+    flujo = np.where(redondear, flujo_kl_redondeado * 1000, flujo_original)
+    flujo_kilolineas = np.where(redondear, flujo_kl_redondeado, _redondear(flujo_kilolineas, ~redondear, 1))
+
+    An = flujo / (B_kgauss * 1000)
+    Ab = An / fa_original
+    num_escalones = np.select([Ab < 30, Ab < 50, Ab < 70, Ab < 150, Ab < 450], [1, 2, 3, 4, 5], 6)
+
+    # Kr: tabla densa (merma, escalones) con selección por potencia
+    Kr_original = cat.coeficientes_kr(merma_idx, num_escalones, S)
+    Kr_original = np.where(usar_opc & _presente(opc['kr_opcional']), opc['kr_opcional'], Kr_original)
+    Kr = Kr_original
+
+    D = 2 * np.sqrt(An / (math.pi * Kr))
+
+    # Geometría de escalones con arreglos (n, 6) rellenos y enmascarados
+    mascara = np.arange(MAX_ESCALONES)[None, :] < num_escalones[:, None]
+    anchos = _FACTORES_ESCALONES[num_escalones - 1] * D[:, None]
+    espesores = np.zeros((n, MAX_ESCALONES))
+    suma_e_previos = np.zeros(n)
+    for k in range(MAX_ESCALONES):
+        activo = mascara[:, k]
+        e_k = (np.sqrt(_cuadrado(D) - _cuadrado(anchos[:, k])) - suma_e_previos) / 2.0
+        espesores[:, k] = np.where(activo, e_k, 0.0)
+        suma_e_previos = np.where(activo, suma_e_previos + 2 * e_k, suma_e_previos)
+    suma_ae = np.zeros(n)
+    for k in range(MAX_ESCALONES):
+        suma_ae = suma_ae + anchos[:, k] * espesores[:, k]
+    An_verificacion = 2 * fa_original * suma_ae
+
+    # Ventana
+    constante_ventana = np.where(fases == 1, 2.22, 3.33)
+    Aw_m2 = (S * 1000) / (constante_ventana * f * B_tesla * (J * 1e6) * Kc * (An * 1e-4))
+    Aw = Aw_m2 * 1e4
+    b = np.sqrt(rel_rw * Aw)
+    M = (Aw / b) + D
+    a1 = anchos[:, 0]
+    c_prima = M - a1
+    c = M - D
+    g = np.where(a1 > 0, An / np.where(a1 > 0, a1, 1.0), 0)
+    L_monofasico = c + D + a1
+    L_trifasico = 2 * c + 2 * D + a1
+
+    # Dimensiones por escalón (regla acumulativa desde el 2do escalón)
+    acumulado = np.zeros((n, MAX_ESCALONES))
+    suma = np.zeros(n)
+    for k in range(1, MAX_ESCALONES):
+        suma = suma + espesores[:, k]
+        acumulado[:, k] = suma * 2.0
+    b_por_escalon = np.where(mascara, b[:, None] + acumulado, 0.0)
+    c_prima_por_escalon = np.where(mascara, c_prima[:, None] + acumulado, 0.0)
+
+    # ------------------------------------------------------------------
+    # FASE 2: DEVANADOS Y TAPs
+    # ------------------------------------------------------------------
+    N2_fase = _redondear_entero((E2_fase * 1e8) / (4.44 * f * flujo))
+
+    pct_max = max([0] + [abs(p) for p in taps])
+    E1_l_tap = E1_linea * (1 + pct_max / 100.0)
+    E1_f_tap = np.where(trifasico & primario_delta, E1_l_tap, E1_l_tap / math.sqrt(3))
+    N1_fase = _redondear_entero(N2_fase * (E1_f_tap / E2_fase))
+
+    S_dev_VA = (S * 1000) / fases
+    I1_fase_nom = _redondear(S_dev_VA / E1_fase, redondear)
+    I2_fase = _redondear(S_dev_VA / E2_fase, redondear)
+    s1 = _redondear(I1_fase_nom / J, redondear)
+    s2 = _redondear(I2_fase / J, redondear)
+
+    rm = _redondear(D / 2.0 + c / 4.0, redondear)
+    lm = _redondear(2.0 * math.pi * rm / 100.0, redondear)
+
+    rho_cobre_kg_mm3 = np.where(usar_opc & _presente(opc['rho_cobre_opcional']),
+                                opc['rho_cobre_opcional'] / 1000, 8.96e-6)
+    _, awg1, peso_awg1 = cat.conductores_awg(s1)
+    _, awg2, peso_awg2 = cat.conductores_awg(s2)
+    teorico1 = awg1 == None  # noqa: E711 (comparación elemento a elemento)
+    teorico2 = awg2 == None  # noqa: E711
+    peso_conductor_primario_kg_m = np.where(
+        teorico1, _redondear(s1 * rho_cobre_kg_mm3 * 1000, redondear & teorico1), peso_awg1 / 1000.0)
+    peso_conductor_secundario_kg_m = np.where(
+        teorico2, _redondear(s2 * rho_cobre_kg_mm3 * 1000, redondear & teorico2), peso_awg2 / 1000.0)
+    awg1 = np.where(teorico1, "Cálculo teórico", awg1)
+    awg2 = np.where(teorico2, "Cálculo teórico", awg2)
+
+    Lb1 = _redondear(lm * N1_fase, redondear)
+    Qb1 = _redondear(Lb1 * peso_conductor_primario_kg_m, redondear)
+    Lb2 = _redondear(lm * N2_fase, redondear)
+    Qb2 = _redondear(Lb2 * peso_conductor_secundario_kg_m, redondear)
+    Qc_por_bobinado = _redondear(Qb1 + Qb2, redondear)
+    Qc_total = _redondear(Qc_por_bobinado * np.where(trifasico, 3, 1), redondear)
+
+    # ------------------------------------------------------------------
+    # FASE 3: PESO DEL NÚCLEO POR ESCALÓN Y LAMINACIONES
+    # ------------------------------------------------------------------
+    rho_kg_cm3 = np.where(usar_opc & _presente(opc['rho_acero_opcional']), opc['rho_acero_opcional'], 7.65 / 1000.0)
+    espesor_lamina_cm = espesor_lamina_mm / 10.0
+    factor_apilamiento = fa_original
+    recto = cut_type == 'Recto'
+
+    def _peso(volumen_una_lamina, num_piezas_total):
+        return volumen_una_lamina * rho_kg_cm3 * num_piezas_total * factor_apilamiento
+
+    peso_escalon = np.zeros((n, MAX_ESCALONES))
+    num_laminas = np.zeros((n, MAX_ESCALONES), dtype=np.int64)
+    Qr_por_laminaciones = np.zeros(n)
+    for k in range(MAX_ESCALONES):
+        activo = mascara[:, k]
+        if not activo.any():
+            continue
+        a = anchos[:, k]
+        b_k = b_por_escalon[:, k]
+        c_k = c_prima_por_escalon[:, k]
+        e_k = espesores[:, k]
+        ancho_paquete_cm = np.where(e_k != 0, e_k * 2.0, espesor_lamina_cm)
+        laminas = np.ceil(ancho_paquete_cm / espesor_lamina_cm)
+        num_laminas[:, k] = np.where(activo, laminas, 0)
+
+        # Trifásico: piezas 1 (x3), 2 (x2), 3 (x1); monofásico: piezas 1 (x2), 2 (x2)
+        n1 = laminas * np.where(trifasico, 3, 2)
+        n2 = laminas * 2
+        n3 = laminas * 1
+
+        area1 = (b_k + (2 * a + b_k)) * a / 2.0
+        area2_tri = (2 * c_k + a + 2 * c_k + 3 * a) * a / 2.0 - a * (a / 2.0) / 2.0
+        area2_mono = (c_k + (2 * a + c_k)) * a / 2.0
+        area3 = a * b_k + (a * a) / 2.0
+
+        w1 = np.where(recto, _peso((a + b_k) * a * espesor_lamina_cm, n1), _peso(area1 * espesor_lamina_cm, n1))
+        w2 = np.where(recto, _peso((a + c_k) * a * espesor_lamina_cm, n2),
+                      np.where(trifasico, _peso(area2_tri * espesor_lamina_cm, n2), _peso(area2_mono * espesor_lamina_cm, n2)))
+        w3 = np.where(trifasico, np.where(recto, _peso((a + 2 * c_k) * a * espesor_lamina_cm, n3),
+                                          _peso(area3 * espesor_lamina_cm, n3)), 0.0)
+        total = 0.0 + w1 + w2 + w3
+        peso_escalon[:, k] = np.where(activo, total, 0.0)
+        Qr_por_laminaciones = Qr_por_laminaciones + peso_escalon[:, k]
+
+    vol_fallback = np.where(trifasico, (3 * An * b) + (2 * An * L_trifasico), (2 * An * b) + (2 * An * L_monofasico))
+    Qr = np.where(Qr_por_laminaciones != 0, Qr_por_laminaciones, vol_fallback * rho_kg_cm3)
+
+    # ------------------------------------------------------------------
+    # FASE 4: PÉRDIDAS Y RENDIMIENTO
+    # ------------------------------------------------------------------
+    Pc = np.where(usar_opc & _no_nulo(opc['pc_manual']), opc['pc_manual'], 2.44 * _cuadrado(J))
+    Qc_empirical = np.where(trifasico, 0.021, 0.014) * Kc * b * c * (2.0 * D + c)
+    # Monofásico: masa física de los devanados; trifásico: fórmula empírica
+    Wc = np.where(trifasico, Qc_empirical, Qc_total) * Pc
+
+    Pf = cat.perdidas_especificas(idx_acero, B_kgauss)
+    modelos, modelo_inv = np.unique(modelo_pf.astype(str), return_inverse=True)
+    for i, modelo in enumerate(modelos):
+        if modelo not in MODELOS_PERDIDAS_HIERRO:
+            raise ValueError(f"Modelo de pérdidas en el hierro no válido: '{modelo}'. Opciones: {', '.join(MODELOS_PERDIDAS_HIERRO)}")
+        mask = modelo_inv.reshape(-1) == i
+        if modelo != 'tabla' and mask.any():
+            Pf[mask] = cat.perdidas_curva(idx_acero[mask], B_kgauss[mask], f[mask], steinmetz=modelo == 'steinmetz')
+    Pf = np.where(usar_opc & _presente(opc['pf_opcional']), opc['pf_opcional'], Pf)
+    Pf = np.where(usar_opc & _no_nulo(opc['pf_manual']), opc['pf_manual'], Pf)
+
+    Qf_empirical = np.where(trifasico, 0.006 * Kr_original * _cuadrado(D) * (3.0 * b + 4.0 * c + 5.87 * D), Qr)
+    Wf = Qf_empirical * Pf
+
+    P_salida_W = S * 1000.0
+    P_entrada_W = P_salida_W + Wc + Wf
+    rendimiento = np.where(P_entrada_W > 0, (P_salida_W / P_entrada_W) * 100.0, 0.0)
+
+    # ------------------------------------------------------------------
+    # FASE 5: RENDIMIENTO DIARIO
+    # ------------------------------------------------------------------
+    energia_salida_total = np.zeros(n)
+    energia_perdida_cobre_total = np.zeros(n)
+    energia_perdida_hierro_total = np.zeros(n)
+    rendimiento_diario = np.full(n, np.nan)
+    if ciclo_carga:
+        energia_perdida_hierro_total = (Wf / 1000.0) * 24.0
+        for carga_frac, horas in ciclo_carga:
+            energia_salida_total = energia_salida_total + (S * carga_frac) * horas
+            energia_perdida_cobre_total = energia_perdida_cobre_total + ((Wc / 1000.0) * (carga_frac ** 2)) * horas
+        energia_perdida_total = energia_perdida_cobre_total + energia_perdida_hierro_total
+        energia_entrada_total = energia_salida_total + energia_perdida_total
+        rendimiento_diario = np.where(energia_entrada_total > 0,
+                                      (energia_salida_total / energia_entrada_total) * 100.0, 0.0)
+
+    return {
+        'S': S, 'fases': fases,
+        'B_kgauss': B_kgauss, 'B_tesla': B_tesla, 'J': J, 'C': C,
+        'fa_original': fa_original, 'E1_fase': E1_fase, 'E2_fase': E2_fase,
+        'Kc_original': Kc_original, 'Kc': Kc,
+        'flujo_original': flujo_original, 'flujo_kilolineas': flujo_kilolineas, 'flujo': flujo,
+        'An': An, 'Ab': Ab, 'num_escalones': num_escalones,
+        'Kr_original': Kr_original, 'Kr': Kr, 'D': D,
+        'mascara_escalones': mascara, 'anchos': np.where(mascara, anchos, 0.0), 'espesores': espesores,
+        'An_verificacion': An_verificacion,
+        'Aw': Aw, 'b': b, 'M': M, 'c': c, 'c_prima': c_prima, 'g': g,
+        'L_monofasico': L_monofasico, 'L_trifasico': L_trifasico,
+        'b_por_escalon': b_por_escalon, 'c_prima_por_escalon': c_prima_por_escalon,
+        'N2_fase': N2_fase, 'N1_fase': N1_fase,
+        'I1_fase_nom': I1_fase_nom, 'I2_fase': I2_fase, 's1': s1, 's2': s2,
+        'rm': rm, 'lm': lm, 'awg1': awg1, 'awg2': awg2,
+        'peso_conductor_primario_kg_m': peso_conductor_primario_kg_m,
+        'peso_conductor_secundario_kg_m': peso_conductor_secundario_kg_m,
+        'Lb1': Lb1, 'Qb1': Qb1, 'Lb2': Lb2, 'Qb2': Qb2,
+        'Qc_por_bobinado': Qc_por_bobinado, 'Qc_total': Qc_total,
+        'num_laminas': num_laminas, 'peso_escalon': peso_escalon,
+        'Qr_por_laminaciones': Qr_por_laminaciones, 'Qr': Qr,
+        'Pc': Pc, 'Qc_empirical_por_formula': Qc_empirical, 'Qc_used_for_losses': Qc_empirical, 'Wc': Wc,
+        'Pf': Pf, 'Qf_empirical': Qf_empirical, 'Wf': Wf, 'rendimiento': rendimiento,
+        'energia_salida_total': energia_salida_total,
+        'energia_perdida_cobre_total': energia_perdida_cobre_total,
+        'energia_perdida_hierro_total': energia_perdida_hierro_total,
+        'rendimiento_diario': rendimiento_diario,
+    }
@@ -0,0 +1,328 @@
+# src/core/cache.py
+# -*- coding: utf-8 -*-
+"""
+Caché persistente de resultados de diseño, direccionada por contenido.
+
+La clave de un diseño es el SHA-256 de su EntradaDiseno (core/records.py) en JSON
+canónico, junto con VERSION_CALCULO del motor, el formato de ResultadoDiseno y
+la versión del catálogo de materiales activo. Dos diseños con los mismos
+parámetros (vengan de la GUI, de un CSV o de un JSONL) comparten clave; al
+cambiar los cálculos, el formato de los registros o el catálogo, las entradas
+viejas dejan de coincidir y acaban desalojadas.
+
+En disco:
+    <directorio>/resultados/ab/<clave>.pkl          ResultadoDiseno
+    <directorio>/artefactos/ab/<clave>-<tipo>/      archivos de un reporte (o de una
+                                                    compilación LaTeX, o una figura)
+
+Todas las escrituras van a un temporal del mismo directorio y se publican con
+os.replace / os.rename, así que varios procesos pueden leer y escribir a la vez
+sin ver archivos a medias. El tamaño total se limita con una política LRU: cada
+acierto actualiza el mtime de la entrada y la poda borra las más antiguas.
+Las entradas ilegibles se tratan como fallos y se eliminan.
+
+La caché activa se elige con usar_cache() o con la variable de entorno
+TRAFOS_CACHE (y TRAFOS_CACHE_MB para el límite), que heredan los procesos
+trabajadores. Sin ninguna de las dos, activa() devuelve None y no se usa caché.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from dataclasses import astuple, fields
+
+from . import catalog
+from .records import EntradaDiseno, RegistroDiseno
+from .results import FORMATO_RESULTADO, ResultadoDiseno
+
+try:
+    import fcntl
+except ImportError:  # Windows: la poda funciona igual, sólo que sin cerrojo entre procesos
+    fcntl = None
+
+VARIABLE_ENTORNO = 'TRAFOS_CACHE'
+VARIABLE_LIMITE = 'TRAFOS_CACHE_MB'
+LIMITE_DEFECTO_MB = 512
+
+_MANIFIESTO = '.origen.json'
+_activa = {}
+
+
+def directorio_por_defecto():
+    """Directorio de caché del usuario (XDG_CACHE_HOME o ~/.cache)/trafos."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'trafos')
+
+
+def clave_diseno(d):
+    """Clave de caché de un diseño (DisenoTransformador o ResultadoDiseno)."""
+    from .engine import VERSION_CALCULO
+
+    entrada = EntradaDiseno.desde_diseno(d)
+    contenido = {
+        'entrada': dict(zip((f.name for f in fields(EntradaDiseno)), astuple(entrada))),
+        'calculo': VERSION_CALCULO,
+        'formato': FORMATO_RESULTADO,
+        'catalogo': catalog.activo().version,
+    }
+    # JSON canónico: claves ordenadas y tuplas como listas. 5 y 5.0 no se
+    # unifican a propósito, porque el reporte los muestra distinto.
+    texto = json.dumps(contenido, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _tamano(ruta):
+    if os.path.isdir(ruta):
+        total = 0
+        for raiz, _, archivos in os.walk(ruta):
+            for nombre in archivos:
+                try:
+                    total += os.path.getsize(os.path.join(raiz, nombre))
+                except OSError:
+                    pass
+        return total
+    return os.path.getsize(ruta)
+
+def _borrar(ruta):
+    try:
+        if os.path.isdir(ruta):
+            shutil.rmtree(ruta, ignore_errors=True)
+        else:
+            os.remove(ruta)
+    except OSError:
+        pass
+
+def _tocar(ruta):
+    try:
+        os.utime(ruta)
+    except OSError:
+        pass
+
+
+class CacheResultados:
+    """Caché en 'directorio' con un límite aproximado de 'limite_mb' megabytes."""
+
+    def __init__(self, directorio, limite_mb=LIMITE_DEFECTO_MB):
+        self.directorio = os.path.abspath(directorio)
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.aciertos = 0
+        self.fallos = 0
+        self._escritos = None  # bytes escritos desde la última poda (None = aún no se podó)
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def _ruta_resultado(self, clave):
+        return os.path.join(self.directorio, 'resultados', clave[:2], f'{clave}.pkl')
+
+    def _ruta_artefactos(self, clave, tipo):
+        return os.path.join(self.directorio, 'artefactos', clave[:2], f'{clave}-{tipo}')
+
+    # --- Resultados ---------------------------------------------------------
+
+    def obtener(self, clave):
+        """ResultadoDiseno guardado con 'clave', o None si no está (o no se puede leer)."""
+        ruta = self._ruta_resultado(clave)
+        try:
+            resultado = ResultadoDiseno.cargar(ruta)
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+            _borrar(ruta)
+            self.fallos += 1
+            return None
+        _tocar(ruta)
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, clave, resultado):
+        """
+        Guarda un ResultadoDiseno (o un diseño calculado, sin sus figuras) con
+        'clave'. Devuelve la ruta, o None si no se pudo escribir: una escritura
+        fallida (disco lleno, permisos) sólo significa un fallo de caché después.
+        """
+        if not isinstance(resultado, ResultadoDiseno):
+            resultado = ResultadoDiseno(RegistroDiseno.desde_diseno(resultado))
+        ruta = self._ruta_resultado(clave)
+        temporal = None
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tamano = f.tell()
+            os.replace(temporal, ruta)
+        except BaseException as e:
+            if temporal is not None:
+                _borrar(temporal)
+            if isinstance(e, OSError):
+                return None
+            raise
+        self._registrar_escritura(tamano)
+        return ruta
+
+    # --- Artefactos de reporte ----------------------------------------------
+
+    def guardar_artefactos(self, clave, tipo, origen, archivos=None):
+        """
+        Copia el directorio 'origen' (figuras, .tex, PDF, PNG...), o sólo los
+        'archivos' indicados (rutas relativas a 'origen'), como artefactos 'tipo'
+        de 'clave'. Si otro proceso ya los guardó, se conserva ese.
+        """
+        final = self._ruta_artefactos(clave, tipo)
+        if os.path.isdir(final):
+            return final
+        try:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            temporal = tempfile.mkdtemp(dir=os.path.dirname(final), suffix='.tmp')
+        except OSError:
+            return None
+        try:
+            if archivos is None:
+                shutil.copytree(origen, temporal, dirs_exist_ok=True)
+            else:
+                for nombre in archivos:
+                    copia = os.path.join(temporal, nombre)
+                    os.makedirs(os.path.dirname(copia), exist_ok=True)
+                    shutil.copyfile(os.path.join(origen, nombre), copia)
+            with open(os.path.join(temporal, _MANIFIESTO), 'w', encoding='utf-8') as f:
+                json.dump({'origen': os.path.abspath(origen)}, f)
+            tamano = _tamano(temporal)
+            os.rename(temporal, final)
+        except OSError:
+            # Carrera con otro proceso que publicó el mismo directorio antes
+            shutil.rmtree(temporal, ignore_errors=True)
+            return final if os.path.isdir(final) else None
+        self._registrar_escritura(tamano)
+        return final
+
+    def restaurar_artefactos(self, clave, tipo, destino):
+        """
+        Copia en 'destino' los artefactos 'tipo' de 'clave'. Las rutas
+        absolutas del directorio original dentro de los .tex se reescriben al
+        nuevo destino. Devuelve la lista de archivos restaurados (rutas
+        relativas a 'destino'), vacía si no había artefactos.
+        """
+        fuente = self._ruta_artefactos(clave, tipo)
+        try:
+            with open(os.path.join(fuente, _MANIFIESTO), encoding='utf-8') as f:
+                origen = json.load(f)['origen']
+            destino = os.path.abspath(destino)
+            shutil.copytree(fuente, destino, dirs_exist_ok=True, ignore=shutil.ignore_patterns(_MANIFIESTO))
+        except (OSError, ValueError, KeyError):
+            # No existe, o la poda de otro proceso lo borró mientras se copiaba
+            self.fallos += 1
+            return []
+        restaurados = []
+        for raiz, _, archivos in os.walk(fuente):
+            for nombre in sorted(archivos):
+                if nombre == _MANIFIESTO:
+                    continue
+                relativa = os.path.relpath(os.path.join(raiz, nombre), fuente)
+                restaurados.append(relativa)
+                if nombre.endswith('.tex') and origen != destino:
+                    _reubicar_tex(os.path.join(destino, relativa), origen, destino)
+        _tocar(fuente)
+        self.aciertos += 1
+        return restaurados
+
+    # --- Límite de tamaño ---------------------------------------------------
+
+    def _registrar_escritura(self, tamano):
+        # Recorrer todo el directorio en cada escritura sería caro: se poda en
+        # la primera escritura del proceso y luego cada ~10 % del límite escrito.
+        # Una poda fallida no invalida la escritura: se reintenta en la próxima.
+        if self._escritos is None or self._escritos + tamano > self.limite_bytes // 10:
+            try:
+                self.podar()
+            except OSError:
+                pass
+        else:
+            self._escritos += tamano
+
+    def _entradas(self):
+        entradas = []
+        for subdir in ('resultados', 'artefactos'):
+            base = os.path.join(self.directorio, subdir)
+            if not os.path.isdir(base):
+                continue
+            for prefijo in os.listdir(base):
+                carpeta = os.path.join(base, prefijo)
+                if not os.path.isdir(carpeta):
+                    continue
+                for nombre in os.listdir(carpeta):
+                    if nombre.endswith('.tmp'):
+                        continue  # escritura en curso de otro proceso
+                    ruta = os.path.join(carpeta, nombre)
+                    try:
+                        entradas.append((os.stat(ruta).st_mtime, _tamano(ruta), ruta))
+                    except FileNotFoundError:
+                        pass
+        return entradas
+
+    def podar(self):
+        """Borra las entradas usadas hace más tiempo hasta quedar dentro del límite. Devuelve el tamaño final."""
+        with open(os.path.join(self.directorio, '.poda.lock'), 'a') as cerrojo:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(cerrojo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    # Otro proceso ya está podando; se vuelve a intentar tras otro ~10 %
+                    self._escritos = 0
+                    return None
+            entradas = self._entradas()
+            total = sum(tamano for _, tamano, _ in entradas)
+            for _, tamano, ruta in sorted(entradas):
+                if total <= self.limite_bytes:
+                    break
+                _borrar(ruta)
+                total -= tamano
+        self._escritos = 0
+        return total
+
+    def tamano(self):
+        return sum(tamano for _, tamano, _ in self._entradas())
+
+    def vaciar(self):
+        for subdir in ('resultados', 'artefactos'):
+            shutil.rmtree(os.path.join(self.directorio, subdir), ignore_errors=True)
+
+
+def _reubicar_tex(ruta, origen, destino):
+    with open(ruta, encoding='utf-8') as f:
+        texto = f.read()
+    nuevo = texto.replace(origen + os.sep, destino + os.sep)
+    if nuevo != texto:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(nuevo)
+
+
+def activa():
+    """Caché en uso: la indicada con usar_cache() / TRAFOS_CACHE, o None si no hay."""
+    directorio = os.environ.get(VARIABLE_ENTORNO) or None
+    if directorio is None:
+        return None
+    limite = float(os.environ.get(VARIABLE_LIMITE) or LIMITE_DEFECTO_MB)
+    cache = _activa.get((directorio, limite))
+    if cache is None:
+        cache = CacheResultados(directorio, limite)
+        _activa.clear()
+        _activa[(directorio, limite)] = cache
+    return cache
+
+def usar_cache(directorio=None, limite_mb=None):
+    """
+    Activa la caché en 'directorio' (None la desactiva). Se guarda en variables de
+    entorno para que los procesos trabajadores la hereden.
+    """
+    _activa.clear()
+    if directorio:
+        os.environ[VARIABLE_ENTORNO] = os.path.abspath(directorio)
+        if limite_mb is not None:
+            os.environ[VARIABLE_LIMITE] = str(limite_mb)
+    else:
+        os.environ.pop(VARIABLE_ENTORNO, None)
+        os.environ.pop(VARIABLE_LIMITE, None)
+    return activa()
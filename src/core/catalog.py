@@ -0,0 +1,724 @@
+# src/core/catalog.py
+# -*- coding: utf-8 -*-
+"""
+Catálogo de materiales indexado.
+
+Compila las tablas de materiales en arreglos NumPy con índices de búsqueda:
+
+- densidad_flujo_db: potencias límite ordenadas, búsqueda binaria S -> B.
+- acero_electrico_db: índice ordenado clave / designación antigua -> fila del
+  acero, con sus propiedades en columnas paralelas.
+- awg_conductors_db: secciones ordenadas; bisect da el calibre más pequeño que cumple.
+- coeficiente_kr_db: tablas densas indexadas por (merma, número de escalones).
+- curvas de pérdidas W/kg vs B por acero (y opcionalmente por frecuencia), para
+  interpolación log-log o el ajuste de Steinmetz P = k·B^beta. Si no se indican
+  curvas propias se usan los puntos de 15, 16 y 17 kGauss de cada acero.
+
+Cada búsqueda tiene una variante escalar, con el mismo resultado que las
+funciones originales de core/utils.py, y una vectorizada que resuelve arreglos
+completos en una sola llamada para el motor por lotes (core/batch.py).
+
+Además de las tablas de core/database.py (CATALOGO, compilado al importar), se
+pueden usar catálogos externos de fabricantes: compilar_catalogo() lee archivos
+CSV y escribe un directorio de arreglos .npy más un manifiesto; cargar_catalogo()
+los abre con np.load(mmap_mode='r'), de modo que el arranque no interpreta
+ningún archivo de texto y todos los procesos que abren el mismo directorio
+comparten las páginas del sistema operativo en lugar de tener cada uno su copia.
+El catálogo activo se elige con usar_catalogo() o con la variable de entorno
+TRAFOS_CATALOGO, que heredan los procesos trabajadores.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from collections.abc import Mapping
+
+import numpy as np
+
+from . import database as db
+
+# Densidades de flujo de referencia de las pérdidas tabuladas (kGauss)
+B_REFERENCIA = (15, 16, 17)
+_CAMPOS_PERDIDAS = tuple(f'perdidas_w_kg_{b}k' for b in B_REFERENCIA)
+
+FORMATO_CATALOGO = 2
+MANIFIESTO = 'catalogo.json'
+VARIABLE_ENTORNO = 'TRAFOS_CATALOGO'
+
+# Columnas clave de los CSV de origen
+_CLAVE_ACERO = 'clave'
+_CLAVE_CONDUCTOR = 'calibre'
+_COLUMNAS_KR = ('merma', 'escalones', 'potencia_kva', 'kr')
+_COLUMNAS_CURVAS = ('acero', 'frecuencia_hz', 'b_kgauss', 'w_kg')
+
+
+def _indice_ordenado(claves, valor):
+    """Posición de la menor clave >= valor (la última si no hay ninguna), como utils.sel_clave."""
+    if not valor <= claves[-1]:  # también cubre NaN
+        return len(claves) - 1
+    return bisect_left(claves, valor)
+
+
+def _es_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+# ----------------------------------------------------------------------
+# Índices de texto sobre arreglos ordenados
+# ----------------------------------------------------------------------
+
+class IndiceClaves:
+    """Índice texto -> fila sobre un arreglo de claves ordenado (búsqueda binaria)."""
+
+    def __init__(self, claves, filas):
+        self.claves = claves
+        self.filas = filas
+        self._memo = {}
+
+    @classmethod
+    def desde_dict(cls, fila_por_clave):
+        claves = sorted(fila_por_clave)
+        return cls(np.array(claves, dtype=str), np.array([fila_por_clave[k] for k in claves], dtype=np.int64))
+
+    def buscar(self, clave):
+        """Fila de 'clave' o -1 si no existe. Las consultas se memorizan."""
+        try:
+            return self._memo[clave]
+        except KeyError:
+            pass
+        except TypeError:
+            return -1
+        fila = -1
+        if isinstance(clave, str) and len(self.claves):
+            pos = int(np.searchsorted(self.claves, clave))
+            if pos < len(self.claves) and self.claves[pos] == clave:
+                fila = int(self.filas[pos])
+        self._memo[clave] = fila
+        return fila
+
+    def buscar_array(self, claves):
+        """Variante vectorizada de buscar: resuelve sólo los valores distintos."""
+        valores, inversa = np.unique(np.asarray(claves).astype(str), return_inverse=True)
+        if not len(self.claves):
+            return np.full(inversa.size, -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.claves, valores), len(self.claves) - 1)
+        filas = np.where(self.claves[pos] == valores, self.filas[pos], -1)
+        return filas[inversa.reshape(-1)]
+
+
+# ----------------------------------------------------------------------
+# Vistas con la forma de los diccionarios de core/database.py
+# ----------------------------------------------------------------------
+
+class TablaCompilada(Mapping):
+    """Vista de solo lectura {clave: {campo: valor}} sobre columnas compiladas."""
+
+    def __init__(self, claves, indice, numericas, textos):
+        self._claves = claves
+        self._indice = indice
+        self._numericas = numericas
+        self._textos = textos
+
+    def fila(self, i):
+        datos = {}
+        for nombre, columna in self._textos.items():
+            if columna[i]:
+                datos[nombre] = str(columna[i])
+        for nombre, columna in self._numericas.items():
+            if not np.isnan(columna[i]):
+                datos[nombre] = float(columna[i])
+        return datos
+
+    def __getitem__(self, clave):
+        i = self._indice.buscar(clave)
+        if i < 0:
+            raise KeyError(clave)
+        return self.fila(i)
+
+    def __iter__(self):
+        return (str(k) for k in self._claves)
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __contains__(self, clave):
+        return self._indice.buscar(clave) >= 0
+
+
+class TablaKrCompilada(Mapping):
+    """Vista {merma: {escalones: {potencia: kr}}} sobre las tablas densas de Kr."""
+
+    def __init__(self, catalogo):
+        self._c = catalogo
+
+    def __getitem__(self, merma):
+        i = self._c._indice_merma.buscar(merma)
+        if i < 0:
+            raise KeyError(merma)
+        tabla = {}
+        for fila in range(self._c.kr_cuenta.shape[1]):
+            cuenta = int(self._c.kr_cuenta[i, fila])
+            if cuenta:
+                tabla[fila + 1] = {float(u): float(v) for u, v in zip(self._c.kr_umbrales[i, fila, :cuenta],
+                                                                        self._c.kr_valores[i, fila, :cuenta])}
+        return tabla
+
+    def __iter__(self):
+        return iter(self._c.mermas)
+
+    def __len__(self):
+        return len(self._c.mermas)
+
+
+# ----------------------------------------------------------------------
+# Compilación de tablas a arreglos
+# ----------------------------------------------------------------------
+
+def _columnas(registros):
+    """Separa los campos de una lista de diccionarios en columnas numéricas (NaN = falta) y de texto."""
+    nombres = []
+    for datos in registros:
+        nombres.extend(k for k in datos if k not in nombres)
+    numericas, textos = {}, {}
+    for nombre in nombres:
+        valores = [datos.get(nombre) for datos in registros]
+        if all(v is None or _es_numero(v) for v in valores):
+            numericas[nombre] = np.array([np.nan if v is None else v for v in valores], dtype=float)
+        else:
+            textos[nombre] = np.array(['' if v is None else str(v) for v in valores], dtype=str)
+    return numericas, textos
+
+
+def curvas_de_tabla(aceros):
+    """Curvas por defecto: los puntos tabulados de 15, 16 y 17 kGauss de cada acero (sin frecuencia)."""
+    curvas = {}
+    for clave, datos in aceros.items():
+        puntos = tuple((b, datos[c]) for b, c in zip(B_REFERENCIA, _CAMPOS_PERDIDAS) if _es_numero(datos.get(c)))
+        if puntos:
+            curvas[clave] = {None: puntos}
+    return curvas
+
+
+def _compilar_curvas(a, claves_acero, indice_acero, curvas):
+    """Curvas (acero, frecuencia) en arreglos densos de logaritmos más el ajuste de Steinmetz."""
+    n = len(claves_acero)
+    por_fila = {}
+    for clave, por_frecuencia in curvas.items():
+        fila = indice_acero.get(clave)
+        if fila is None:
+            raise ValueError(f"Curva de pérdidas para un acero inexistente: '{clave}'")
+        por_fila[fila] = por_frecuencia
+    num_f = max(max((len(v) for v in por_fila.values()), default=0), 1)
+    num_p = max(max((len(p) for v in por_fila.values() for p in v.values()), default=0), 1)
+    a['curva_frecuencias'] = np.full((n, num_f), np.inf)
+    a['curva_logB'] = np.full((n, num_f, num_p), np.inf)
+    a['curva_logW'] = np.full((n, num_f, num_p), np.nan)
+    a['curva_cuenta'] = np.zeros((n, num_f), dtype=np.int64)
+    a['curva_k'] = np.full((n, num_f), np.nan)
+    a['curva_beta'] = np.full((n, num_f), np.nan)
+    for fila, por_frecuencia in por_fila.items():
+        for j, (frecuencia, puntos) in enumerate(sorted(por_frecuencia.items(), key=lambda x: (x[0] is None, x[0] or 0))):
+            puntos = sorted(puntos)
+            if any(b <= 0 or w <= 0 for b, w in puntos):
+                raise ValueError(f"La curva de pérdidas de '{claves_acero[fila]}' debe tener B y W/kg positivos.")
+            x = np.log([b for b, _ in puntos])
+            y = np.log([w for _, w in puntos])
+            a['curva_frecuencias'][fila, j] = np.nan if frecuencia is None else frecuencia
+            a['curva_logB'][fila, j, :len(puntos)] = x
+            a['curva_logW'][fila, j, :len(puntos)] = y
+            a['curva_cuenta'][fila, j] = len(puntos)
+            # Ajuste de mínimos cuadrados de log W = log k + beta · log B
+            beta = np.polyfit(x, y, 1)[0] if len(puntos) > 1 and np.ptp(x) > 0 else 0.0
+            a['curva_beta'][fila, j] = beta
+            a['curva_k'][fila, j] = np.exp(np.mean(y) - beta * np.mean(x))
+
+
+def compilar_tablas(densidad_flujo, aceros, conductores, coeficientes_kr, curvas=None):
+    """
+    Convierte tablas con la forma de core/database.py en los arreglos del catálogo.
+    'curvas' es {acero: {frecuencia_hz o None: ((B_kgauss, W/kg), ...)}}; por
+    defecto se usa curvas_de_tabla(aceros).
+
+    Returns:
+        tuple: (arreglos, columnas) donde 'arreglos' es {nombre: np.ndarray} y
+        'columnas' describe las columnas de propiedades de aceros y conductores.
+    """
+    a = {}
+    potencias = sorted(densidad_flujo)
+    a['flujo_potencias'] = np.array(potencias, dtype=float)
+    a['flujo_min'] = np.array([densidad_flujo[k][0] for k in potencias], dtype=float)
+    a['flujo_max'] = np.array([densidad_flujo[k][1] for k in potencias], dtype=float)
+    a['flujo_B'] = np.array([(densidad_flujo[k][0] + densidad_flujo[k][1]) / 2 for k in potencias], dtype=float)
+
+    # Aceros: la clave principal tiene prioridad sobre la designación antigua
+    claves_acero = list(aceros)
+    registros = list(aceros.values())
+    alias = {}
+    for i, datos in enumerate(registros):
+        if isinstance(datos.get('designacion_antigua'), str):
+            alias.setdefault(datos['designacion_antigua'], i)
+    principal = {clave: i for i, clave in enumerate(claves_acero)}
+    alias.update(principal)
+    a['acero_claves'] = np.array(claves_acero, dtype=str)
+    indice = IndiceClaves.desde_dict(principal)
+    a['acero_principal_claves'], a['acero_principal_filas'] = indice.claves, indice.filas
+    indice = IndiceClaves.desde_dict(alias)
+    a['acero_alias_claves'], a['acero_alias_filas'] = indice.claves, indice.filas
+    a['acero_perdidas'] = np.array([[datos.get(c, 0) for c in _CAMPOS_PERDIDAS] for datos in registros],
+                                   dtype=float).reshape(len(registros), len(B_REFERENCIA))
+    num_acero, txt_acero = _columnas(registros)
+    _compilar_curvas(a, claves_acero, alias, curvas_de_tabla(aceros) if curvas is None else curvas)
+
+    # Conductores ordenados por sección (orden estable en empates)
+    claves_awg = list(conductores)
+    registros_awg = list(conductores.values())
+    secciones = [p.get('seccion_mm2', 0) for p in registros_awg]
+    orden = sorted(range(len(secciones)), key=secciones.__getitem__)
+    a['awg_claves'] = np.array(claves_awg, dtype=str)
+    indice = IndiceClaves.desde_dict({clave: i for i, clave in enumerate(claves_awg)})
+    a['awg_indice_claves'], a['awg_indice_filas'] = indice.claves, indice.filas
+    a['awg_orden'] = np.array(orden, dtype=np.int64)
+    a['awg_secciones_ordenadas'] = np.array([secciones[i] for i in orden], dtype=float)
+    a['awg_pesos'] = np.array([p.get('peso_g_m', 0) for p in registros_awg], dtype=float)
+    num_awg, txt_awg = _columnas(registros_awg)
+
+    # Kr: tablas densas (merma, escalones, umbral de potencia)
+    mermas = list(coeficientes_kr)
+    max_escalones = max((e for tabla in coeficientes_kr.values() for e in tabla), default=0)
+    ancho = max(max((len(t) for tabla in coeficientes_kr.values() for t in tabla.values()), default=0), 1)
+    a['kr_mermas'] = np.array(mermas, dtype=str)
+    indice = IndiceClaves.desde_dict({m: i for i, m in enumerate(mermas)})
+    a['kr_indice_claves'], a['kr_indice_filas'] = indice.claves, indice.filas
+    a['kr_umbrales'] = np.full((len(mermas), max_escalones, ancho), np.inf)
+    a['kr_valores'] = np.full((len(mermas), max_escalones, ancho), np.nan)
+    a['kr_cuenta'] = np.zeros((len(mermas), max_escalones), dtype=np.int64)
+    for i, merma in enumerate(mermas):
+        for escalones, tabla in coeficientes_kr[merma].items():
+            umbrales = sorted(tabla)
+            a['kr_umbrales'][i, escalones - 1, :len(umbrales)] = umbrales
+            a['kr_valores'][i, escalones - 1, :len(umbrales)] = [tabla[k] for k in umbrales]
+            a['kr_cuenta'][i, escalones - 1] = len(umbrales)
+    indice_merma = {m: i for i, m in enumerate(mermas)}
+    a['acero_merma'] = np.array([indice_merma.get(datos.get('merma'), -1) for datos in registros], dtype=np.int64)
+
+    columnas = {}
+    for prefijo, numericas, textos in (('acero', num_acero, txt_acero), ('awg', num_awg, txt_awg)):
+        columnas[prefijo] = {'numericas': list(numericas), 'textos': list(textos)}
+        for nombre, columna in numericas.items():
+            a[f'{prefijo}.num.{nombre}'] = columna
+        for nombre, columna in textos.items():
+            a[f'{prefijo}.txt.{nombre}'] = columna
+    return a, columnas
+
+
+def _version(arreglos):
+    """Huella del contenido de los arreglos (identifica el catálogo en cachés de resultados)."""
+    h = hashlib.sha256()
+    for nombre in sorted(arreglos):
+        arreglo = np.ascontiguousarray(arreglos[nombre])
+        h.update(f'{nombre}|{arreglo.dtype.str}|{arreglo.shape}|'.encode('utf-8'))
+        h.update(arreglo.tobytes())
+    return h.hexdigest()[:16]
+
+
+# ----------------------------------------------------------------------
+# Catálogo
+# ----------------------------------------------------------------------
+
+class CatalogoMateriales:
+    """Tablas de materiales compiladas para búsquedas O(1) / O(log n)."""
+
+    def __init__(self, arreglos, columnas, version=None, tablas=None, origen=None):
+        """
+        Args:
+            arreglos (dict): arreglos de compilar_tablas() (en memoria o mapeados).
+            columnas (dict): descripción de columnas de compilar_tablas().
+            version (str): huella del contenido (se calcula si no se indica).
+            tablas (tuple): diccionarios originales (densidad_flujo, aceros,
+                conductores, kr); si faltan se exponen vistas sobre los arreglos.
+            origen (str): directorio del catálogo compilado, si lo hay.
+        """
+        a = arreglos
+        self.arreglos = arreglos
+        self.origen = origen
+        self.version = version or _version(arreglos)
+
+        self._flujo_potencias = a['flujo_potencias']
+        self._flujo_B = a['flujo_B']
+
+        self.aceros = a['acero_claves']
+        self._indice_principal = IndiceClaves(a['acero_principal_claves'], a['acero_principal_filas'])
+        self._indice_acero = IndiceClaves(a['acero_alias_claves'], a['acero_alias_filas'])
+        self._perdidas = a['acero_perdidas']
+        self.merma_acero = a['acero_merma']
+        self._columnas_acero = {}
+        self._curva_frecuencias = a['curva_frecuencias']
+        self._curva_logB = a['curva_logB']
+        self._curva_logW = a['curva_logW']
+        self._curva_cuenta = a['curva_cuenta']
+        self._curva_k = a['curva_k']
+        self._curva_beta = a['curva_beta']
+
+        self.calibres = a['awg_claves']
+        self._indice_calibre = IndiceClaves(a['awg_indice_claves'], a['awg_indice_filas'])
+        self._awg_orden = a['awg_orden']
+        self._awg_secciones = a['awg_secciones_ordenadas']
+        self._awg_pesos = a['awg_pesos']
+        self._awg_etiquetas = None
+
+        self.mermas = a['kr_mermas']
+        self._indice_merma = IndiceClaves(a['kr_indice_claves'], a['kr_indice_filas'])
+        self.kr_umbrales = a['kr_umbrales']
+        self.kr_valores = a['kr_valores']
+        self.kr_cuenta = a['kr_cuenta']
+
+        def _vista(prefijo, claves, indice):
+            return TablaCompilada(
+                claves, indice,
+                {n: a[f'{prefijo}.num.{n}'] for n in columnas[prefijo]['numericas']},
+                {n: a[f'{prefijo}.txt.{n}'] for n in columnas[prefijo]['textos']})
+
+        if tablas is not None:
+            self.densidad_flujo_db, self.acero_electrico_db, self.awg_conductors_db, self.coeficiente_kr_db = tablas
+        else:
+            self.densidad_flujo_db = {float(p): (float(lo), float(hi)) for p, lo, hi in
+                                      zip(a['flujo_potencias'], a['flujo_min'], a['flujo_max'])}
+            self.acero_electrico_db = _vista('acero', self.aceros, self._indice_principal)
+            self.awg_conductors_db = _vista('awg', self.calibres, self._indice_calibre)
+            self.coeficiente_kr_db = TablaKrCompilada(self)
+
+    @classmethod
+    def desde_tablas(cls, densidad_flujo, aceros, conductores, coeficientes_kr):
+        """Catálogo en memoria a partir de diccionarios con la forma de core/database.py."""
+        arreglos, columnas = compilar_tablas(densidad_flujo, aceros, conductores, coeficientes_kr)
+        return cls(arreglos, columnas, tablas=(densidad_flujo, aceros, conductores, coeficientes_kr))
+
+    @classmethod
+    def desde_base_de_datos(cls):
+        """Catálogo de las tablas incluidas en core/database.py."""
+        return cls.desde_tablas(db.densidad_flujo_db, db.acero_electrico_db, db.awg_conductors_db, db.coeficiente_kr_db)
+
+    # ------------------------------------------------------------------
+    # Densidad de flujo por potencia
+    # ------------------------------------------------------------------
+
+    def densidad_flujo(self, S):
+        """B (kGauss) promedio de la tabla para la potencia S (kVA)."""
+        return float(self._flujo_B[_indice_ordenado(self._flujo_potencias, S)])
+
+    def densidades_flujo(self, S):
+        """Variante vectorizada de densidad_flujo."""
+        idx = np.searchsorted(self._flujo_potencias, np.asarray(S, dtype=float), side='left')
+        return self._flujo_B[np.minimum(idx, len(self._flujo_potencias) - 1)]
+
+    # ------------------------------------------------------------------
+    # Aceros
+    # ------------------------------------------------------------------
+
+    def indice_acero(self, clave, solo_principal=False):
+        """Fila del acero por clave principal (ej: 'M-5') o designación antigua (ej: '30M5'); -1 si no existe."""
+        indice = self._indice_principal if solo_principal else self._indice_acero
+        return indice.buscar(clave)
+
+    def datos_acero(self, clave):
+        """Diccionario de propiedades del acero."""
+        i = self.indice_acero(clave)
+        if i < 0:
+            raise KeyError(f"No se encontraron datos para el tipo de acero '{clave}' en la base de datos.")
+        return self.acero_electrico_db[str(self.aceros[i])]
+
+    def indices_aceros(self, claves, solo_principal=False):
+        """Variante vectorizada de indice_acero."""
+        indice = self._indice_principal if solo_principal else self._indice_acero
+        return indice.buscar_array(claves)
+
+    def columna_acero(self, propiedad, defecto=np.nan):
+        """Arreglo con 'propiedad' de cada acero (en el orden de self.aceros)."""
+        clave = (propiedad, defecto)
+        if clave not in self._columnas_acero:
+            nombre = f'acero.num.{propiedad}'
+            if nombre in self.arreglos:
+                columna = self.arreglos[nombre]
+                self._columnas_acero[clave] = np.where(np.isnan(columna), defecto, columna)
+            else:
+                self._columnas_acero[clave] = np.full(len(self.aceros), defecto, dtype=float)
+        return self._columnas_acero[clave]
+
+    def perdida_especifica(self, clave, b_kgauss):
+        """Pérdidas específicas (W/kg) del acero en el B de referencia más cercano (empates: el menor)."""
+        i = self.indice_acero(clave)
+        if i < 0:
+            raise KeyError(f"No se encontraron datos para el acero '{clave}'")
+        cercano = min(range(len(B_REFERENCIA)), key=lambda k: abs(B_REFERENCIA[k] - b_kgauss))
+        return float(self._perdidas[i, cercano])
+
+    def perdidas_especificas(self, indices, b_kgauss):
+        """Variante vectorizada de perdida_especifica sobre filas de acero ya resueltas."""
+        b = np.asarray(b_kgauss, dtype=float)
+        distancias = np.abs(np.array(B_REFERENCIA, dtype=float)[None, :] - b.reshape(-1, 1))
+        return self._perdidas[np.asarray(indices), np.argmin(distancias, axis=1)]
+
+    def _curvas_de_filas(self, indices, frecuencias):
+        """Curva (acero, frecuencia) de cada fila: la de frecuencia más cercana; las genéricas, en último lugar."""
+        if self._curva_frecuencias.shape[1] == 1 or frecuencias is None:
+            curva = np.zeros(len(indices), dtype=np.int64)
+        else:
+            disponibles = self._curva_frecuencias[indices]
+            distancias = np.abs(disponibles - np.asarray(frecuencias, dtype=float).reshape(-1, 1))
+            distancias = np.where(np.isnan(disponibles), np.finfo(float).max, distancias)
+            curva = np.argmin(distancias, axis=1)
+        cuenta = self._curva_cuenta[indices, curva]
+        if (cuenta == 0).any():
+            clave = self.aceros[indices[np.flatnonzero(cuenta == 0)[0]]]
+            raise ValueError(f"El acero '{clave}' no tiene curva de pérdidas.")
+        return curva, cuenta
+
+    def perdidas_curva(self, indices, b_kgauss, frecuencias=None, steinmetz=False):
+        """
+        Pérdidas específicas (W/kg) evaluadas sobre la curva de cada acero.
+
+        Con steinmetz=False se interpola linealmente en escala log-log entre los
+        puntos de la curva (fuera del rango se prolonga el tramo extremo); con
+        steinmetz=True se usa el ajuste P = k·B^beta de toda la curva.
+
+        Args:
+            indices: filas de acero ya resueltas (indices_aceros).
+            b_kgauss: densidades de flujo (kGauss).
+            frecuencias: frecuencia de cada fila (Hz) para elegir la curva, si hay varias.
+        """
+        indices = np.asarray(indices).reshape(-1)
+        b = np.broadcast_to(np.asarray(b_kgauss, dtype=float), indices.shape)
+        if frecuencias is not None:
+            frecuencias = np.broadcast_to(np.asarray(frecuencias, dtype=float), indices.shape)
+        curva, cuenta = self._curvas_de_filas(indices, frecuencias)
+        if steinmetz:
+            return self._curva_k[indices, curva] * np.power(b, self._curva_beta[indices, curva])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_b = np.log(b)
+            x = self._curva_logB[indices, curva]
+            y = self._curva_logW[indices, curva]
+            filas = np.arange(len(indices))
+            i0 = np.clip((x <= log_b[:, None]).sum(axis=1) - 1, 0, np.maximum(cuenta - 2, 0))
+            i1 = np.minimum(i0 + 1, cuenta - 1)
+            x0, x1, y0, y1 = x[filas, i0], x[filas, i1], y[filas, i0], y[filas, i1]
+            pendiente = np.where(i1 > i0, (y1 - y0) / (x1 - x0), 0.0)
+            return np.exp(y0 + pendiente * (log_b - x0))
+
+    def perdida_especifica_curva(self, clave, b_kgauss, frecuencia=None, steinmetz=False):
+        """Variante escalar de perdidas_curva para un acero (clave principal o designación antigua)."""
+        i = self.indice_acero(clave)
+        if i < 0:
+            raise KeyError(f"No se encontraron datos para el acero '{clave}'")
+        return float(self.perdidas_curva([i], [b_kgauss], None if frecuencia is None else [frecuencia], steinmetz)[0])
+
+    # ------------------------------------------------------------------
+    # Conductores AWG
+    # ------------------------------------------------------------------
+
+    def indice_calibre(self, calibre):
+        """Fila del calibre en la tabla de conductores; -1 si no existe."""
+        return self._indice_calibre.buscar(calibre)
+
+    def conductor_awg(self, seccion_mm2):
+        """Calibre AWG más pequeño con sección >= seccion_mm2: (calibre, propiedades) o (None, None)."""
+        if seccion_mm2 is None or not len(self._awg_secciones) or not seccion_mm2 <= self._awg_secciones[-1]:
+            return (None, None)
+        calibre = str(self.calibres[self._awg_orden[bisect_left(self._awg_secciones, seccion_mm2)]])
+        return (calibre, self.awg_conductors_db[calibre])
+
+    def conductores_awg(self, secciones_mm2):
+        """
+        Variante vectorizada de conductor_awg.
+
+        Returns:
+            tuple: (indices, calibres, pesos_g_m); el índice es -1 y el calibre None
+            para las secciones sin ajuste en la tabla.
+        """
+        if self._awg_etiquetas is None:
+            self._awg_etiquetas = np.array([str(c) for c in self.calibres] + [None], dtype=object)
+        secciones = np.asarray(secciones_mm2, dtype=float)
+        pos = np.searchsorted(self._awg_secciones, secciones, side='left')
+        encontrado = pos < len(self._awg_orden)
+        indices = np.where(encontrado, self._awg_orden[np.minimum(pos, max(len(self._awg_orden) - 1, 0))], -1)
+        calibres = self._awg_etiquetas[indices]  # el índice -1 apunta al None final
+        pesos = np.where(encontrado, self._awg_pesos[np.maximum(indices, 0)], np.nan)
+        return indices, calibres, pesos
+
+    # ------------------------------------------------------------------
+    # Coeficiente de plenitud Kr
+    # ------------------------------------------------------------------
+
+    def coeficiente_kr(self, merma, escalones, S):
+        """Kr de la tabla para la merma y el número de escalones, seleccionado por potencia."""
+        i = self._indice_merma.buscar(merma)
+        cuenta = int(self.kr_cuenta[i, escalones - 1]) if i >= 0 and 0 < escalones <= self.kr_cuenta.shape[1] else 0
+        if not cuenta:
+            raise ValueError(f"No hay coeficiente Kr para '{merma}' con {escalones} escalones.")
+        umbrales = self.kr_umbrales[i, escalones - 1, :cuenta]
+        return float(self.kr_valores[i, escalones - 1, _indice_ordenado(umbrales, S)])
+
+    def coeficientes_kr(self, indices_merma, escalones, S):
+        """Variante vectorizada de coeficiente_kr sobre índices de merma (ver merma_acero)."""
+        indices_merma = np.asarray(indices_merma)
+        fila = np.asarray(escalones, dtype=np.int64) - 1
+        S = np.asarray(S, dtype=float)
+        cuenta = self.kr_cuenta[indices_merma, fila]
+        if (cuenta == 0).any() or (indices_merma < 0).any():
+            malo = np.flatnonzero((cuenta == 0) | (indices_merma < 0))[0]
+            merma = str(self.mermas[indices_merma[malo]]) if indices_merma[malo] >= 0 else None
+            raise ValueError(f"No hay coeficiente Kr para '{merma}' con {fila[malo] + 1} escalones.")
+        umbrales = self.kr_umbrales[indices_merma, fila]
+        pos = (umbrales < S[:, None]).sum(axis=1)
+        pos = np.where(np.isnan(S), cuenta - 1, np.minimum(pos, cuenta - 1))
+        return self.kr_valores[indices_merma, fila, pos]
+
+
+# ----------------------------------------------------------------------
+# Catálogos externos: CSV -> directorio de arreglos mapeables
+# ----------------------------------------------------------------------
+
+def _valor_csv(texto):
+    texto = (texto or '').strip()
+    if not texto:
+        return None
+    try:
+        return float(texto)
+    except ValueError:
+        return texto
+
+def _leer_csv(ruta):
+    with open(ruta, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+def leer_tabla_csv(ruta, columna_clave):
+    """Lee un CSV con encabezado como {clave: {campo: valor}} (la forma de core/database.py)."""
+    tabla = {}
+    for n, fila in enumerate(_leer_csv(ruta), start=2):
+        clave = (fila.pop(columna_clave, None) or '').strip()
+        if not clave:
+            raise ValueError(f"{ruta}, línea {n}: falta la columna '{columna_clave}'.")
+        datos = {campo: _valor_csv(valor) for campo, valor in fila.items() if campo}
+        tabla[clave] = {campo: valor for campo, valor in datos.items() if valor is not None}
+    return tabla
+
+def leer_kr_csv(ruta):
+    """Lee un CSV de Kr con columnas merma, escalones, potencia_kva, kr."""
+    tabla = {}
+    for n, fila in enumerate(_leer_csv(ruta), start=2):
+        try:
+            merma, escalones, potencia, kr = (fila[c] for c in _COLUMNAS_KR)
+            tabla.setdefault(merma.strip(), {}).setdefault(int(escalones), {})[float(potencia)] = float(kr)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"{ruta}, línea {n}: se esperan las columnas {', '.join(_COLUMNAS_KR)}.") from e
+    return tabla
+
+def leer_curvas_csv(ruta):
+    """Lee un CSV de curvas con columnas acero, frecuencia_hz (puede ir vacía), b_kgauss, w_kg."""
+    curvas = {}
+    for n, fila in enumerate(_leer_csv(ruta), start=2):
+        try:
+            acero, frecuencia, b, w = (fila[c] for c in _COLUMNAS_CURVAS)
+            frecuencia = float(frecuencia) if (frecuencia or '').strip() else None
+            curvas.setdefault(acero.strip(), {}).setdefault(frecuencia, []).append((float(b), float(w)))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"{ruta}, línea {n}: se esperan las columnas {', '.join(_COLUMNAS_CURVAS)}.") from e
+    return curvas
+
+def compilar_catalogo(destino, aceros=None, conductores=None, kr=None, curvas=None):
+    """
+    Compila un catálogo externo en un directorio de arreglos .npy mapeables.
+
+    Args:
+        destino (str): directorio de salida.
+        aceros (str): CSV de aceros (columna 'clave' más los campos de
+            acero_electrico_db: designacion_antigua, espesor_mm, fa, merma,
+            perdidas_w_kg_15k, ...). Si falta se usa la tabla incluida.
+        conductores (str): CSV de conductores (columna 'calibre' más
+            diametro_mm, seccion_mm2, peso_g_m).
+        kr (str): CSV de Kr (merma, escalones, potencia_kva, kr).
+        curvas (str): CSV de curvas de pérdidas (acero, frecuencia_hz, b_kgauss,
+            w_kg). Los aceros sin curva propia usan sus puntos de 15-17 kGauss.
+
+    Returns:
+        str: la versión (huella del contenido) del catálogo compilado.
+    """
+    tabla_aceros = leer_tabla_csv(aceros, _CLAVE_ACERO) if aceros else db.acero_electrico_db
+    tabla_curvas = curvas_de_tabla(tabla_aceros)
+    if curvas:
+        tabla_curvas.update(leer_curvas_csv(curvas))
+    arreglos, columnas = compilar_tablas(
+        db.densidad_flujo_db,
+        tabla_aceros,
+        leer_tabla_csv(conductores, _CLAVE_CONDUCTOR) if conductores else db.awg_conductors_db,
+        leer_kr_csv(kr) if kr else db.coeficiente_kr_db,
+        tabla_curvas,
+    )
+    version = _version(arreglos)
+    os.makedirs(destino, exist_ok=True)
+    archivos = {}
+    for nombre, arreglo in arreglos.items():
+        archivo = f'{nombre}.npy'
+        temporal = os.path.join(destino, f'{archivo}.tmp{os.getpid()}')
+        with open(temporal, 'wb') as f:
+            np.save(f, np.ascontiguousarray(arreglo), allow_pickle=False)
+        os.replace(temporal, os.path.join(destino, archivo))
+        archivos[nombre] = archivo
+    # El manifiesto se escribe al final: un catálogo sin manifiesto no se considera válido
+    manifiesto = {'formato': FORMATO_CATALOGO, 'version': version, 'archivos': archivos, 'columnas': columnas}
+    temporal = os.path.join(destino, f'{MANIFIESTO}.tmp{os.getpid()}')
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=1)
+    os.replace(temporal, os.path.join(destino, MANIFIESTO))
+    return version
+
+def cargar_catalogo(directorio):
+    """Abre un catálogo compilado con compilar_catalogo(); los arreglos quedan mapeados en memoria."""
+    ruta = os.path.join(directorio, MANIFIESTO)
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"'{directorio}' no contiene un catálogo compilado ({MANIFIESTO}).") from None
+    if manifiesto.get('formato') != FORMATO_CATALOGO:
+        raise ValueError(f"Formato de catálogo no soportado: {manifiesto.get('formato')}")
+    arreglos = {nombre: np.load(os.path.join(directorio, archivo), mmap_mode='r', allow_pickle=False)
+                for nombre, archivo in manifiesto['archivos'].items()}
+    return CatalogoMateriales(arreglos, manifiesto['columnas'], version=manifiesto['version'],
+                              origen=os.path.abspath(directorio))
+
+
+# ----------------------------------------------------------------------
+# Catálogo activo
+# ----------------------------------------------------------------------
+
+# Catálogo de core/database.py, compilado una sola vez al importar
+CATALOGO = CatalogoMateriales.desde_base_de_datos()
+
+_activo = {}
+
+
+def activo():
+    """Catálogo en uso: el indicado con usar_catalogo() / TRAFOS_CATALOGO, o CATALOGO."""
+    directorio = os.environ.get(VARIABLE_ENTORNO) or None
+    catalogo = _activo.get(directorio)
+    if catalogo is None:
+        catalogo = cargar_catalogo(directorio) if directorio else CATALOGO
+        _activo.clear()
+        _activo[directorio] = catalogo
+    return catalogo
+
+def usar_catalogo(directorio=None):
+    """
+    Activa el catálogo compilado en 'directorio' (None vuelve a las tablas incluidas).
+    Se guarda en la variable de entorno para que los procesos trabajadores lo hereden.
+    """
+    _activo.clear()
+    if directorio:
+        catalogo = cargar_catalogo(directorio)
+        os.environ[VARIABLE_ENTORNO] = catalogo.origen
+        _activo[catalogo.origen] = catalogo
+    else:
+        os.environ.pop(VARIABLE_ENTORNO, None)
+    return activo()
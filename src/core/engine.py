@@ -7,6 +7,49 @@ from design_phases.windings_and_taps import calculation as windings_calc
 from design_phases.core_and_lamination_weights import calculation as core_weights_calc
 from design_phases.losses_and_performance import calculation as losses_perf_calc
 from design_phases.daily_performance import calculation as daily_perf_calc
+from . import cache as cache_resultados
+
+# Versión de los cálculos: forma parte de la clave de la caché de resultados
+# (core/cache.py). Incrementarla al cambiar cualquier fórmula o criterio de las fases.
+VERSION_CALCULO = 1
+
+# Fases de cálculo en orden de ejecución. Cada módulo declara en LEE/ESCRIBE los
+# atributos del diseño que consume y produce.
+FASES = (
+    ('nucleo', nucleus_calc),
+    ('devanados', windings_calc),
+    ('pesos_nucleo', core_weights_calc),
+    ('perdidas', losses_perf_calc),
+    ('rendimiento_diario', daily_perf_calc),
+)
+
+def _construir_grafo(fases):
+    """Deriva del LEE/ESCRIBE de cada fase sus ancestros, sus descendientes y
+    qué fases produce/consume cada atributo."""
+    nombres = [nombre for nombre, _ in fases]
+    productor = {}
+    lectores = {}
+    ancestros = {}
+    for nombre, modulo in fases:
+        ancestros[nombre] = set()
+        for atributo in modulo.LEE:
+            lectores.setdefault(atributo, set()).add(nombre)
+            previo = productor.get(atributo)
+            if previo is not None:
+                ancestros[nombre] |= {previo} | ancestros[previo]
+        for atributo in modulo.ESCRIBE:
+            productor[atributo] = nombre
+    descendientes = {n: {m for m in nombres if n in ancestros[m]} for n in nombres}
+    # Fases que deben recalcularse si cambia un atributo: las que lo leen y todo lo que depende de ellas
+    afectadas = {}
+    for atributo, fases_lectoras in lectores.items():
+        conjunto = set(fases_lectoras)
+        for n in fases_lectoras:
+            conjunto |= descendientes[n]
+        afectadas[atributo] = conjunto
+    return productor, ancestros, descendientes, afectadas
+
+_PRODUCTOR, _ANCESTROS, _DESCENDIENTES, _AFECTADAS = _construir_grafo(FASES)
 
 class DisenoTransformador:
     """
@@ -14,6 +57,9 @@ class DisenoTransformador:
     La lógica de cálculo está organizada por fases en design_phases.
     """
     def __init__(self, **kwargs):
+        # Mientras se construye el objeto no se registran invalidaciones
+        object.__setattr__(self, '_calculando', True)
+        object.__setattr__(self, '_fases_validas', set())
         self.tipo = kwargs.get('tipo', 'trifasico')
         self.S = float(kwargs.get('S', 25))  # Cambiar valor inicial a 50 kVA
         self.E1_linea = float(kwargs.get('E1', 10000))  # Cambiar valor inicial a 13200 V
@@ -48,10 +94,67 @@ class DisenoTransformador:
         # Valores manuales para pérdidas específicas
         self.Pc_manual = kwargs.get('pc_manual')
         self.Pf_manual = kwargs.get('pf_manual')
+        # Modelo de Pf de la base de datos: 'tabla', 'curva' o 'steinmetz'
+        self.modelo_perdidas_hierro = kwargs.get('modelo_perdidas_hierro', 'tabla')
         # Asegurar que el ciclo de carga pasado en kwargs quede registrado en el objeto.
         # Puede ser None o una lista de tuplas (carga_frac, horas).
         self.ciclo_carga = kwargs.get('ciclo_carga', None)
         self._inicializar_propiedades()
+        self._calculando = False
+
+    def __setattr__(self, nombre, valor):
+        object.__setattr__(self, nombre, valor)
+        if nombre == 'tipo':
+            object.__setattr__(self, 'fases', 3 if valor == 'trifasico' else 1)
+            self.invalidar('fases')
+        if not self._calculando and nombre in _AFECTADAS:
+            self._fases_validas -= _AFECTADAS[nombre]
+
+    def invalidar(self, *atributos):
+        """
+        Marca como pendientes las fases que dependen de los atributos indicados.
+        Sin argumentos invalida todas las fases. Asignar un atributo ya invalida
+        automáticamente; esto sólo hace falta tras modificar una lista en sitio
+        (p. ej. d.ciclo_carga.append(...)).
+        """
+        if not atributos:
+            self._fases_validas.clear()
+        for atributo in atributos:
+            self._fases_validas -= _AFECTADAS.get(atributo, set())
+
+    def fases_pendientes(self):
+        """Nombres de las fases que se recalcularían en la próxima ejecución."""
+        return [nombre for nombre, _ in FASES if nombre not in self._fases_validas]
+
+    def _ejecutar_fase(self, nombre, modulo):
+        self._calculando = True
+        try:
+            modulo.run(self)
+        finally:
+            self._calculando = False
+        self._fases_validas -= _DESCENDIENTES[nombre]
+        self._fases_validas.add(nombre)
+
+    def _asegurar_fases(self, requeridas):
+        for nombre, modulo in FASES:
+            if nombre in requeridas and nombre not in self._fases_validas:
+                self._ejecutar_fase(nombre, modulo)
+
+    def obtener(self, atributo):
+        """
+        Devuelve un resultado calculando sólo las fases de las que depende.
+        Ej: d.obtener('rendimiento_diario') tras cambiar d.ciclo_carga
+        recalcula únicamente la fase de rendimiento diario.
+        """
+        fase = _PRODUCTOR.get(atributo)
+        if fase is not None:
+            self._asegurar_fases(_ANCESTROS[fase] | {fase})
+        return getattr(self, atributo)
+
+    def registro(self):
+        """Registros compactos e inmutables por fase (core/records.py) del estado actual."""
+        from .records import RegistroDiseno
+        return RegistroDiseno.desde_diseno(self)
 
     def _inicializar_propiedades(self):
         self.B_kgauss = self.B_tesla = self.J = self.C = self.fa = self.merma_id = None
@@ -86,18 +189,36 @@ class DisenoTransformador:
     def ejecutar_calculo_completo(self):
         """
         Orquesta la ejecución de los cálculos llamando a cada fase de diseño
-        en el orden correcto.
-        """
-        nucleus_calc.run(self)
+        en el orden correcto. Sólo se ejecutan las fases invalidadas desde la
+        última llamada (todas la primera vez):
+          núcleo -> devanados (y peso del cobre) -> pesos del núcleo
+          -> pérdidas y rendimiento -> rendimiento diario
 
-        # Devanados y TAPs (ahora también calcula peso del cobre por bobinado)
-        windings_calc.run(self)
-        
-        # Núcleo: peso detallado por escalón / laminaciones
-        core_weights_calc.run(self)
-
-        # Pérdidas y rendimiento (usa Qc por bobinado y Qr detallado)
-        losses_perf_calc.run(self)
+        Si hay una caché de resultados activa (core/cache.py) y ya contiene este
+        diseño, se copian sus resultados en lugar de calcular; si no, el
+        resultado calculado se guarda en ella.
+        """
+        if not self.fases_pendientes():
+            return
+        cache = cache_resultados.activa()
+        if cache is None:
+            self._asegurar_fases({nombre for nombre, _ in FASES})
+            return
+        clave = cache_resultados.clave_diseno(self)
+        resultado = cache.obtener(clave)
+        if resultado is not None:
+            self._restaurar(resultado)
+            return
+        self._asegurar_fases({nombre for nombre, _ in FASES})
+        cache.guardar(clave, self)
 
-        # Rendimiento diario (usa d.ciclo_carga si está presente)
-        daily_perf_calc.run(self)
\ No newline at end of file
+    def _restaurar(self, resultado):
+        """Copia de un ResultadoDiseno todo lo que escriben las fases y las marca como válidas."""
+        self._calculando = True
+        try:
+            for _, modulo in FASES:
+                for atributo in modulo.ESCRIBE:
+                    setattr(self, atributo, getattr(resultado, atributo, None))
+        finally:
+            self._calculando = False
+        self._fases_validas.update(nombre for nombre, _ in FASES)
\ No newline at end of file
@@ -0,0 +1,101 @@
+# src/core/entradas.py
+# -*- coding: utf-8 -*-
+"""
+Parámetros de entrada de un diseño.
+
+Convierte valores de texto (campos de la GUI, celdas de un CSV) o de JSON en los
+kwargs de DisenoTransformador, con los mismos nombres que arma
+Application._manejar_calculo. Lo usan la GUI y la ejecución por lotes (cli.py).
+"""
+
+CAMPOS_TEXTO = ('tipo', 'acero', 'conn', 'refrig', 'material_conductor', 'cut_type', 'modelo_perdidas_hierro')
+CAMPOS_NUMERICOS = ('S', 'E1', 'E2', 'f', 'rel_rw')
+CAMPOS_OPCIONALES = (
+    'b_man', 'c_man', 'kc_man',
+    'b_opcional', 'c_opcional', 'kc_opcional', 'j_opcional',
+    'fa_opcional', 'kr_opcional', 'pf_opcional',
+    'rho_acero_opcional', 'rho_cobre_opcional',
+    'pc_manual', 'pf_manual',
+)
+CAMPOS_BOOLEANOS = ('redondear_2_decimales', 'usar_valores_opcionales')
+CAMPOS_LISTA = ('taps', 'ciclo_carga')
+CAMPOS = CAMPOS_TEXTO + CAMPOS_NUMERICOS + CAMPOS_OPCIONALES + CAMPOS_BOOLEANOS + CAMPOS_LISTA
+
+_VERDADERO = ('1', 'true', 'verdadero', 'si', 'sí', 'yes', 'x')
+_FALSO = ('0', 'false', 'falso', 'no', '')
+
+
+def parsear_taps(valor):
+    """'2.5, 5' o [2.5, 5] -> [2.5, 5.0]. Vacío -> []."""
+    if valor is None:
+        return []
+    if isinstance(valor, str):
+        return [float(t.strip()) for t in valor.split(',')] if valor.strip() else []
+    return [float(t) for t in valor]
+
+
+def parsear_ciclo_carga(valor):
+    """
+    'carga,horas; carga,horas' o [[carga, horas], ...] -> [(carga, horas), ...].
+    Igual que en la GUI, los pares de texto mal formados se ignoran.
+    """
+    if valor is None:
+        return []
+    if not isinstance(valor, str):
+        return [(float(carga), float(horas)) for carga, horas in valor]
+    ciclo_carga = []
+    for par in (p for p in valor.split(';') if p.strip()):
+        try:
+            carga, horas = par.split(',')
+            ciclo_carga.append((float(carga.strip()), float(horas.strip())))
+        except Exception:
+            continue
+    return ciclo_carga
+
+
+def parsear_booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        return bool(valor)
+    texto = str(valor).strip().lower()
+    if texto in _VERDADERO:
+        return True
+    if texto in _FALSO:
+        return False
+    raise ValueError(f"Valor booleano no válido: '{valor}'")
+
+
+def _numero(nombre, valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"El campo '{nombre}' debe ser numérico (recibido: '{valor}').") from None
+
+
+def normalizar_parametros(fila):
+    """
+    Convierte una fila {campo: valor} en kwargs de DisenoTransformador.
+
+    Los valores vacíos ('' o None) se omiten para que se apliquen los valores
+    por defecto del motor. Lanza KeyError si hay campos desconocidos y
+    ValueError si un valor no se puede interpretar.
+    """
+    desconocidos = [k for k in fila if k not in CAMPOS]
+    if desconocidos:
+        raise KeyError(f"Campos desconocidos: {', '.join(desconocidos)}. Campos válidos: {', '.join(CAMPOS)}")
+    params = {}
+    for nombre, valor in fila.items():
+        if valor is None or (isinstance(valor, str) and not valor.strip()):
+            continue
+        if nombre in CAMPOS_TEXTO:
+            params[nombre] = str(valor).strip()
+        elif nombre in CAMPOS_NUMERICOS or nombre in CAMPOS_OPCIONALES:
+            params[nombre] = _numero(nombre, valor)
+        elif nombre in CAMPOS_BOOLEANOS:
+            params[nombre] = parsear_booleano(valor)
+        elif nombre == 'taps':
+            params[nombre] = parsear_taps(valor)
+        else:
+            params[nombre] = parsear_ciclo_carga(valor)
+    return params
@@ -0,0 +1,129 @@
+# src/core/plotting.py
+# -*- coding: utf-8 -*-
+"""
+Guardado de las figuras de matplotlib con el formato y la resolución pedidos.
+
+Los plotters (núcleo, laminación, conexionado) dibujan siempre igual y delegan
+aquí la escritura: PNG con un dpi fijo (lo de siempre), PNG con el tamaño justo
+para el ancho con el que se imprime en el reporte, PDF vectorial, o código
+TikZ (core/tikz.py) que el reporte incluye en el propio .tex.
+
+Plantillas: los plotters de laminación dibujan siempre la misma disposición
+(misma figura, mismos ejes) y sólo cambian las cotas y los textos. En lugar de
+crear la figura, el gridspec y los ejes en cada escalón, piden a plantilla()
+la de su hilo: se crea una vez y en cada uso se quitan los artistas del dibujo
+anterior y se devuelven los ejes a su estado inicial (límites, aspecto,
+títulos, márgenes de la figura). El resultado es idéntico byte a byte al de una
+figura nueva. La figura lleva un canvas Agg propio, sin pasar por pyplot ni por
+un backend interactivo. usar_plantillas(False) vuelve a crear cada figura.
+Con formato 'tikz' no hay plantilla: se devuelve una FiguraTikz nueva.
+"""
+
+import os
+import threading
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+from .tikz import FiguraTikz
+
+FORMATOS = ('png', 'pdf', 'tikz')
+
+_plantillas = threading.local()
+_usar_plantillas = True
+
+
+def guardar_figura(fig, ruta_base, formato='png', dpi=300, ancho_pulgadas=None, **opciones):
+    """
+    Guarda 'fig' en ruta_base + '.' + formato y devuelve la ruta absoluta.
+
+    'dpi' son los puntos por pulgada de la imagen. Si se indica 'ancho_pulgadas'
+    (el ancho con que la figura aparece en el reporte), se refieren a ese ancho:
+    el bitmap tiene dpi * ancho_pulgadas píxeles de ancho, sea cual sea el
+    figsize del plotter. En PDF sólo afectan a los elementos rasterizados; el
+    PDF se escribe sin fecha de creación, así dos figuras iguales son idénticas
+    byte a byte (latex_cache y la caché de figuras dependen de eso). En 'tikz'
+    'fig' debe ser una FiguraTikz (ver nueva_figura) y se escribe su código.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de figura no soportado: '{formato}' (use {', '.join(FORMATOS)})")
+    ruta = f'{ruta_base}.{formato}'
+    if formato == 'tikz':
+        if not isinstance(fig, FiguraTikz):
+            raise ValueError("El formato 'tikz' requiere una figura creada con nueva_figura/plantilla")
+        return fig.guardar(ruta)
+    if ancho_pulgadas:
+        dpi = dpi * ancho_pulgadas / fig.get_figwidth()
+    if formato == 'pdf':
+        opciones.setdefault('metadata', {'CreationDate': None})
+    fig.savefig(ruta, dpi=dpi, format=formato, **opciones)
+    return os.path.abspath(ruta)
+
+
+class PlantillaFigura:
+    """Figura de 'figsize' con los ejes que crea crear_ejes(fig), reutilizable entre dibujos."""
+
+    def __init__(self, figsize, crear_ejes):
+        self.fig = Figure(figsize=figsize)
+        FigureCanvasAgg(self.fig)
+        self.ejes = tuple(crear_ejes(self.fig))
+        self._limpia = True
+
+    def preparar(self):
+        """Deja la figura como recién creada y devuelve (fig, ejes)."""
+        if not self._limpia:
+            self._restablecer()
+        self._limpia = False
+        return self.fig, self.ejes
+
+    def _restablecer(self):
+        parametros = matplotlib.rcParams
+        self.fig.subplots_adjust(**{lado: parametros[f'figure.subplot.{lado}']
+                                    for lado in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+        for ax in self.ejes:
+            for artista in (*ax.patches, *ax.texts, *ax.lines, *ax.collections, *ax.images,
+                            *ax.artists, *ax.tables):
+                artista.remove()
+            if ax.legend_ is not None:
+                ax.legend_.remove()
+            for titulo in (ax.title, ax._left_title, ax._right_title):
+                titulo.set_text('')
+            ax.set_axis_on()
+            ax.set_aspect('auto', adjustable='box')
+            ax.dataLim.set(Bbox.null())
+            ax.ignore_existing_data_limits = True
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.set_autoscale_on(True)
+
+
+def usar_plantillas(activar=True):
+    """Activa o desactiva la reutilización de figuras en este proceso."""
+    global _usar_plantillas
+    _usar_plantillas = bool(activar)
+
+
+def nueva_figura(figsize, formato='png'):
+    """Figura vacía: de matplotlib, o una FiguraTikz si formato == 'tikz'."""
+    return FiguraTikz(figsize) if formato == 'tikz' else Figure(figsize=figsize)
+
+
+def plantilla(nombre, figsize, crear_ejes, formato='png'):
+    """
+    (fig, ejes) listos para dibujar: de la plantilla 'nombre' del hilo actual o,
+    con las plantillas desactivadas, de una figura nueva. Para 'tikz', siempre
+    una FiguraTikz nueva.
+    """
+    if formato == 'tikz':
+        fig = FiguraTikz(figsize)
+        return fig, tuple(crear_ejes(fig))
+    if not _usar_plantillas:
+        return PlantillaFigura(figsize, crear_ejes).preparar()
+    plantillas = getattr(_plantillas, 'figuras', None)
+    if plantillas is None:
+        plantillas = _plantillas.figuras = {}
+    if nombre not in plantillas:
+        plantillas[nombre] = PlantillaFigura(figsize, crear_ejes)
+    return plantillas[nombre].preparar()
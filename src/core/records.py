@@ -0,0 +1,310 @@
+# src/core/records.py
+# -*- coding: utf-8 -*-
+"""
+Registros compactos e inmutables de un diseño, uno por fase de cálculo.
+
+Cada registro es un dataclass congelado con __slots__ que guarda números (y
+tuplas de números) y algunas etiquetas cortas del catálogo (calibre AWG, merma
+del acero), tal como se usaron en el cálculo: así un registro se lee igual
+aunque luego cambie el catálogo. Nada de textos LaTeX ni diccionarios por
+pieza. Los textos y estructuras que esperan los renderizadores (métodos de
+cálculo, tap_data, peso_por_escalon, ...) se reconstruyen bajo demanda en
+core/results.py (ResultadoDiseno), que actúa como vista de compatibilidad.
+
+Un registro suelto se envía barato entre procesos (pickle sólo serializa los
+valores de los slots, ~2 KB), pero en memoria cuesta unos 9 KB: cada valor es
+un objeto de Python. Para guardar muchos (barridos, lotes) se usa
+core/tabla_registros.py (TablaRegistros), que los guarda por columnas en ~1,7 KB
+por diseño y reconstruye cualquier fila.
+"""
+
+from dataclasses import dataclass, fields
+
+from design_phases.losses_and_performance.calculation import METODOS_PC, METODOS_PF
+
+
+def _tupla(valor):
+    if isinstance(valor, (list, tuple)):
+        return tuple(_tupla(v) for v in valor)
+    return valor
+
+def _campos(cls, d):
+    return {f.name: _tupla(getattr(d, f.name, None)) for f in fields(cls)}
+
+
+@dataclass(frozen=True, slots=True)
+class EntradaDiseno:
+    """Parámetros de entrada del diseño (mismos atributos que DisenoTransformador)."""
+    tipo: str
+    fases: int
+    S: float
+    E1_linea: float
+    E2_linea: float
+    f: float
+    acero: str
+    conn: str
+    taps_pct: tuple
+    rel_rw: float
+    refrig: str
+    material_conductor: str
+    cut_type: str
+    redondear_2_decimales: bool
+    usar_valores_opcionales: bool
+    B_man: float = None
+    C_man: float = None
+    Kc_man: float = None
+    B_opcional: float = None
+    C_opcional: float = None
+    Kc_opcional: float = None
+    J_opcional: float = None
+    fa_opcional: float = None
+    Kr_opcional: float = None
+    Pf_opcional: float = None
+    rho_acero_opcional: float = None
+    rho_cobre_opcional: float = None
+    Pc_manual: float = None
+    Pf_manual: float = None
+    ciclo_carga: tuple = None
+    modelo_perdidas_hierro: str = 'tabla'
+
+    @classmethod
+    def desde_diseno(cls, d):
+        return cls(**_campos(cls, d))
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoNucleo:
+    """Fase 1: núcleo y ventana."""
+    B_kgauss: float
+    B_tesla: float
+    J: float
+    C: float
+    fa: float
+    fa_original: float
+    merma_id: str
+    E1_fase: float
+    E2_fase: float
+    clock_index: int
+    Kc: float
+    Kc_original: float
+    flujo: float
+    flujo_original: float
+    flujo_kilolineas: float
+    An: float
+    Ab: float
+    num_escalones: int
+    Kr: float
+    Kr_original: float
+    D: float
+    anchos: tuple
+    espesores: tuple
+    An_verificacion: float
+    constante_ventana: float
+    Aw: float
+    b: float
+    M: float
+    c: float
+    c_prima: float
+    g: float
+    L_monofasico: float
+    L_trifasico: float
+    b_por_escalon: tuple
+    c_prima_por_escalon: tuple
+    g_por_escalon: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        return cls(**_campos(cls, d))
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoDevanados:
+    """Fase 2: devanados, TAPs y peso del cobre."""
+    N2_fase: int
+    N1_fase: int
+    I1_fase_nom: float
+    I2_fase: float
+    s1: float
+    s2: float
+    awg1: str  # calibre AWG, o "Cálculo teórico" si no hubo conductor en la tabla
+    awg2: str
+    peso_conductor_primario_kg_m: float
+    peso_conductor_secundario_kg_m: float
+    rm: float
+    lm: float
+    Lb1: float
+    Qb1: float
+    Lb2: float
+    Qb2: float
+    Qc_por_bobinado: float
+    Qc_total: float
+    # TAPs en el orden de d.tap_data (porcentajes ascendentes)
+    tap_pct: tuple
+    tap_Vlinea: tuple
+    tap_Vfase: tuple
+    tap_N: tuple
+    tap_I: tuple
+    # Distribución de espiras (None si no hay TAPs)
+    dist_principal: int
+    dist_vueltas: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        valores = {n: getattr(d, n) for n in (
+            'N2_fase', 'N1_fase', 'I1_fase_nom', 'I2_fase', 's1', 's2',
+            'peso_conductor_primario_kg_m', 'peso_conductor_secundario_kg_m',
+            'rm', 'lm', 'Lb1', 'Qb1', 'Lb2', 'Qb2', 'Qc_por_bobinado', 'Qc_total')}
+        for sufijo, devanado in (('1', 'primario'), ('2', 'secundario')):
+            metodo = getattr(d, 'metodo_peso_' + devanado)
+            valores['awg' + sufijo] = str(getattr(d, 'awg' + sufijo)) if metodo == "Base de datos AWG" else "Cálculo teórico"
+        tap_data = getattr(d, 'tap_data', None) or {}
+        tap_currents = getattr(d, 'tap_currents', None) or {}
+        distribucion = getattr(d, 'tap_distribution', None) or {}
+        valores.update(
+            tap_pct=tuple(tap_data),
+            tap_Vlinea=tuple(t['Vlinea'] for t in tap_data.values()),
+            tap_Vfase=tuple(t['Vfase'] for t in tap_data.values()),
+            tap_N=tuple(t['N_espiras'] for t in tap_data.values()),
+            tap_I=tuple(tap_currents[p] for p in tap_data) if tap_currents else (),
+            dist_principal=distribucion.get('principal_start'),
+            dist_vueltas=tuple(t['turns'] for t in distribucion.get('taps', ())),
+        )
+        return cls(**valores)
+
+
+@dataclass(frozen=True, slots=True)
+class PiezaLaminacion:
+    """Una figura de laminación de un escalón ('area' sólo en corte diagonal)."""
+    numero: int
+    n_por_capa: int
+    num_piezas: int
+    peso_kg: float
+    ancho_cm: float
+    largo_cm: float
+    area: float = None
+
+
+@dataclass(frozen=True, slots=True)
+class EscalonLaminacion:
+    escalon: int
+    num_laminas: int
+    ancho_paquete_cm: float
+    peso_total: float
+    piezas: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoPesosNucleo:
+    """Fase 3: peso del núcleo por escalón y laminaciones."""
+    espesor_lamina_mm: float
+    factor_apilamiento: float
+    rho_kg_cm3: float
+    Qr_por_laminaciones: float
+    Qr: float
+    escalones: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        escalones = []
+        comunes = {}
+        for step in getattr(d, 'peso_por_escalon', None) or []:
+            detalles = step['detalles']
+            if detalles:
+                comunes = detalles[0]
+            escalones.append(EscalonLaminacion(
+                escalon=step['escalon'],
+                num_laminas=detalles[0]['num_laminas'] if detalles else 0,
+                ancho_paquete_cm=detalles[0]['ancho_paquete_cm'] if detalles else 0.0,
+                peso_total=step['peso_total_escalon'],
+                piezas=tuple(PiezaLaminacion(
+                    numero=p['numero'], n_por_capa=p['n_por_capa'], num_piezas=p['num_piezas'],
+                    peso_kg=p['peso_kg'], ancho_cm=p['ancho_lamina_cm'], largo_cm=p['largo_cm'],
+                    area=p.get('area')) for p in detalles),
+            ))
+        return cls(
+            espesor_lamina_mm=comunes.get('espesor_lamina_mm'),
+            factor_apilamiento=comunes.get('factor_apilamiento'),
+            rho_kg_cm3=comunes.get('rho_kg_cm3'),
+            Qr_por_laminaciones=d.Qr_por_laminaciones,
+            Qr=d.Qr,
+            escalones=tuple(escalones),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoPerdidas:
+    """Fase 4: pérdidas y rendimiento a plena carga."""
+    Pc: float
+    Pf: float
+    metodo_pc: int
+    metodo_pf: int
+    Qc_empirical_por_formula: float
+    Qc_empirical_total: float
+    Qc_used_for_losses: float
+    Qf_empirical: float
+    Qf_used_for_losses: float
+    Kf_used_for_Qf: float
+    Wc: float
+    Wc_empirical: float
+    Wf: float
+    Wf_empirical: float
+    rendimiento: float
+
+    @classmethod
+    def desde_diseno(cls, d):
+        valores = _campos(cls, d)
+        valores['metodo_pc'] = METODOS_PC.index(d.Pc_calculation_method)
+        metodos_pf = [m.format(acero=d.acero) for m in METODOS_PF]
+        valores['metodo_pf'] = metodos_pf.index(d.Pf_calculation_method) if d.Pf_calculation_method in metodos_pf else 0
+        if not isinstance(valores['Kf_used_for_Qf'], (int, float)):
+            valores['Kf_used_for_Qf'] = None
+        return cls(**valores)
+
+
+@dataclass(frozen=True, slots=True)
+class ResultadoRendimientoDiario:
+    """Fase 5: rendimiento diario (None si no hay ciclo de carga)."""
+    energia_salida_total: float
+    energia_perdida_cobre_total: float
+    energia_perdida_hierro_total: float
+    energia_perdida_total: float
+    rendimiento_diario: float
+    energias_salida: tuple
+    energias_cobre: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        detalles = getattr(d, 'detalles_ciclo', None) or []
+        con_ciclo = bool(detalles)
+        return cls(
+            energia_salida_total=d.energia_salida_total,
+            energia_perdida_cobre_total=d.energia_perdida_cobre_total,
+            energia_perdida_hierro_total=d.energia_perdida_hierro_total,
+            energia_perdida_total=getattr(d, 'energia_perdida_total', None) if con_ciclo else None,
+            rendimiento_diario=getattr(d, 'rendimiento_diario', None) if con_ciclo else None,
+            energias_salida=tuple(x['energia_salida_kwh'] for x in detalles),
+            energias_cobre=tuple(x['energia_perdida_cu_kwh'] for x in detalles),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RegistroDiseno:
+    """Entradas más un registro por fase (None si la fase no se ha calculado)."""
+    entrada: EntradaDiseno
+    nucleo: ResultadoNucleo = None
+    devanados: ResultadoDevanados = None
+    pesos_nucleo: ResultadoPesosNucleo = None
+    perdidas: ResultadoPerdidas = None
+    diario: ResultadoRendimientoDiario = None
+
+    @classmethod
+    def desde_diseno(cls, d):
+        """Extrae los registros de un DisenoTransformador (u objeto equivalente) calculado."""
+        return cls(
+            entrada=EntradaDiseno.desde_diseno(d),
+            nucleo=ResultadoNucleo.desde_diseno(d) if getattr(d, 'D', None) is not None else None,
+            devanados=ResultadoDevanados.desde_diseno(d) if hasattr(d, 'Qc_total') else None,
+            pesos_nucleo=ResultadoPesosNucleo.desde_diseno(d) if hasattr(d, 'Qr') else None,
+            perdidas=ResultadoPerdidas.desde_diseno(d) if hasattr(d, 'rendimiento') else None,
+            diario=ResultadoRendimientoDiario.desde_diseno(d) if hasattr(d, 'energia_salida_total') else None,
+        )
@@ -0,0 +1,237 @@
+# src/core/results.py
+# -*- coding: utf-8 -*-
+"""
+Resultados de diseño inmutables.
+
+ResultadoDiseno es una instantánea de solo lectura de un DisenoTransformador ya
+calculado. Internamente guarda un RegistroDiseno (core/records.py: registros
+numéricos compactos por fase) más las rutas de las figuras generadas, y expone
+los mismos atributos que el diseño vivo (tap_data, peso_por_escalon, métodos de
+cálculo, ...) reconstruyéndolos bajo demanda. Así los renderizadores del reporte
+funcionan sin cambios, y el resultado puede guardarse en disco y volver a
+cargarse sin el motor de cálculo. Para muchos diseños, core/tabla_registros.py
+guarda los registros por columnas y TablaRegistros.resultado(i) devuelve esta
+misma vista sobre una fila.
+"""
+
+import os
+import pickle
+from dataclasses import fields
+
+from . import records
+from .records import RegistroDiseno
+from design_phases.nucleus_and_window.calculation import parsear_conexion
+from design_phases.losses_and_performance.calculation import METODOS_PC, METODOS_PF, METODOS_MASA, KF_MONOFASICO
+
+FORMATO_RESULTADO = 4
+
+# Atributos de figuras que la capa de UI añade al diseño (no son resultados de cálculo)
+ATRIBUTOS_FIGURAS = (
+    'core_plot_paths', 'core_plot_path', 'core_plot_filename',
+    'lamination_plot_paths', 'lamination_plot_path', 'lamination_plot_filename',
+    'connection_diagram_path',
+)
+
+_SECCIONES = ('entrada', 'nucleo', 'devanados', 'pesos_nucleo', 'perdidas', 'diario')
+
+
+def _campos_por_seccion():
+    tipos = {
+        'entrada': records.EntradaDiseno, 'nucleo': records.ResultadoNucleo,
+        'devanados': records.ResultadoDevanados, 'pesos_nucleo': records.ResultadoPesosNucleo,
+        'perdidas': records.ResultadoPerdidas, 'diario': records.ResultadoRendimientoDiario,
+    }
+    return {f.name: seccion for seccion, tipo in tipos.items() for f in fields(tipo)}
+
+_SECCION_DE_CAMPO = _campos_por_seccion()
+
+
+class ResultadoDiseno:
+    """Vista de solo lectura, compatible con DisenoTransformador, sobre un RegistroDiseno."""
+
+    __slots__ = ('registro', 'figuras', '_derivados')
+
+    def __init__(self, registro, figuras=None):
+        object.__setattr__(self, 'registro', registro)
+        object.__setattr__(self, 'figuras', dict(figuras or {}))
+        object.__setattr__(self, '_derivados', {})
+
+    @classmethod
+    def desde_diseno(cls, d):
+        """Toma los registros de 'd' y las rutas de figuras ya generadas."""
+        figuras = {k: getattr(d, k) for k in ATRIBUTOS_FIGURAS if getattr(d, k, None) is not None}
+        pasos = getattr(d, 'peso_por_escalon', None) or []
+        if any(step.get('plot_path') for step in pasos):
+            figuras['laminacion_por_escalon'] = tuple(step.get('plot_path') for step in pasos)
+        return cls(RegistroDiseno.desde_diseno(d), figuras)
+
+    # --- Acceso a atributos -------------------------------------------------
+
+    def __getattr__(self, nombre):
+        if nombre in _DERIVADOS:
+            derivados = self._derivados
+            if nombre not in derivados:
+                derivados[nombre] = _DERIVADOS[nombre](self)
+            valor = derivados[nombre]
+        elif nombre in ATRIBUTOS_FIGURAS and nombre in self.figuras:
+            return self.figuras[nombre]
+        elif nombre in _SECCION_DE_CAMPO:
+            seccion = _SECCION_DE_CAMPO[nombre]
+            registro = getattr(self.registro, seccion)
+            valor = getattr(registro, nombre) if registro is not None else None
+            if valor is None and seccion != 'entrada':
+                raise AttributeError(nombre)
+        else:
+            raise AttributeError(nombre)
+        if valor is _AUSENTE:
+            raise AttributeError(nombre)
+        return valor
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("ResultadoDiseno es de solo lectura.")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("ResultadoDiseno es de solo lectura.")
+
+    def __dir__(self):
+        return sorted(set(object.__dir__(self)) | set(_SECCION_DE_CAMPO) | set(_DERIVADOS) | set(self.figuras))
+
+    # --- Persistencia -------------------------------------------------------
+
+    def __getstate__(self):
+        return {'formato': FORMATO_RESULTADO, 'registro': self.registro, 'figuras': self.figuras}
+
+    def __setstate__(self, estado):
+        if estado.get('formato') != FORMATO_RESULTADO:
+            raise ValueError(f"Formato de resultado no soportado: {estado.get('formato')}")
+        object.__setattr__(self, 'registro', estado['registro'])
+        object.__setattr__(self, 'figuras', estado['figuras'])
+        object.__setattr__(self, '_derivados', {})
+
+    def guardar(self, ruta):
+        """Guarda el resultado en disco (escritura atómica)."""
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.tmp{os.getpid()}"
+        with open(temporal, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un resultado guardado con guardar(). Sólo debe usarse con archivos propios."""
+        with open(ruta, 'rb') as f:
+            resultado = pickle.load(f)
+        if not isinstance(resultado, cls):
+            raise ValueError(f"El archivo '{ruta}' no contiene un ResultadoDiseno.")
+        return resultado
+
+
+# ----------------------------------------------------------------------
+# Atributos derivados: reconstruyen las estructuras que usan los renderizadores
+# ----------------------------------------------------------------------
+
+_AUSENTE = object()
+
+def _seccion(r, nombre):
+    registro = getattr(r.registro, nombre)
+    if registro is None:
+        raise AttributeError(nombre)
+    return registro
+
+def _conexiones(r):
+    entrada = r.registro.entrada
+    if entrada.fases == 3:
+        return parsear_conexion(entrada.conn)[:2]
+    return ("Monofasico", "Monofasico")
+
+def _metodo_peso(awg):
+    return "Cálculo teórico" if awg == "Cálculo teórico" else "Base de datos AWG"
+
+def _tap_data(r):
+    dev = _seccion(r, 'devanados')
+    return {pct: {'Vlinea': vl, 'Vfase': vf, 'N_espiras': n}
+            for pct, vl, vf, n in zip(dev.tap_pct, dev.tap_Vlinea, dev.tap_Vfase, dev.tap_N)}
+
+def _tap_currents(r):
+    dev = _seccion(r, 'devanados')
+    return dict(zip(dev.tap_pct, dev.tap_I))
+
+def _tap_distribution(r):
+    dev = _seccion(r, 'devanados')
+    if dev.dist_principal is None:
+        return {}
+    claves = sorted(dev.tap_pct, reverse=True)
+    n_por_pct = dict(zip(dev.tap_pct, dev.tap_N))
+    return {
+        'principal_start': dev.dist_principal,
+        'taps': [{'from': claves[i], 'to': claves[i + 1], 'turns': vueltas} for i, vueltas in enumerate(dev.dist_vueltas)],
+        'principal_end': dev.dist_principal,
+        'total_check': dev.dist_principal * 2 + sum(dev.dist_vueltas),
+        'N_max': n_por_pct[claves[0]],
+    }
+
+def _peso_por_escalon(r):
+    pesos = _seccion(r, 'pesos_nucleo')
+    rutas = r.figuras.get('laminacion_por_escalon', ())
+    resultado = []
+    for i, esc in enumerate(pesos.escalones):
+        detalles = []
+        for p in esc.piezas:
+            detalle = {
+                'numero': p.numero,
+                'num_piezas': p.num_piezas,
+                'peso_kg': p.peso_kg,
+                'ancho_lamina_cm': p.ancho_cm,
+                'espesor_lamina_mm': pesos.espesor_lamina_mm,
+                'factor_apilamiento': pesos.factor_apilamiento,
+                'largo_cm': p.largo_cm,
+                'n_por_capa': p.n_por_capa,
+                'num_laminas': esc.num_laminas,
+                'ancho_paquete_cm': esc.ancho_paquete_cm,
+                'rho_kg_cm3': pesos.rho_kg_cm3,
+            }
+            if p.area is not None:
+                detalle['area'] = p.area
+            detalles.append(detalle)
+        resultado.append({
+            'escalon': esc.escalon,
+            'detalles': detalles,
+            'peso_total_escalon': esc.peso_total,
+            'plot_path': rutas[i] if i < len(rutas) else None,
+        })
+    return resultado
+
+def _metodo_pf(r):
+    perdidas = _seccion(r, 'perdidas')
+    return METODOS_PF[perdidas.metodo_pf].format(acero=r.registro.entrada.acero)
+
+def _kf_used_for_qf(r):
+    perdidas = _seccion(r, 'perdidas')
+    return KF_MONOFASICO if perdidas.Kf_used_for_Qf is None else perdidas.Kf_used_for_Qf
+
+def _detalles_ciclo(r):
+    diario = _seccion(r, 'diario')
+    ciclo = r.registro.entrada.ciclo_carga or ()
+    if not diario.energias_salida:
+        return []
+    return [{'carga_frac': carga, 'horas': horas, 'energia_salida_kwh': es, 'energia_perdida_cu_kwh': ec}
+            for (carga, horas), es, ec in zip(ciclo, diario.energias_salida, diario.energias_cobre)]
+
+_DERIVADOS = {
+    'conn1': lambda r: _conexiones(r)[0] if r.registro.nucleo is not None else _AUSENTE,
+    'conn2': lambda r: _conexiones(r)[1] if r.registro.nucleo is not None else _AUSENTE,
+    'metodo_peso_primario': lambda r: _metodo_peso(_seccion(r, 'devanados').awg1),
+    'metodo_peso_secundario': lambda r: _metodo_peso(_seccion(r, 'devanados').awg2),
+    'tap_data': _tap_data,
+    'tap_currents': _tap_currents,
+    'tap_distribution': _tap_distribution,
+    'peso_por_escalon': _peso_por_escalon,
+    'Pc_calculation_method': lambda r: METODOS_PC[_seccion(r, 'perdidas').metodo_pc],
+    'Pf_calculation_method': _metodo_pf,
+    'copper_calculation_method': lambda r: METODOS_MASA[r.registro.entrada.fases] if r.registro.perdidas is not None else _AUSENTE,
+    'iron_calculation_method': lambda r: METODOS_MASA[r.registro.entrada.fases] if r.registro.perdidas is not None else _AUSENTE,
+    'Kf_used_for_Qf': _kf_used_for_qf,
+    'detalles_ciclo': _detalles_ciclo,
+}
@@ -0,0 +1,177 @@
+# src/core/sweep.py
+# -*- coding: utf-8 -*-
+"""
+Barrido del espacio de diseño.
+
+Expande el producto cartesiano de los ejes indicados (S, B_opcional, J_opcional,
+C_opcional, rel_rw, acero, cut_type, refrig), lo divide en bloques contiguos y
+evalúa cada bloque con el motor por lotes (core/batch.py) en un pool de procesos.
+
+El producto nunca se materializa completo: cada bloque se reconstruye en el
+proceso trabajador a partir de su rango de índices, y el número de bloques en
+vuelo está acotado, de modo que la memoria no depende del tamaño de la rejilla.
+Los resultados se entregan como un flujo en el orden de los bloques.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch import ejecutar_lote
+
+# Ejes admitidos -> nombre de la columna que consume el motor por lotes
+EJES_BARRIDO = {
+    'S': 'S',
+    'B_opcional': 'b_opcional',
+    'J_opcional': 'j_opcional',
+    'C_opcional': 'c_opcional',
+    'rel_rw': 'rel_rw',
+    'acero': 'acero',
+    'cut_type': 'cut_type',
+    'refrig': 'refrig',
+}
+_EJES_OPCIONALES = ('B_opcional', 'J_opcional', 'C_opcional')
+
+TAM_BLOQUE_DEFECTO = 20000
+
+# Estado de cada proceso trabajador (se fija una sola vez en _inicializar_trabajador)
+_estado_trabajador = {}
+
+
+def rango(inicio, fin, paso):
+    """Valores de inicio a fin (ambos incluidos) con el paso indicado."""
+    if paso <= 0:
+        raise ValueError("El paso del rango debe ser positivo.")
+    num = int(round((fin - inicio) / paso)) + 1
+    return [inicio + i * paso for i in range(max(num, 0))]
+
+
+def _normalizar_ejes(ejes):
+    normalizados = {}
+    for nombre, valores in ejes.items():
+        if nombre not in EJES_BARRIDO:
+            raise KeyError(f"Eje de barrido no soportado: '{nombre}'. Ejes válidos: {', '.join(EJES_BARRIDO)}")
+        if isinstance(valores, (str, bytes)) or np.isscalar(valores):
+            valores = [valores]
+        valores = list(valores)
+        if not valores:
+            raise ValueError(f"El eje '{nombre}' no tiene valores.")
+        normalizados[nombre] = valores
+    return normalizados
+
+
+def total_combinaciones(ejes):
+    """Número de diseños del producto cartesiano de los ejes."""
+    total = 1
+    for valores in _normalizar_ejes(ejes).values():
+        total *= len(valores)
+    return total
+
+
+def _construir_bloque(ejes, fijos, inicio, fin):
+    """Reconstruye las filas [inicio, fin) del producto cartesiano como columnas."""
+    nombres = list(ejes)
+    formas = [len(ejes[k]) for k in nombres]
+    indices = np.unravel_index(np.arange(inicio, fin), formas)
+    entradas = dict(fijos)
+    for nombre, idx in zip(nombres, indices):
+        valores = np.asarray(ejes[nombre], dtype=object if isinstance(ejes[nombre][0], str) else float)
+        entradas[EJES_BARRIDO[nombre]] = valores[idx]
+    return entradas
+
+
+def _evaluar_bloque(ejes, fijos, ciclo_carga, taps, inicio, fin):
+    entradas = _construir_bloque(ejes, fijos, inicio, fin)
+    resultados = ejecutar_lote(entradas, ciclo_carga=ciclo_carga, taps=taps)
+    resultados['indice'] = np.arange(inicio, fin)
+    for nombre in ejes:
+        resultados.setdefault(EJES_BARRIDO[nombre], entradas[EJES_BARRIDO[nombre]])
+    return resultados
+
+
+def _inicializar_trabajador(ejes, fijos, ciclo_carga, taps):
+    _estado_trabajador.update(ejes=ejes, fijos=fijos, ciclo_carga=ciclo_carga, taps=taps)
+
+
+def _evaluar_bloque_trabajador(inicio, fin):
+    e = _estado_trabajador
+    return _evaluar_bloque(e['ejes'], e['fijos'], e['ciclo_carga'], e['taps'], inicio, fin)
+
+
+def barrer(ejes, fijos=None, ciclo_carga=None, taps=None, tam_bloque=TAM_BLOQUE_DEFECTO,
+           procesos=None, max_pendientes=None, progreso=None):
+    """
+    Evalúa el producto cartesiano de los ejes y entrega los resultados por bloques.
+
+    Args:
+        ejes (dict): {eje: valores} con ejes de EJES_BARRIDO. Los valores pueden ser
+            listas, range, arreglos NumPy o el resultado de rango().
+        fijos (dict): entradas comunes a todas las filas (E1, E2, conn, tipo, ...).
+            Si se barre algún eje *_opcional se activa usar_valores_opcionales
+            salvo que se indique lo contrario aquí.
+        ciclo_carga (list): ciclo de carga común [(carga_frac, horas), ...].
+        taps (list): porcentajes de TAP comunes.
+        tam_bloque (int): filas por bloque.
+        procesos (int): procesos trabajadores (por defecto os.cpu_count()). Con 1
+            se evalúa en el proceso actual sin pool.
+        max_pendientes (int): bloques en vuelo como máximo (por defecto 2 * procesos).
+        progreso (callable): progreso(hechos, total) tras entregar cada bloque.
+
+    Yields:
+        dict: tabla columnar de ejecutar_lote para un bloque, con la columna extra
+        'indice' (posición de cada fila en el producto cartesiano) y las columnas
+        de los ejes barridos.
+    """
+    ejes = _normalizar_ejes(ejes)
+    fijos = dict(fijos or {})
+    if any(nombre in ejes for nombre in _EJES_OPCIONALES):
+        fijos.setdefault('usar_valores_opcionales', True)
+    ciclo_carga = list(ciclo_carga) if ciclo_carga else None
+    taps = list(taps) if taps else None
+    if tam_bloque < 1:
+        raise ValueError("tam_bloque debe ser al menos 1.")
+
+    total = 1
+    for valores in ejes.values():
+        total *= len(valores)
+    bloques = ((inicio, min(inicio + tam_bloque, total)) for inicio in range(0, total, tam_bloque))
+    procesos = procesos or os.cpu_count() or 1
+    hechos = 0
+
+    if procesos == 1:
+        for inicio, fin in bloques:
+            resultado = _evaluar_bloque(ejes, fijos, ciclo_carga, taps, inicio, fin)
+            hechos += fin - inicio
+            if progreso:
+                progreso(hechos, total)
+            yield resultado
+        return
+
+    max_pendientes = max_pendientes or 2 * procesos
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(ejes, fijos, ciclo_carga, taps)) as pool:
+        pendientes = deque()
+        try:
+            for inicio, fin in bloques:
+                pendientes.append((fin - inicio, pool.submit(_evaluar_bloque_trabajador, inicio, fin)))
+                if len(pendientes) < max_pendientes:
+                    continue
+                filas, futuro = pendientes.popleft()
+                resultado = futuro.result()
+                hechos += filas
+                if progreso:
+                    progreso(hechos, total)
+                yield resultado
+            while pendientes:
+                filas, futuro = pendientes.popleft()
+                resultado = futuro.result()
+                hechos += filas
+                if progreso:
+                    progreso(hechos, total)
+                yield resultado
+        finally:
+            # Si el consumidor abandona el flujo, no se evalúan los bloques restantes.
+            for _, futuro in pendientes:
+                futuro.cancel()
@@ -0,0 +1,372 @@
+# src/core/tabla_registros.py
+# -*- coding: utf-8 -*-
+"""
+Almacén columnar de registros de diseño, para barridos y lotes grandes.
+
+Una lista de RegistroDiseno (core/records.py) cuesta varios KB por diseño: cada
+campo es un objeto float/int/str de Python y cada tupla (escalones, piezas,
+TAPs) es otro objeto más. TablaRegistros guarda los mismos datos por columnas:
+
+    - cada campo escalar, en un solo buffer: array('d') para los números (ints,
+      bools y None se marcan aparte sólo si la columna los mezcla), un array de
+      enteros de 1 a 8 bytes si todos son ints, un diccionario con un código
+      por fila para los textos, o nada si el valor es el mismo en todas las
+      filas (entradas fijas de un barrido, opcionales sin usar);
+    - cada campo tupla, con sus elementos de todas las filas seguidos en una
+      columna hija y un desplazamiento final por fila (escalones -> piezas
+      también se aplana así, en dos niveles).
+
+Medido con tracemalloc en 2000 diseños trifásicos distintos con 2 TAPs: unos
+9 KB por diseño en una lista de RegistroDiseno, unos 1,7 KB en TablaRegistros
+(1,4 KB en pickle). Ese es el piso sin perder precisión: cada diseño completo
+tiene unos 170 doubles distintos, la mitad en el detalle de laminación por
+pieza. Un millón de diseños completos ocupa entonces ~1,5 GB; para barridos que
+sólo necesitan columnas escalares está core/batch.py (ejecutar_lote).
+
+Leer una fila reconstruye exactamente el RegistroDiseno que se agregó (mismos
+tipos y valores), y resultado(i) lo envuelve en un ResultadoDiseno para los
+renderizadores. columna('nucleo.D') devuelve un campo de todas las filas como
+arreglo NumPy. La tabla se serializa con pickle como unos pocos buffers, barata
+de enviar entre procesos.
+"""
+
+import math
+from array import array
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+
+from .records import RegistroDiseno
+
+# Tipo de cada valor de una columna numérica
+_FLOTANTE, _ENTERO, _BOOLEANO, _NULO = range(4)
+_MAX_ENTERO_EXACTO = 2 ** 53
+
+
+def _codigo(valor):
+    """Tipo de un valor que se guarda sin pérdida en un double, o None si no lo es."""
+    if valor is None:
+        return _NULO
+    tipo = type(valor)
+    if tipo is float:
+        return _FLOTANTE
+    if tipo is bool:
+        return _BOOLEANO
+    if tipo is int and -_MAX_ENTERO_EXACTO <= valor <= _MAX_ENTERO_EXACTO:
+        return _ENTERO
+    return None
+
+
+def _mismo_valor(a, b):
+    return type(a) is type(b) and a == b
+
+
+# Arrays de enteros de menor a mayor, con su rango
+_LIMITES_ENTEROS = {'b': (-2 ** 7, 2 ** 7 - 1), 'h': (-2 ** 15, 2 ** 15 - 1),
+                    'i': (-2 ** 31, 2 ** 31 - 1), 'q': (-2 ** 63, 2 ** 63 - 1)}
+
+
+def _codigo_entero(valor, minimo='b'):
+    """Typecode de array más angosto (desde 'minimo') en el que cabe 'valor'."""
+    codigos = list(_LIMITES_ENTEROS)
+    for codigo in codigos[codigos.index(minimo):]:
+        inferior, superior = _LIMITES_ENTEROS[codigo]
+        if inferior <= valor <= superior:
+            return codigo
+    raise OverflowError(valor)
+
+
+def _nueva_columna(tipo):
+    """Columna para un campo anotado con 'tipo' (dataclass, tuple o escalar)."""
+    if is_dataclass(tipo):
+        return _Registro(tipo)
+    if tipo is tuple:
+        return _Secuencia()
+    return _Escalar()
+
+
+def _columna_para(valor):
+    """Columna para los elementos de una tupla, según el primero."""
+    if is_dataclass(valor):
+        return _Registro(type(valor))
+    if isinstance(valor, tuple):
+        return _Secuencia()
+    return _Escalar()
+
+
+class _Escalar:
+    """
+    Un campo escalar. Se guarda de la forma más compacta que conserva los valores
+    exactos, y cambia de forma cuando llega un valor que no cabe:
+        constante    un solo valor repetido en todas las filas (sin buffer)
+        enteros      ints en un array de 1, 2, 4 u 8 bytes según el mayor
+        numeros      doubles; ints, bools y None se marcan aparte si se mezclan
+        diccionario  cualquier valor (textos...), con un código por fila
+    """
+
+    __slots__ = ('n', 'modo', 'constante', 'datos', 'tipo', 'marcas', 'valores', '_indice')
+
+    def __init__(self):
+        self.n = 0
+        self.modo = 'constante'
+        self.constante = None
+        self.datos = None
+        self.tipo = None     # modo numeros: tipo común de las filas
+        self.marcas = None   # modo numeros: tipo por fila, sólo si la columna mezcla tipos
+        self.valores = None  # modo diccionario: valores distintos, en orden de aparición
+        self._indice = None
+
+    def agregar(self, valor):
+        if isinstance(valor, tuple) or is_dataclass(valor):
+            raise TypeError(f"Se esperaba un valor escalar, no {type(valor).__name__}")
+        if not self._agregar_en_modo(valor):
+            # No cabe en la forma actual: se reescribe la columna con todos los valores
+            valores = [self.valor(i) for i in range(self.n)]
+            valores.append(valor)
+            self._reconstruir(valores)
+
+    def _agregar_en_modo(self, valor):
+        modo = self.modo
+        if modo == 'constante':
+            if self.n and not _mismo_valor(valor, self.constante):
+                return False
+            self.constante = valor
+        elif modo == 'enteros':
+            if type(valor) is not int or not _LIMITES_ENTEROS['q'][0] <= valor <= _LIMITES_ENTEROS['q'][1]:
+                return False
+            minimo, maximo = _LIMITES_ENTEROS[self.datos.typecode]
+            if not minimo <= valor <= maximo:
+                self.datos = array(_codigo_entero(valor, self.datos.typecode), self.datos)
+            self.datos.append(valor)
+        elif modo == 'numeros':
+            codigo = _codigo(valor)
+            if codigo is None:
+                return False
+            self.datos.append(math.nan if codigo == _NULO else float(valor))
+            if self.marcas is not None:
+                self.marcas.append(codigo)
+            elif codigo != self.tipo:
+                self.marcas = bytearray([self.tipo]) * self.n
+                self.marcas.append(codigo)
+        else:
+            clave = (type(valor), valor)
+            codigo = self._indice.get(clave)
+            if codigo is None:
+                codigo = self._indice[clave] = len(self.valores)
+                self.valores.append(valor)
+            self.datos.append(codigo)
+        self.n += 1
+        return True
+
+    def _reconstruir(self, valores):
+        codigos = [_codigo(v) for v in valores]
+        self.n, self.constante, self.tipo, self.marcas, self.valores, self._indice = 0, None, None, None, None, None
+        if all(type(v) is int for v in valores) and all(_LIMITES_ENTEROS['q'][0] <= v <= _LIMITES_ENTEROS['q'][1] for v in valores):
+            self.modo = 'enteros'
+            self.datos = array(_codigo_entero(max(valores, key=abs)))
+        elif None not in codigos:
+            self.modo = 'numeros'
+            self.datos = array('d')
+            self.tipo = codigos[0]
+        else:
+            self.modo = 'diccionario'
+            self.datos = array('i')
+            self.valores, self._indice = [], {}
+        for valor in valores:
+            self._agregar_en_modo(valor)
+
+    def valor(self, i):
+        modo = self.modo
+        if modo == 'constante':
+            return self.constante
+        if modo == 'enteros':
+            return self.datos[i]
+        if modo == 'diccionario':
+            return self.valores[self.datos[i]]
+        codigo = self.marcas[i] if self.marcas is not None else self.tipo
+        if codigo == _NULO:
+            return None
+        x = self.datos[i]
+        if codigo == _ENTERO:
+            return int(x)
+        if codigo == _BOOLEANO:
+            return bool(x)
+        return x
+
+    def arreglo(self):
+        """Valores de todas las filas: float64 (None = NaN) o, si hay textos, objetos."""
+        if self.modo in ('enteros', 'numeros'):
+            return np.array(self.datos, dtype=np.float64)
+        if self.modo == 'constante' and _codigo(self.constante) is not None:
+            return np.full(self.n, math.nan if self.constante is None else float(self.constante))
+        return np.array([self.valor(i) for i in range(self.n)], dtype=object)
+
+    def tamano_bytes(self):
+        if self.datos is None:
+            return 0
+        return self.datos.itemsize * len(self.datos) + len(self.marcas or b'')
+
+    def __getstate__(self):
+        return {nombre: getattr(self, nombre) for nombre in self.__slots__ if nombre != '_indice'}
+
+    def __setstate__(self, estado):
+        for nombre, valor in estado.items():
+            setattr(self, nombre, valor)
+        self._indice = None if self.valores is None else {(type(v), v): i for i, v in enumerate(self.valores)}
+
+
+class _Secuencia:
+    """Un campo tupla: los elementos de todas las filas en una columna hija, más el final de cada fila."""
+
+    __slots__ = ('fin', 'nulas', 'hijo')
+
+    def __init__(self):
+        self.fin = array('I')  # pasa a 'q' si los elementos no caben en 32 bits
+        self.nulas = None  # filas con None en lugar de tupla, sólo si las hay
+        self.hijo = None   # se crea con el primer elemento
+
+    def agregar(self, valor):
+        fin = self.fin[-1] if self.fin else 0
+        if valor is None:
+            if self.nulas is None:
+                self.nulas = bytearray(len(self.fin))
+            self.nulas.append(1)
+            self.fin.append(fin)
+            return
+        if not isinstance(valor, tuple):
+            raise TypeError(f"Se esperaba una tupla, no {type(valor).__name__}")
+        for elemento in valor:
+            if self.hijo is None:
+                self.hijo = _columna_para(elemento)
+            self.hijo.agregar(elemento)
+        if self.nulas is not None:
+            self.nulas.append(0)
+        if fin + len(valor) >= 2 ** 32 and self.fin.typecode == 'I':
+            self.fin = array('q', self.fin)
+        self.fin.append(fin + len(valor))
+
+    def limites(self, i):
+        return (self.fin[i - 1] if i else 0), self.fin[i]
+
+    def valor(self, i):
+        if self.nulas is not None and self.nulas[i]:
+            return None
+        inicio, fin = self.limites(i)
+        return tuple(self.hijo.valor(j) for j in range(inicio, fin))
+
+    def tamano_bytes(self):
+        propio = self.fin.itemsize * len(self.fin) + len(self.nulas or b'')
+        return propio + (self.hijo.tamano_bytes() if self.hijo is not None else 0)
+
+
+class _Registro:
+    """Un dataclass: una columna por campo; las filas sin registro (None) se marcan aparte."""
+
+    __slots__ = ('cls', 'n', 'columnas', 'nulos')
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.n = 0
+        self.columnas = {f.name: _nueva_columna(f.type) for f in fields(cls)}
+        self.nulos = None
+
+    def agregar(self, registro):
+        if registro is None:
+            if self.nulos is None:
+                self.nulos = bytearray(self.n)
+            self.nulos.append(1)
+            for columna in self.columnas.values():
+                columna.agregar(None)
+        else:
+            if type(registro) is not self.cls:
+                raise TypeError(f"Se esperaba {self.cls.__name__}, no {type(registro).__name__}")
+            if self.nulos is not None:
+                self.nulos.append(0)
+            for nombre, columna in self.columnas.items():
+                columna.agregar(getattr(registro, nombre))
+        self.n += 1
+
+    def valor(self, i):
+        if self.nulos is not None and self.nulos[i]:
+            return None
+        return self.cls(**{nombre: columna.valor(i) for nombre, columna in self.columnas.items()})
+
+    def tamano_bytes(self):
+        return len(self.nulos or b'') + sum(c.tamano_bytes() for c in self.columnas.values())
+
+
+class TablaRegistros:
+    """Registros de diseño por columnas; cada fila se lee como RegistroDiseno o ResultadoDiseno."""
+
+    __slots__ = ('_raiz',)
+
+    def __init__(self, registros=()):
+        self._raiz = _Registro(RegistroDiseno)
+        self.extender(registros)
+
+    def agregar(self, registro):
+        """Agrega un RegistroDiseno, un ResultadoDiseno o un diseño ya calculado."""
+        if isinstance(getattr(registro, 'registro', None), RegistroDiseno):
+            registro = registro.registro  # ResultadoDiseno
+        elif not isinstance(registro, RegistroDiseno):
+            registro = RegistroDiseno.desde_diseno(registro)
+        self._raiz.agregar(registro)
+
+    def extender(self, registros):
+        for registro in registros:
+            self.agregar(registro)
+
+    def __len__(self):
+        return self._raiz.n
+
+    def __getitem__(self, i):
+        """RegistroDiseno de la fila 'i' (admite índices negativos)."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Fila fuera de la tabla.")
+        return self._raiz.valor(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._raiz.valor(i)
+
+    def resultado(self, i):
+        """ResultadoDiseno (sin figuras) de la fila 'i', para los renderizadores."""
+        from .results import ResultadoDiseno
+        return ResultadoDiseno(self[i])
+
+    def _buscar(self, ruta):
+        columna = self._raiz
+        for parte in ruta.split('.'):
+            if not isinstance(columna, _Registro) or parte not in columna.columnas:
+                raise KeyError(f"Campo desconocido: '{ruta}'")
+            columna = columna.columnas[parte]
+        return columna
+
+    def columna(self, ruta):
+        """
+        Campo escalar de todas las filas como arreglo NumPy, p. ej.
+        columna('nucleo.D') o columna('entrada.acero'). Los números salen en
+        float64 con NaN donde el valor (o su registro de fase) es None.
+        """
+        columna = self._buscar(ruta)
+        if not isinstance(columna, _Escalar):
+            raise ValueError(f"'{ruta}' no es un campo escalar; use secuencia() para las tuplas.")
+        return columna.arreglo()
+
+    def secuencia(self, ruta):
+        """
+        Campo tupla de números de todas las filas, p. ej. secuencia('nucleo.anchos'):
+        (valores, fin), con los elementos de la fila i en valores[fin[i-1]:fin[i]].
+        """
+        columna = self._buscar(ruta)
+        if not isinstance(columna, _Secuencia) or not isinstance(columna.hijo, (_Escalar, type(None))):
+            raise ValueError(f"'{ruta}' no es una tupla de números.")
+        valores = columna.hijo.arreglo() if columna.hijo is not None else np.empty(0)
+        return valores, np.array(columna.fin, dtype=np.int64)
+
+    def tamano_bytes(self):
+        """Bytes de los buffers de datos (sin la sobrecarga fija de los objetos)."""
+        return self._raiz.tamano_bytes()
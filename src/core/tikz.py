@@ -0,0 +1,321 @@
+# src/core/tikz.py
+# -*- coding: utf-8 -*-
+"""
+Backend TikZ para las figuras del núcleo y de laminación.
+
+FiguraTikz y EjesTikz imitan la parte de matplotlib.figure.Figure y
+matplotlib.axes.Axes que usan los plotters (add_gridspec, add_subplot,
+add_patch, text, annotate, set_title, axis, set_xlim...). Los plotters calculan
+la geometría igual que siempre y, en lugar de rasterizarla, cada llamada queda
+registrada; guardar() la escribe como código TikZ. No se dibuja nada con
+matplotlib ni se escriben imágenes: el reporte incluye el código en el propio
+.tex (incluir()) y pdflatex lo dibuja en vectorial.
+
+Cada eje es un tikzpicture con escala 1:1 entre x e y (los plotters usan
+axis('equal')), dimensionado para ocupar su fila del gridspec dentro del
+figsize. El conjunto se escala al ancho del reporte con \\resizebox, así que los
+textos guardan la proporción que tenían en la imagen de matplotlib.
+"""
+
+import os
+
+from matplotlib import colors as mcolors
+from matplotlib import patches as mpatches
+from matplotlib import rcParams
+from matplotlib.font_manager import FontProperties
+from matplotlib.ticker import MaxNLocator
+
+EXTENSION = 'tikz'
+
+_ESCAPES = {
+    '\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+    '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}',
+}
+_ANCLAS_H = {'center': '', 'left': 'west', 'right': 'east'}
+_ANCLAS_V = {'center': '', 'center_baseline': '', 'baseline': 'base', 'top': 'north', 'bottom': 'south'}
+
+
+def _escapar(texto):
+    return '\\\\'.join(''.join(_ESCAPES.get(c, c) for c in linea) for linea in str(texto).split('\n'))
+
+def _num(valor):
+    texto = f'{float(valor):.6f}'.rstrip('0').rstrip('.')
+    return '0' if texto in ('', '-0') else texto
+
+def _color(color):
+    """Color de matplotlib -> (especificación xcolor, opacidad)."""
+    r, g, b, a = mcolors.to_rgba(color)
+    return '{rgb,255:red,%d;green,%d;blue,%d}' % (round(r * 255), round(g * 255), round(b * 255)), a
+
+def _fuente(tamano=None, negrita=False):
+    puntos = FontProperties(size=tamano if tamano is not None else rcParams['font.size']).get_size_in_points()
+    return r'\fontsize{%s}{%s}\selectfont%s' % (_num(puntos), _num(1.2 * puntos), r'\bfseries' if negrita else '')
+
+def _ancla(ha, va, rotacion=0):
+    # matplotlib alinea la caja ya rotada; con 90° sus lados son otras anclas del nodo
+    if rotacion == 90:
+        vertical = {'right': 'south', 'left': 'north'}.get(ha, '')
+        horizontal = {'top': 'east', 'bottom': 'west'}.get(va, '')
+    else:
+        vertical, horizontal = _ANCLAS_V.get(va, ''), _ANCLAS_H.get(ha, '')
+    return ' '.join(p for p in (vertical, horizontal) if p) or 'center'
+
+
+class _GridSpec:
+    def __init__(self, filas, alturas):
+        self.filas = filas
+        self.alturas = list(alturas or [1] * filas)
+
+    def __getitem__(self, clave):
+        fila = clave[0] if isinstance(clave, tuple) else clave
+        return self, fila
+
+
+class EjesTikz:
+    """Registro de lo que un plotter dibuja en un eje."""
+
+    def __init__(self, fig, proporcion):
+        self.fig = fig
+        self.proporcion = proporcion  # fracción de la altura de la figura
+        self.patches = []
+        self.flechas = []
+        self.textos = []
+        self.titulo = ''
+        self.xlabel = ''
+        self.ylabel = ''
+        self.visible = True
+        self.con_grilla = False
+        self.con_leyenda = False
+        self.xlim = None
+        self.ylim = None
+
+    # --- API de Axes usada por los plotters ----------------------------------
+
+    def add_patch(self, patch):
+        self.patches.append(patch)
+        return patch
+
+    def text(self, x, y, s, ha='left', va='baseline', color=None, fontsize=None, weight=None,
+             fontweight=None, rotation=0, **_):
+        self.textos.append((x, y, s, ha, va, color or rcParams['text.color'], fontsize,
+                            (weight or fontweight) == 'bold', rotation))
+
+    def annotate(self, texto, xy, xytext=None, arrowprops=None, **opciones):
+        if arrowprops is not None and xytext is not None:
+            estilo = arrowprops.get('arrowstyle', '->')
+            color = arrowprops.get('ec', arrowprops.get('edgecolor', arrowprops.get('color', 'k')))
+            self.flechas.append((xytext, xy, estilo, color))
+        if texto:
+            self.text(*(xytext or xy), texto, **opciones)
+
+    def set_title(self, titulo, **_):
+        self.titulo = titulo
+
+    def set_xlabel(self, texto, **_):
+        self.xlabel = texto
+
+    def set_ylabel(self, texto, **_):
+        self.ylabel = texto
+
+    def grid(self, visible=True, **_):
+        self.con_grilla = visible
+
+    def legend(self, *_, **__):
+        self.con_leyenda = True
+
+    def axis(self, modo=None):
+        if modo == 'off':
+            self.visible = False
+        elif modo == 'on':
+            self.visible = True
+
+    def set_aspect(self, *_, **__):
+        pass  # siempre 1:1
+
+    def autoscale_view(self, *_, **__):
+        pass
+
+    def set_xlim(self, inferior, superior=None):
+        self.xlim = tuple(inferior) if superior is None else (inferior, superior)
+
+    def set_ylim(self, inferior, superior=None):
+        self.ylim = tuple(inferior) if superior is None else (inferior, superior)
+
+    def get_xlim(self):
+        return self.xlim or self._limites_datos()[0]
+
+    def get_ylim(self):
+        return self.ylim or self._limites_datos()[1]
+
+    # --- Geometría -------------------------------------------------------------
+
+    def _puntos_patches(self):
+        for patch in self.patches:
+            if isinstance(patch, mpatches.Circle):
+                (cx, cy), r = patch.center, patch.radius
+                yield from ((cx - r, cy - r), (cx + r, cy + r))
+            elif isinstance(patch, mpatches.Rectangle):
+                x, y = patch.get_xy()
+                yield from ((x, y), (x + patch.get_width(), y + patch.get_height()))
+            else:
+                yield from (tuple(p) for p in patch.get_xy())
+
+    def _limites_datos(self, con_anotaciones=False):
+        puntos = list(self._puntos_patches())
+        if con_anotaciones:
+            puntos += [p for inicio, fin, _, _ in self.flechas for p in (inicio, fin)]
+            puntos += [(x, y) for x, y, *_ in self.textos]
+        if not puntos:
+            return (0.0, 1.0), (0.0, 1.0)
+        xs, ys = [float(p[0]) for p in puntos], [float(p[1]) for p in puntos]
+        margen_x = 0.05 * (max(xs) - min(xs)) or 0.5
+        margen_y = 0.05 * (max(ys) - min(ys)) or 0.5
+        return (min(xs) - margen_x, max(xs) + margen_x), (min(ys) - margen_y, max(ys) + margen_y)
+
+    # --- Salida ----------------------------------------------------------------
+
+    def _patch(self, patch):
+        estilo = []
+        if patch.get_fill():
+            relleno, opacidad = _color(patch.get_facecolor())
+            estilo.append(f'fill={relleno}')
+            if opacidad < 1:
+                estilo.append(f'fill opacity={_num(opacidad)}')
+        borde, opacidad_borde = _color(patch.get_edgecolor())
+        if opacidad_borde > 0:
+            estilo.append(f'draw={borde}')
+            estilo.append(f'line width={_num(patch.get_linewidth())}pt')
+            if patch.get_linestyle() in ('--', 'dashed'):
+                estilo.append('dashed')
+        if isinstance(patch, mpatches.Circle):
+            (cx, cy), r = patch.center, patch.radius
+            forma = f'({_num(cx)},{_num(cy)}) circle[radius={_num(r)}]'
+        elif isinstance(patch, mpatches.Rectangle):
+            x, y = patch.get_xy()
+            forma = f'({_num(x)},{_num(y)}) rectangle ({_num(x + patch.get_width())},{_num(y + patch.get_height())})'
+        else:
+            forma = ' -- '.join(f'({_num(x)},{_num(y)})' for x, y in patch.get_xy()) + ' -- cycle'
+        return rf"\path[{', '.join(estilo)}] {forma};"
+
+    def _flecha(self, inicio, fin, estilo, color):
+        color, _ = _color(color)
+        return rf"\draw[{estilo}, draw={color}] ({_num(inicio[0])},{_num(inicio[1])}) -- ({_num(fin[0])},{_num(fin[1])});"
+
+    def _texto(self, x, y, s, ha, va, color, tamano, negrita, rotacion):
+        color, _ = _color(color)
+        opciones = [f'anchor={_ancla(ha, va, rotacion)}', 'inner sep=1pt', 'align=center', f'text={color}',
+                    f'font={_fuente(tamano, negrita)}']
+        if rotacion:
+            opciones.append(f'rotate={_num(rotacion)}')
+        return rf"\node[{', '.join(opciones)}] at ({_num(x)},{_num(y)}) {{{_escapar(s)}}};"
+
+    def _marco(self, xlim, ylim, escala):
+        """Marco, marcas, grilla, etiquetas y leyenda de un eje visible."""
+        lineas = [rf"\draw[line width=0.8pt] ({_num(xlim[0])},{_num(ylim[0])}) rectangle ({_num(xlim[1])},{_num(ylim[1])});"]
+        fuente = _fuente(rcParams['xtick.labelsize'])
+        marca = 0.05 / escala  # 0.05 in en unidades de datos
+        for x in MaxNLocator(nbins=8, steps=[1, 2, 2.5, 5, 10]).tick_values(*xlim):
+            if xlim[0] <= x <= xlim[1]:
+                if self.con_grilla:
+                    lineas.append(rf"\draw[gray!40, line width=0.5pt] ({_num(x)},{_num(ylim[0])}) -- ({_num(x)},{_num(ylim[1])});")
+                lineas.append(rf"\draw ({_num(x)},{_num(ylim[0])}) -- ++(0,{_num(-marca)}) node[anchor=north, font={fuente}] {{{x:g}}};")
+        for y in MaxNLocator(nbins=8, steps=[1, 2, 2.5, 5, 10]).tick_values(*ylim):
+            if ylim[0] <= y <= ylim[1]:
+                if self.con_grilla:
+                    lineas.append(rf"\draw[gray!40, line width=0.5pt] ({_num(xlim[0])},{_num(y)}) -- ({_num(xlim[1])},{_num(y)});")
+                lineas.append(rf"\draw ({_num(xlim[0])},{_num(y)}) -- ++({_num(-marca)},0) node[anchor=east, font={fuente}] {{{y:g}}};")
+        fuente = _fuente(rcParams['axes.labelsize'])
+        if self.xlabel:
+            lineas.append(rf"\node[anchor=north, font={fuente}, yshift=-1.4em] at ({_num(sum(xlim) / 2)},{_num(ylim[0])}) {{{_escapar(self.xlabel)}}};")
+        if self.ylabel:
+            lineas.append(rf"\node[anchor=south, rotate=90, font={fuente}, yshift=2.2em] at ({_num(xlim[0])},{_num(sum(ylim) / 2)}) {{{_escapar(self.ylabel)}}};")
+        entradas = [p for p in self.patches if p.get_label() and not p.get_label().startswith('_')]
+        if self.con_leyenda and entradas:
+            filas = []
+            for patch in entradas:
+                color, _ = _color(patch.get_edgecolor())
+                filas.append(rf"\textcolor{color}{{\rule[0.5ex]{{1.5em}}{{1pt}}}}~{_escapar(patch.get_label())}")
+            leyenda = '\\\\'.join(filas)
+            lineas.append(rf"\node[anchor=north east, draw=gray!50, fill=white, align=left, inner sep=3pt, "
+                          rf"font={_fuente(rcParams['legend.fontsize'])}] at ({_num(xlim[1])},{_num(ylim[1])}) "
+                          rf"{{{leyenda}}};")
+        return lineas
+
+    def tikz(self, ancho, alto):
+        """tikzpicture del eje dentro de una caja de ancho x alto pulgadas."""
+        if self.visible:
+            xlim, ylim = self.get_xlim(), self.get_ylim()
+            util_x, util_y = 0.80 * ancho, 0.80 * alto
+        else:
+            xlim, ylim = (self.xlim, self.ylim) if self.xlim and self.ylim else self._limites_datos(True)
+            util_x, util_y = 0.90 * ancho, 0.85 * alto
+        escala = min(util_x / ((xlim[1] - xlim[0]) or 1.0), util_y / ((ylim[1] - ylim[0]) or 1.0))  # in por unidad
+        lineas = [rf"\begin{{tikzpicture}}[x={_num(escala)}in, y={_num(escala)}in]"]
+        if self.visible:
+            lineas.append(r"\begin{scope}")
+            lineas.append(rf"\clip ({_num(xlim[0])},{_num(ylim[0])}) rectangle ({_num(xlim[1])},{_num(ylim[1])});")
+        lineas += [self._patch(p) for p in self.patches]
+        if self.visible:
+            lineas.append(r"\end{scope}")
+            lineas += self._marco(xlim, ylim, escala)
+        lineas += [self._flecha(*f) for f in self.flechas]
+        lineas += [self._texto(*t) for t in self.textos]
+        if self.titulo:
+            lineas.append(rf"\node[anchor=south, align=center, inner sep=4pt, font={_fuente(rcParams['axes.titlesize'])}] "
+                          rf"at (current bounding box.north) {{{_escapar(self.titulo)}}};")
+        lineas.append(r"\end{tikzpicture}")
+        return '\n'.join(lineas)
+
+
+class FiguraTikz:
+    """Figura con ejes apilados en filas, como las de los plotters."""
+
+    def __init__(self, figsize):
+        self.ancho, self.alto = figsize
+        self.ejes = []
+        self._gridspec = None
+
+    def get_figwidth(self):
+        return self.ancho
+
+    def add_gridspec(self, nrows, ncols=1, height_ratios=None, **_):
+        self._gridspec = _GridSpec(nrows, height_ratios)
+        return self._gridspec
+
+    def add_subplot(self, spec=None):
+        if isinstance(spec, tuple):
+            gridspec, fila = spec
+            proporcion = gridspec.alturas[fila] / sum(gridspec.alturas)
+        else:
+            proporcion = 1.0
+        ejes = EjesTikz(self, proporcion)
+        self.ejes.append(ejes)
+        return ejes
+
+    def subplots(self):
+        return self.add_subplot()
+
+    def tight_layout(self, *_, **__):
+        pass
+
+    def codigo(self):
+        """Código LaTeX de la figura (una minipage del ancho de la figura)."""
+        partes = [rf"\begin{{minipage}}{{{_num(self.ancho)}in}}\centering"]
+        for i, ejes in enumerate(self.ejes):
+            if i:
+                partes.append(r"\par\medskip")
+            partes.append(ejes.tikz(self.ancho, self.alto * ejes.proporcion))
+        partes.append(r"\end{minipage}")
+        return '\n'.join(partes) + '\n'
+
+    def guardar(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(self.codigo())
+        return os.path.abspath(ruta)
+
+
+def incluir(ruta, ancho):
+    """LaTeX que inserta la figura TikZ de 'ruta' escalada a 'ancho' (p. ej. r'0.6\\textwidth')."""
+    with open(ruta, encoding='utf-8') as f:
+        codigo = f.read()
+    return f"\\centering\n\\resizebox{{{ancho}}}{{!}}{{%\n{codigo}}}%\n"
@@ -2,12 +2,23 @@
 # -*- coding: utf-8 -*-
 
 import math
-import os
-from core import database as db
-from . import lamination_plotters
+from core import catalog
 
-def run(d, work_dir=None):
-    """Calcula el peso del núcleo detallado por cada escalón y sus laminaciones."""
+# Atributos del diseño que lee y escribe esta fase; core/engine.py los usa para
+# invalidar y recalcular sólo las fases afectadas por un cambio.
+LEE = (
+    'fases', 'acero', 'cut_type', 'fa_opcional', 'rho_acero_opcional',
+    'usar_valores_opcionales', 'fa_original', 'An', 'D', 'anchos', 'espesores', 'b', 'c',
+    'c_prima', 'b_por_escalon', 'c_prima_por_escalon', 'L_monofasico', 'L_trifasico'
+)
+ESCRIBE = ('peso_por_escalon', 'Qr_por_laminaciones', 'Qr')
+
+def run(d):
+    """Calcula el peso del núcleo detallado por cada escalón y sus laminaciones.
+
+    Sólo calcula: no dibuja ni escribe archivos. Las figuras de cada escalón las
+    dibuja ui/figures.py, a través de ui/report_export.generar_figuras.
+    """
     d.peso_por_escalon = []
     d.Qr_por_laminaciones = 0.0
 
@@ -19,7 +30,7 @@ def run(d, work_dir=None):
         rho_kg_cm3 = rho_g_cm3 / 1000.0
     
     # Obtener datos del acero incluyendo el factor de apilamiento
-    steel_data = db.acero_electrico_db.get(getattr(d, 'acero', None), {})
+    steel_data = catalog.activo().acero_electrico_db.get(getattr(d, 'acero', None), {})
     espesor_lamina_mm = steel_data.get('espesor_mm', 0.35)
     espesor_lamina_cm = espesor_lamina_mm / 10.0
     
@@ -68,9 +79,9 @@ def run(d, work_dir=None):
                 if cut_type == 'Recto':
                     # Fórmulas corregidas para corte recto usando b_actual_cm y c_prima_actual_cm
                     piezas_defs = {
-                        '1': {'l': ancho_escalon_cm + b_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 3, 'formula': 'a + b'},
-                        '2': {'l': ancho_escalon_cm + c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': "a + c'"},
-                        '3': {'l': ancho_escalon_cm + 2 * c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 1, 'formula': "a + 2*c'"}
+                        '1': {'l': ancho_escalon_cm + b_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 3},
+                        '2': {'l': ancho_escalon_cm + c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2},
+                        '3': {'l': ancho_escalon_cm + 2 * c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 1}
                     }
                 else:  # Diagonal - geometrías trapezoidales (usar b_actual_cm y c_prima_actual_cm)
                     # Figura 1: trapecio con base menor = b_actual_cm, base mayor = 2*a+b_actual_cm, altura = a
@@ -84,16 +95,16 @@ def run(d, work_dir=None):
                     area_fig3 = ancho_escalon_cm * b_actual_cm + (ancho_escalon_cm * ancho_escalon_cm) / 2.0
                     
                     piezas_defs = {
-                        '1': {'area': area_fig1, 'w': ancho_escalon_cm, 'n_por_capa': 3, 'formula': 'Trapecio: (b + 2a + b) * a / 2'},
-                        '2': {'area': area_fig2, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': 'Trapecio - triángulo central'},
-                        '3': {'area': area_fig3, 'w': ancho_escalon_cm, 'n_por_capa': 1, 'formula': 'Rectángulo + 2 triángulos: a*b + a²/2'}
+                        '1': {'area': area_fig1, 'w': ancho_escalon_cm, 'n_por_capa': 3},
+                        '2': {'area': area_fig2, 'w': ancho_escalon_cm, 'n_por_capa': 2},
+                        '3': {'area': area_fig3, 'w': ancho_escalon_cm, 'n_por_capa': 1}
                     }
             elif getattr(d, 'fases', 3) == 1:
                 if cut_type == 'Recto':
                     # Monofásico recto: usar b_actual_cm y c_prima_actual_cm
                     piezas_defs = {
-                        '1': {'l': ancho_escalon_cm + b_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': 'a + b'},
-                        '2': {'l': ancho_escalon_cm + c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': "a + c'"}
+                        '1': {'l': ancho_escalon_cm + b_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2},
+                        '2': {'l': ancho_escalon_cm + c_prima_actual_cm, 'w': ancho_escalon_cm, 'n_por_capa': 2}
                     }
                 else:  # Diagonal - geometrías trapezoidales para monofásico (usar valores actualizados)
                     # Figura 1: trapecio con base menor = b_actual_cm, base mayor = 2*a+b_actual_cm, altura = a
@@ -102,8 +113,8 @@ def run(d, work_dir=None):
                     area_fig2_mono = (c_prima_actual_cm + (2 * ancho_escalon_cm + c_prima_actual_cm)) * ancho_escalon_cm / 2.0
                     
                     piezas_defs = {
-                        '1': {'area': area_fig1_mono, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': 'Trapecio: (b + 2a + b) * a / 2'},
-                        '2': {'area': area_fig2_mono, 'w': ancho_escalon_cm, 'n_por_capa': 2, 'formula': "Trapecio: (c' + 2a + c') * a / 2"}
+                        '1': {'area': area_fig1_mono, 'w': ancho_escalon_cm, 'n_por_capa': 2},
+                        '2': {'area': area_fig2_mono, 'w': ancho_escalon_cm, 'n_por_capa': 2}
                     }
 
             if not piezas_defs:
@@ -124,84 +135,33 @@ def run(d, work_dir=None):
                 # Aplicar factor de apilamiento
                 peso_total_tipo = volumen_una_lamina * rho_kg_cm3 * num_piezas_total * factor_apilamiento
 
-                # --- INICIO DE LA CORRECCIÓN ---
-                # Se definen las fórmulas y valores por separado, usando las claves
-                # que el renderer.py está esperando.
-                
-                # 1. Datos para el cálculo del NÚMERO DE PIEZAS (detallando ancho de lámina)
-                formula_num_piezas = r"N_{piezas} = \frac{\text{ancho\_paquete}}{\text{espesor\_lamina}} \times n_{piezas\_por\_capa}"
-                valores_num_piezas = fr"N_{{{nombre}}} = \frac{{{ancho_paquete_cm:.2f} \text{{ cm}}}}{{{espesor_lamina_cm:.4f} \text{{ cm}}}} \times {pieza['n_por_capa']} = {num_laminas} \times {pieza['n_por_capa']}"
-                resultado_num_piezas = f"N = {num_piezas_total}"
-
-                # 2. Datos para el cálculo del PESO (incluyendo factor de apilamiento)
-                if 'area' in pieza:
-                    formula_peso = r"Q_{pieza} = \text{Área} \times e_{lam} \times N_{piezas} \times \rho_{acero} \times f_{apilamiento}"
-                    valores_peso = (
-                        fr"Q_{{{nombre}}} = {pieza['area']:.2f} \times {espesor_lamina_cm:.4f} "
-                        fr"\times {num_piezas_total} \times {rho_kg_cm3:.5f} \times {factor_apilamiento:.3f}"
-                    )
-                else:
-                    formula_peso = r"Q_{pieza} = (l \times w \times e_{lam}) \times N_{piezas} \times \rho_{acero} \times f_{apilamiento}"
-                    valores_peso = (
-                        fr"Q_{{{nombre}}} = ({pieza['l']:.2f} \times {pieza['w']:.2f} \times {espesor_lamina_cm:.4f}) "
-                        fr"\times {num_piezas_total} \times {rho_kg_cm3:.5f} \times {factor_apilamiento:.3f}"
-                    )
-
-                # Agregar información sobre la fórmula de largo específica
-                formula_largo = pieza.get('formula', 'L = ?')
-                
-                # Preparar el detalle de la pieza
+                # Sólo números: los textos LaTeX (fórmulas, sustituciones, nombres)
+                # los arma renderer.py a partir de estos valores al generar el reporte.
                 detalle_pieza = {
-                    'nombre': f'Figura {nombre}',
+                    'numero': int(nombre),
                     'num_piezas': num_piezas_total,
                     'peso_kg': peso_total_tipo,
                     'ancho_lamina_cm': ancho_escalon_cm,
                     'espesor_lamina_mm': espesor_lamina_mm,
                     'factor_apilamiento': factor_apilamiento,
                     'largo_cm': largo_efectivo,
-                    'formula_largo': formula_largo,
-                    'tipo_corte': cut_type,
-                    # Guardar ambos conjuntos de datos en el diccionario con las claves correctas
-                    'formula_num_piezas': formula_num_piezas,
-                    'valores_num_piezas': valores_num_piezas,
-                    'resultado_num_piezas': resultado_num_piezas,
-                    'formula_peso': formula_peso,
-                    'valores_peso': valores_peso,
+                    'n_por_capa': pieza['n_por_capa'],
+                    'num_laminas': num_laminas,
+                    'ancho_paquete_cm': ancho_paquete_cm,
+                    'rho_kg_cm3': rho_kg_cm3,
                 }
-                
                 # Agregar área si existe para geometrías trapezoidales
                 if 'area' in pieza:
                     detalle_pieza['area'] = pieza['area']
                 
                 detalles_escalon.append(detalle_pieza)
-                # --- FIN DE LA CORRECCIÓN ---
                 peso_total_escalon += peso_total_tipo
 
-            plot_path = None
-            try:
-                # Proveer al generador de gráficos los detalles de las piezas calculadas
-                # para que los plotters usen las longitudes exactas ya determinadas.
-                # Se guarda temporalmente en el objeto 'd' y se elimina después.
-                if isinstance(work_dir, str) and work_dir:
-                    plot_output_dir = os.path.join(work_dir, 'temp', f'step_{i + 1}')
-                    os.makedirs(plot_output_dir, exist_ok=True)
-                    d._detalles_para_plot = detalles_escalon
-                    plot_path = lamination_plotters.generate_plot(d, output_dir=plot_output_dir, step_index=i)
-                    if hasattr(d, '_detalles_para_plot'):
-                        delattr(d, '_detalles_para_plot')
-                else:
-                    d._detalles_para_plot = detalles_escalon
-                    plot_path = lamination_plotters.generate_plot(d, output_dir=f'temp/step_{i + 1}', step_index=i)
-                    if hasattr(d, '_detalles_para_plot'):
-                        delattr(d, '_detalles_para_plot')
-            except Exception as e:
-                print(f"Advertencia: No se pudo generar el gráfico para el escalón {i+1}. Error: {e}")
-
             d.peso_por_escalon.append({
                 'escalon': i + 1,
                 'detalles': detalles_escalon,
                 'peso_total_escalon': peso_total_escalon,
-                'plot_path': plot_path
+                'plot_path': None  # lo completa la etapa de gráficos
             })
             d.Qr_por_laminaciones += peso_total_escalon
 
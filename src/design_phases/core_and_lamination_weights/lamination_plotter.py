@@ -5,7 +5,7 @@ Mantiene la API antigua generate_lamination_plot(diseno, output_dir).
 import os
 from .lamination_plotters import generate_plot
 
-def generate_lamination_plot(d, output_dir='temp'):
+def generate_lamination_plot(d, output_dir):
     """Llama a la fábrica de plotters respetando la interfaz previa."""
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -1,8 +1,17 @@
 # src/design_phases/nucleus_and_window/lamination_plotters/__init__.py
+import importlib
 import os
-from . import monofasico_recto, monofasico_45deg, trifasico_recto, trifasico_45deg
 
-def generate_plot(d, output_dir='temp', step_index=0):
+# Plotter de cada (fases, tipo de corte). Se importa al dibujar: cada módulo
+# carga matplotlib, y quien sólo calcula no debe pagar esa importación.
+PLOTTERS = {
+    (3, 'Recto'): 'trifasico_recto',
+    (3, 'Diagonal'): 'trifasico_45deg',
+    (1, 'Recto'): 'monofasico_recto',
+    (1, 'Diagonal'): 'monofasico_45deg',
+}
+
+def generate_plot(d, output_dir, step_index=0, detalles=None, **guardado):
     """
     Función 'fábrica' que selecciona y ejecuta el plotter correcto
     basado en el número de fases y el tipo de corte del diseño.
@@ -11,6 +20,15 @@ def generate_plot(d, output_dir='temp', step_index=0):
     y el nombre del archivo. Cada plotter debe devolver la ruta absoluta
     del archivo generado.
 
+    'detalles' son las piezas del escalón calculadas en calculation.py
+    (d.peso_por_escalon[i]['detalles']); los plotters usan sus largos exactos.
+
+    'guardado' (formato, dpi, ancho_pulgadas) se pasa a core.plotting.guardar_figura;
+    sin él, PNG a 300 dpi.
+
+    'd' basta con que tenga la geometría que se dibuja: un diseño calculado o una
+    ui.figures.GeometriaLaminacion (lo que se envía a los procesos de figuras).
+
     Nota: step_index por defecto es 0 para ser robusto ante llamadas antiguas
     que no pasen explícitamente el índice.
     """
@@ -20,15 +38,9 @@ def generate_plot(d, output_dir='temp', step_index=0):
     # Asegurarse de que el directorio de salida sea absoluto
     absolute_output_dir = os.path.abspath(output_dir)
 
-    if fases == 3:
-        if cut == 'Recto':
-            return trifasico_recto.draw(d, absolute_output_dir, step_index=step_index)
-        elif cut == 'Diagonal':
-            return trifasico_45deg.draw(d, absolute_output_dir, step_index=step_index)
-    elif fases == 1:
-        if cut == 'Recto':
-            return monofasico_recto.draw(d, absolute_output_dir, step_index=step_index)
-        elif cut == 'Diagonal':
-            return monofasico_45deg.draw(d, absolute_output_dir, step_index=step_index)
-
-    raise ValueError(f"No hay un plotter disponible para {fases} fases con corte '{cut}'")
\ No newline at end of file
+    nombre = PLOTTERS.get((fases, cut))
+    if nombre is not None:
+        plotter = importlib.import_module(f'.{nombre}', __name__)
+        return plotter.draw(d, absolute_output_dir, step_index=step_index, detalles=detalles, **guardado)
+
+    raise ValueError(f"No hay un plotter disponible para {fases} fases con corte '{cut}'")
@@ -1,22 +1,21 @@
 import os
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from core.plotting import guardar_figura, plantilla
 import numpy as np # Necesario para los cálculos de límites
 
-def draw(d, output_dir, step_index=0):
+def _crear_ejes(fig):
+    gs = fig.add_gridspec(3, 1, height_ratios=[4, 2, 2])
+    return fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[1, 0]), fig.add_subplot(gs[2, 0])
+
+def draw(d, output_dir, step_index=0, detalles=None, formato='png', dpi=300, ancho_pulgadas=None):
     """
     Dibuja el ensamble y las piezas de un núcleo monofásico con corte a 45 grados.
     Las piezas individuales se dibujan como trapecios isósceles, que es la forma correcta.
     """
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f'lamination_monofasico_45deg_step_{step_index + 1}.png')
+    ruta_base = os.path.join(output_dir, f'lamination_monofasico_45deg_step_{step_index + 1}')
 
-    fig = plt.figure(figsize=(10, 12))
-    gs = fig.add_gridspec(3, 1, height_ratios=[4, 2, 2])
-    
-    ax_main = fig.add_subplot(gs[0, 0])
-    ax1 = fig.add_subplot(gs[1, 0])
-    ax2 = fig.add_subplot(gs[2, 0])
+    fig, (ax_main, ax1, ax2) = plantilla('monofasico_45deg', (10, 12), _crear_ejes, formato)
     
     # --- 1. CÁLCULO DE DIMENSIONES (OPTIMIZADO: USAR LISTAS PRE-CALCULADAS) ---
     # Usar las dimensiones actualizadas ya calculadas en nucleus_and_window/calculation.py
@@ -47,12 +46,12 @@ def draw(d, output_dir, step_index=0):
     base_menor_1 = b_mm
     base_menor_2 = c_prima_mm
 
-    # Detectar overrides provenientes de calculation.py (_detalles_para_plot)
-    override = getattr(d, '_detalles_para_plot', None)
+    # Largos exactos de las piezas calculados en calculation.py (peso_por_escalon[i]['detalles'])
+    override = detalles
     mapping = {}
     if override:
         for det in override:
-            name = det.get('nombre', '')
+            name = det.get('numero', '')
             num = ''.join(ch for ch in str(name) if ch.isdigit())
             if num:
                 mapping[num] = det.get('largo_cm', None)
@@ -153,10 +152,8 @@ def draw(d, output_dir, step_index=0):
     set_equal_scale(ax1, xlim1, ylim1, max_range)
     set_equal_scale(ax2, xlim2, ylim2, max_range)
     
-    plt.tight_layout(pad=2.0)
-    plt.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return os.path.abspath(output_path)
+    fig.tight_layout(pad=2.0)
+    return guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas)
 
 # --- INICIO: Ejemplo de uso y Mock de datos ---
 if __name__ == '__main__':
@@ -168,7 +165,6 @@ if __name__ == '__main__':
             # Ancho de la lámina en cm
             self.anchos = [5.0]
             self.g = 5.0 # Fallback en cm
-            self._detalles_para_plot = None
 
     d_simulado = MockDimensions()
     output_directory = 'output_test'
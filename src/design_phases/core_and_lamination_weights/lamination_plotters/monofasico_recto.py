@@ -1,22 +1,23 @@
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from core.plotting import guardar_figura, plantilla
 import os
 
-def draw(d, output_dir, step_index=0):
+def _crear_ejes(fig):
+    gs = fig.add_gridspec(3, 1, height_ratios=[4, 1, 1])
+    return fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[1, 0]), fig.add_subplot(gs[2, 0])
+
+def draw(d, output_dir, step_index=0, detalles=None, formato='png', dpi=300, ancho_pulgadas=None):
     """
     Dibuja el ensamble y las piezas de un núcleo monofásico con corte recto.
     CORREGIDO: Implementa un modelo de ensamble con esquinas superpuestas,
     según las especificaciones del usuario.
+    'detalles' se acepta por uniformidad con los demás plotters (aquí no se usa).
     """
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f'lamination_plot_step_{step_index + 1}.png')
-
-    fig = plt.figure(figsize=(9, 9)) # Aumentado para mejor visualización de cotas
-    gs = fig.add_gridspec(3, 1, height_ratios=[4, 1, 1])
+    ruta_base = os.path.join(output_dir, f'lamination_plot_step_{step_index + 1}')
 
-    ax_main = fig.add_subplot(gs[0, 0])
-    ax1 = fig.add_subplot(gs[1, 0])
-    ax2 = fig.add_subplot(gs[2, 0])
+    # figsize (9, 9): aumentado para mejor visualización de cotas
+    fig, (ax_main, ax1, ax2) = plantilla('monofasico_recto', (9, 9), _crear_ejes, formato)
 
     # --- INICIO DE LA CORRECCIÓN: USAR DIMENSIONES PRE-CALCULADAS POR ESCALÓN ---
     # Usar las dimensiones actualizadas ya calculadas en nucleus_and_window/calculation.py
@@ -121,10 +122,8 @@ def draw(d, output_dir, step_index=0):
         ax.axis('equal')
         ax.axis('off')
 
-    plt.tight_layout(pad=2.0)
-    plt.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return os.path.abspath(output_path)
+    fig.tight_layout(pad=2.0)
+    return guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas)
 
 # --- INICIO: Ejemplo de uso y Mock de datos ---
 if __name__ == '__main__':
@@ -137,7 +136,6 @@ if __name__ == '__main__':
             self.c = 15.0
             self.espesores = []
             self.g = 4.0
-            self._detalles_para_plot = None
 
     d_simulado = MockDimensions()
     output_directory = 'output_test_superpuesto'
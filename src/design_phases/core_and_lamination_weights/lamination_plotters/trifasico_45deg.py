@@ -1,23 +1,23 @@
 import os
 import re
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from core.plotting import guardar_figura, plantilla
 import numpy as np
 
-def draw(d, output_dir='temp', step_index=0):
+def _crear_ejes(fig):
+    gs = fig.add_gridspec(4, 1, height_ratios=[4, 2, 2, 2])
+    return (fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[1, 0]),
+            fig.add_subplot(gs[2, 0]), fig.add_subplot(gs[3, 0]))
+
+def draw(d, output_dir, step_index=0, detalles=None, formato='png', dpi=300, ancho_pulgadas=None):
     """
     Dibuja el ensamble y las piezas de un núcleo trifásico diagonal con geometrías específicas
     y calcula el área de cada pieza. El ensamble muestra yugos superior e inferior como piezas únicas.
     """
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, f'lamination_trifasico_45deg_step_{step_index + 1}.png')
+    ruta_base = os.path.join(output_dir, f'lamination_trifasico_45deg_step_{step_index + 1}')
 
-    fig = plt.figure(figsize=(12, 14))
-    gs = fig.add_gridspec(4, 1, height_ratios=[4, 2, 2, 2])
-    ax_main = fig.add_subplot(gs[0, 0])
-    ax1 = fig.add_subplot(gs[1, 0])
-    ax2 = fig.add_subplot(gs[2, 0])
-    ax3 = fig.add_subplot(gs[3, 0])
+    fig, (ax_main, ax1, ax2, ax3) = plantilla('trifasico_45deg', (12, 14), _crear_ejes, formato)
 
     # --- INICIO DE LA MODIFICACIÓN: USAR DIMENSIONES PRE-CALCULADAS POR ESCALÓN ---
     # Usar las dimensiones actualizadas ya calculadas en nucleus_and_window/calculation.py
@@ -47,12 +47,12 @@ def draw(d, output_dir='temp', step_index=0):
     largo_rect_3 = b_mm
     # --- FIN DE LA MODIFICACIÓN ---
 
-    # --- 1.b. Detectar overrides provenientes de calculation.py (_detalles_para_plot)
-    override = getattr(d, '_detalles_para_plot', None)
+    # --- 1.b. Largos exactos de las piezas calculados en calculation.py (peso_por_escalon[i]['detalles'])
+    override = detalles
     mapping = {}
     if override:
         for det in override:
-            name = det.get('nombre', '')
+            name = det.get('numero', '')
             m = re.search(r'(\d+)', str(name))
             if m:
                 try:
@@ -188,10 +188,8 @@ def draw(d, output_dir='temp', step_index=0):
 
     # --- AJUSTES FINALES Y ESCALA ---
     for ax in [ax_main, ax1, ax2, ax3]: ax.axis('equal'); ax.axis('off')
-    plt.tight_layout(pad=2.0, h_pad=3.0)
-    plt.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return os.path.abspath(output_path)
+    fig.tight_layout(pad=2.0, h_pad=3.0)
+    return guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas)
 
 # --- INICIO: Ejemplo de uso y Mock de datos ---
 if __name__ == '__main__':
@@ -201,7 +199,6 @@ if __name__ == '__main__':
             self.c_prima = 15.0
             self.anchos = [6.0]
             self.g = 6.0
-            self._detalles_para_plot = None
 
     d_simulado = MockDimensions()
     output_directory = 'output_test'
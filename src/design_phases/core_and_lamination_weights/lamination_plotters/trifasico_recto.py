@@ -1,10 +1,17 @@
 # src/design_phases/nucleus_and_window/lamination_plotters/trifasico_recto_ajustado.py
 import re
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from core.plotting import guardar_figura, plantilla
 import os
 
-def draw(d, output_dir, step_index=0):
+def _crear_ejes(fig):
+    gs = fig.add_gridspec(4, 2, height_ratios=[4, 1, 1, 1], width_ratios=[1,1])
+    return (fig.add_subplot(gs[0, :]),  # Ensamble principal
+            fig.add_subplot(gs[1, :]),  # Pieza 1
+            fig.add_subplot(gs[2, :]),  # Pieza 2
+            fig.add_subplot(gs[3, :]))  # Pieza 3
+
+def draw(d, output_dir, step_index=0, detalles=None, formato='png', dpi=300, ancho_pulgadas=None):
     """
     Dibuja el ensamble y las piezas de un núcleo trifásico.
     Utiliza un diccionario centralizado para las dimensiones de las piezas,
@@ -14,15 +21,9 @@ def draw(d, output_dir, step_index=0):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    output_path = os.path.join(output_dir, f'lamination_plot_step_{step_index + 1}_ajustado.png')
+    ruta_base = os.path.join(output_dir, f'lamination_plot_step_{step_index + 1}_ajustado')
 
-    fig = plt.figure(figsize=(8, 10))
-    gs = fig.add_gridspec(4, 2, height_ratios=[4, 1, 1, 1], width_ratios=[1,1])
-    
-    ax_main = fig.add_subplot(gs[0, :]) # Ensamble principal
-    ax1 = fig.add_subplot(gs[1, :])     # Pieza 1
-    ax2 = fig.add_subplot(gs[2, :])     # Pieza 2
-    ax3 = fig.add_subplot(gs[3, :])     # Pieza 3
+    fig, (ax_main, ax1, ax2, ax3) = plantilla('trifasico_recto', (8, 10), _crear_ejes, formato)
     
     # --- 1. CÁLCULO CENTRALIZADO DE DIMENSIONES (OPTIMIZADO: USAR LISTAS PRE-CALCULADAS) ---
     # Usar las dimensiones actualizadas ya calculadas en nucleus_and_window/calculation.py
@@ -49,12 +50,12 @@ def draw(d, output_dir, step_index=0):
     anchos_cm = getattr(d, 'anchos', [])
     lamination_width_mm = anchos_cm[step_index] * 10.0 if len(anchos_cm) > step_index else (getattr(d, 'g', 0.0) * 10.0)
 
-    # Detectar overrides provenientes de calculation.py (_detalles_para_plot)
-    override = getattr(d, '_detalles_para_plot', None)
+    # Largos exactos de las piezas calculados en calculation.py (peso_por_escalon[i]['detalles'])
+    override = detalles
     mapping = {}
     if override:
         for det in override:
-            name = det.get('nombre', '')
+            name = det.get('numero', '')
             m = re.search(r'(\d+)', str(name))
             if m:
                 mapping[m.group(1)] = det.get('largo_cm', None)
@@ -201,10 +202,8 @@ def draw(d, output_dir, step_index=0):
         ax.axis('equal')
         ax.axis('off')
     
-    plt.tight_layout(pad=1.5)
-    plt.savefig(output_path, dpi=300)
-    plt.close(fig)
-    return os.path.abspath(output_path)
+    fig.tight_layout(pad=1.5)
+    return guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas)
     
     
 # --- INICIO: Ejemplo de uso y Mock de datos para 'trifasico_recto' ---
@@ -221,7 +220,6 @@ if __name__ == '__main__':
             self.espesores = [0.5, 0.5]
             # Valor por defecto de grosor si no hay 'anchos' definido
             self.g = 6.0
-            self._detalles_para_plot = None
 
     d_simulado = MockDimensions()
     output_directory = 'output_test'
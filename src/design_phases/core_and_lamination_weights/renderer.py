@@ -4,9 +4,57 @@
 from pylatex import Section, Subsection, Command, Figure
 from pylatex.utils import NoEscape, bold
 import os
+from core import tikz
 
-def run(doc, d, add_step):
-    """Añade la sección de reporte de pesos del núcleo al documento LaTeX."""
+# Fórmula del largo de cada figura según (fases, tipo de corte)
+FORMULAS_LARGO = {
+    (3, 'Recto'): {1: 'a + b', 2: "a + c'", 3: "a + 2*c'"},
+    (3, 'Diagonal'): {1: 'Trapecio: (b + 2a + b) * a / 2', 2: 'Trapecio - triángulo central',
+                      3: 'Rectángulo + 2 triángulos: a*b + a²/2'},
+    (1, 'Recto'): {1: 'a + b', 2: "a + c'"},
+    (1, 'Diagonal'): {1: 'Trapecio: (b + 2a + b) * a / 2', 2: "Trapecio: (c' + 2a + c') * a / 2"},
+}
+
+def textos_pieza(pieza):
+    """
+    Arma las fórmulas y sustituciones en LaTeX de una figura a partir de los
+    números que guarda calculation.py en peso_por_escalon[i]['detalles'].
+    Sólo se llama al renderizar, así el cálculo no formatea texto.
+    """
+    nombre = pieza['numero']
+    n_por_capa = pieza['n_por_capa']
+    num_laminas = pieza['num_laminas']
+    num_piezas_total = pieza['num_piezas']
+    espesor_lamina_cm = pieza['espesor_lamina_mm'] / 10.0
+    rho_kg_cm3 = pieza['rho_kg_cm3']
+    factor_apilamiento = pieza['factor_apilamiento']
+
+    # 1. Datos para el cálculo del NÚMERO DE PIEZAS (detallando ancho de lámina)
+    formula_num_piezas = r"N_{piezas} = \frac{\text{ancho\_paquete}}{\text{espesor\_lamina}} \times n_{piezas\_por\_capa}"
+    valores_num_piezas = fr"N_{{{nombre}}} = \frac{{{pieza['ancho_paquete_cm']:.2f} \text{{ cm}}}}{{{espesor_lamina_cm:.4f} \text{{ cm}}}} \times {n_por_capa} = {num_laminas} \times {n_por_capa}"
+    resultado_num_piezas = f"N = {num_piezas_total}"
+
+    # 2. Datos para el cálculo del PESO (incluyendo factor de apilamiento)
+    if 'area' in pieza:
+        formula_peso = r"Q_{pieza} = \text{Área} \times e_{lam} \times N_{piezas} \times \rho_{acero} \times f_{apilamiento}"
+        valores_peso = (
+            fr"Q_{{{nombre}}} = {pieza['area']:.2f} \times {espesor_lamina_cm:.4f} "
+            fr"\times {num_piezas_total} \times {rho_kg_cm3:.5f} \times {factor_apilamiento:.3f}"
+        )
+    else:
+        formula_peso = r"Q_{pieza} = (l \times w \times e_{lam}) \times N_{piezas} \times \rho_{acero} \times f_{apilamiento}"
+        valores_peso = (
+            fr"Q_{{{nombre}}} = ({pieza['largo_cm']:.2f} \times {pieza['ancho_lamina_cm']:.2f} \times {espesor_lamina_cm:.4f}) "
+            fr"\times {num_piezas_total} \times {rho_kg_cm3:.5f} \times {factor_apilamiento:.3f}"
+        )
+
+    return formula_num_piezas, valores_num_piezas, resultado_num_piezas, formula_peso, valores_peso
+
+def run(doc, d, add_step, espacio):
+    """
+    Añade la sección de reporte de pesos del núcleo al documento LaTeX. Las
+    figuras se referencian relativas al directorio de 'espacio' (ui/workspace.py).
+    """
     with doc.create(Section('Peso de Núcleo por Laminaciones', numbering=False)):
         
         if not hasattr(d, 'peso_por_escalon') or not d.peso_por_escalon:
@@ -18,44 +66,45 @@ def run(doc, d, add_step):
             
             with doc.create(Subsection(f"Dimensionado y Peso del Escalón {step_num}", numbering=False)):
                 # Mostrar tipo de corte si está disponible
-                if step_data['detalles'] and step_data['detalles'][0].get('tipo_corte'):
-                    tipo_corte = step_data['detalles'][0]['tipo_corte']
+                tipo_corte = getattr(d, 'cut_type', None)
+                if step_data['detalles'] and tipo_corte:
                     doc.append(NoEscape(f"\\textbf{{Tipo de corte:}} {tipo_corte}"))
                     doc.append(Command('newline'))
                     doc.append(Command('vspace', '0.3em'))
+                formulas_largo = FORMULAS_LARGO.get((getattr(d, 'fases', 3), tipo_corte), {})
                 
                 if 'detalles' in step_data and step_data['detalles']:
                     for pieza_detalle in step_data['detalles']:
+                        nombre_pieza = f"Figura {pieza_detalle['numero']}"
+                        formula_largo = formulas_largo.get(pieza_detalle['numero'], 'L = ?')
+                        (formula_num_piezas, valores_num_piezas, resultado_num_piezas,
+                         formula_peso, valores_peso) = textos_pieza(pieza_detalle)
                         
                         # 0. Mostrar información específica de la pieza según el tipo de corte
-                        tipo_corte = pieza_detalle.get('tipo_corte', 'Recto')
-                        
                         if tipo_corte == 'Diagonal':
                             # Para cortes diagonales, mostrar información de área
                             if 'area' in pieza_detalle:
                                 area_cm2 = pieza_detalle['area']
-                                doc.append(NoEscape(f"\\textbf{{Área de {pieza_detalle.get('nombre', 'pieza')}:}} {area_cm2:.2f} cm²"))
+                                doc.append(NoEscape(f"\\textbf{{Área de {nombre_pieza}:}} {area_cm2:.2f} cm²"))
                                 doc.append(Command('newline'))
-                            formula_largo = pieza_detalle.get('formula_largo', '')
                             if formula_largo:
                                 doc.append(NoEscape(f"\\textbf{{Fórmula:}} {formula_largo}"))
                                 doc.append(Command('newline'))
                         else:
                             # Para cortes rectos, mostrar fórmula de largo como antes
-                            if pieza_detalle.get('formula_largo'):
-                                formula_largo = pieza_detalle['formula_largo']
+                            if formula_largo:
                                 largo_cm = pieza_detalle.get('largo_cm', 0)
-                                doc.append(NoEscape(f"\\textbf{{Largo de {pieza_detalle.get('nombre', 'pieza')}:}} $L = {formula_largo} = {largo_cm:.2f}$ cm"))
+                                doc.append(NoEscape(f"\\textbf{{Largo de {nombre_pieza}:}} $L = {formula_largo} = {largo_cm:.2f}$ cm"))
                                 doc.append(Command('newline'))
                         
                         # 1. Renderizar el cálculo del NÚMERO DE PIEZAS
                         try:
                             add_step(
                                 doc=doc,
-                                titulo=f"Número de Piezas - {pieza_detalle.get('nombre', 'pieza')}",
-                                formula=pieza_detalle.get('formula_num_piezas', 'N/A'),
-                                valores=pieza_detalle.get('valores_num_piezas', 'N/A'),
-                                resultado=pieza_detalle.get('resultado_num_piezas', 'N = ?'),
+                                titulo=f"Número de Piezas - {nombre_pieza}",
+                                formula=formula_num_piezas,
+                                valores=valores_num_piezas,
+                                resultado=resultado_num_piezas,
                                 unidad="piezas"
                             )
                         except Exception:
@@ -66,14 +115,14 @@ def run(doc, d, add_step):
                         try:
                             add_step(
                                 doc=doc,
-                                titulo=f"Cálculo Peso - {pieza_detalle.get('nombre', 'pieza')} ({num_piezas} piezas)",
-                                formula=pieza_detalle.get('formula_peso', 'N/A'),
-                                valores=pieza_detalle.get('valores_peso', 'N/A'),
+                                titulo=f"Cálculo Peso - {nombre_pieza} ({num_piezas} piezas)",
+                                formula=formula_peso,
+                                valores=valores_peso,
                                 resultado=f"Q = {pieza_detalle.get('peso_kg', 0.0):.3f}",
                                 unidad="kg"
                             )
                         except Exception:
-                            linea = (f"\\textbullet\\ {pieza_detalle.get('nombre', '')}: "
+                            linea = (f"\\textbullet\\ {nombre_pieza}: "
                                      f"{num_piezas} piezas, "
                                      f"Peso: {pieza_detalle.get('peso_kg', 0.0):.3f} kg")
                             doc.append(NoEscape(linea))
@@ -83,14 +132,17 @@ def run(doc, d, add_step):
                 plot_path = step_data.get('plot_path')
                 if plot_path and os.path.exists(plot_path):
                     try:
-                        # 1. Convertir la ruta absoluta a una ruta relativa al directorio actual de trabajo.
-                        relative_path = os.path.relpath(plot_path)
-                        # 2. Asegurar que la ruta use slashes (/) para ser compatible con LaTeX.
-                        safe_plot_path = relative_path.replace('\\', '/')
+                        # Ruta relativa al espacio de trabajo del reporte (donde compila
+                        # pdflatex), con slashes (/) para ser compatible con LaTeX.
+                        safe_plot_path = espacio.relativa(plot_path)
                         
                         # 3. Usar el entorno Figure con posición H para evitar saltos de página
                         with doc.create(Figure(position='H')) as fig:
-                            fig.add_image(safe_plot_path, width=NoEscape(r'0.6\textwidth'))
+                            if plot_path.endswith('.' + tikz.EXTENSION):
+                                # Figura TikZ: el código va dentro del propio .tex
+                                fig.append(NoEscape(tikz.incluir(plot_path, r'0.6\textwidth')))
+                            else:
+                                fig.add_image(safe_plot_path, width=NoEscape(r'0.6\textwidth'))
                             fig.add_caption(f'Dimensionado de laminación para el escalón {step_num}.')
 
                     except Exception as e:
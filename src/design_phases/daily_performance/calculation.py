@@ -1,4 +1,13 @@
 # src/design_phases/daily_performance/calculation.py
+
+# Atributos del diseño que lee y escribe esta fase; core/engine.py los usa para
+# invalidar y recalcular sólo las fases afectadas por un cambio.
+LEE = ('S', 'ciclo_carga', 'Wc', 'Wf')
+ESCRIBE = (
+    'energia_salida_total', 'energia_perdida_cobre_total', 'energia_perdida_hierro_total',
+    'energia_perdida_total', 'detalles_ciclo', 'rendimiento_diario'
+)
+
 def run(d):
     """Calcula la energía de salida y las pérdidas de energía en un ciclo de 24h."""
     d.energia_salida_total = 0.0
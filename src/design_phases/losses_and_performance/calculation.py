@@ -1,7 +1,34 @@
 # src/design_phases/losses_and_performance/calculation.py
 # -*- coding: utf-8 -*-
 
-from core import utils
+from core import catalog, utils
+
+# Atributos del diseño que lee y escribe esta fase; core/engine.py los usa para
+# invalidar y recalcular sólo las fases afectadas por un cambio.
+LEE = (
+    'fases', 'S', 'f', 'acero', 'modelo_perdidas_hierro', 'Pc_manual', 'Pf_manual', 'Pf_opcional', 'usar_valores_opcionales',
+    'B_kgauss', 'J', 'Kc', 'Kr', 'Kr_original', 'D', 'b', 'c', 'Qc_por_bobinado', 'Qc_total',
+    'Qr'
+)
+ESCRIBE = (
+    'Pc', 'Pf', 'Pc_calculation_method', 'Pf_calculation_method', 'copper_calculation_method',
+    'iron_calculation_method', 'Qc_empirical_por_formula', 'Qc_empirical_total',
+    'Qc_used_for_losses', 'Qf_empirical', 'Qf_used_for_losses', 'Kf_used_for_Qf', 'Wc',
+    'Wc_empirical', 'Wf', 'Wf_empirical', 'rendimiento'
+)
+
+# Descripciones de los métodos de cálculo. core/records.py guarda sólo su índice.
+METODOS_PC = ("Fórmula empírica (2.44 × J²)", "Valor manual")
+METODOS_PF = ("Valor de tabla para acero {acero}", "Valor manual", "Valor opcional de tabla",
+              "Curva de pérdidas del acero {acero}", "Ajuste de Steinmetz del acero {acero}")
+METODOS_MASA = {1: "Cálculo manual (monofásico)", 3: "Fórmula empírica (trifásico)"}
+KF_MONOFASICO = "N/A (cálculo manual)"
+
+# Modelos para Pf de la base de datos: 'tabla' toma el valor del B tabulado más
+# cercano (15, 16 o 17 kGauss); 'curva' interpola la curva W/kg-B del acero y
+# 'steinmetz' usa su ajuste P = k·B^beta (ver core/catalog.py).
+MODELOS_PERDIDAS_HIERRO = ('tabla', 'curva', 'steinmetz')
+_METODO_PF_POR_MODELO = {'tabla': 0, 'curva': 3, 'steinmetz': 4}
 
 def run(d):
     """Calcula las pérdidas y el rendimiento a plena carga.
@@ -21,10 +48,10 @@ def run(d):
     # Usar valor manual si está disponible, si no calcular con fórmula
     if getattr(d, 'usar_valores_opcionales', False) and getattr(d, 'Pc_manual', None) is not None:
         d.Pc = d.Pc_manual
-        d.Pc_calculation_method = "Valor manual"
+        d.Pc_calculation_method = METODOS_PC[1]
     else:
         d.Pc = 2.44 * (getattr(d, 'J', 0.0) ** 2)
-        d.Pc_calculation_method = "Fórmula empírica (2.44 × J²)"
+        d.Pc_calculation_method = METODOS_PC[0]
 
     # Empírica para masa de cobre usada en el cálculo de pérdidas
     Kc_val = getattr(d, 'Kc', 1.0)
@@ -48,10 +75,10 @@ def run(d):
     # - Si es trifásico, usar SIEMPRE la fórmula empírica (Qc_emp)
     if getattr(d, 'fases', 3) == 1:
         mass_copper_for_losses = getattr(d, 'Qc_total', getattr(d, 'Qc_por_bobinado', 0.0))
-        d.copper_calculation_method = "Cálculo manual (monofásico)"
+        d.copper_calculation_method = METODOS_MASA[1]
     else:
         mass_copper_for_losses = d.Qc_empirical_por_formula
-        d.copper_calculation_method = "Fórmula empírica (trifásico)"
+        d.copper_calculation_method = METODOS_MASA[3]
     
     d.Qc_used_for_losses = mass_copper_for_losses
     
@@ -62,13 +89,24 @@ def run(d):
     # Prioridad: 1) Valor manual, 2) Valor opcional, 3) Valor de tabla según acero
     if getattr(d, 'usar_valores_opcionales', False) and getattr(d, 'Pf_manual', None) is not None:
         d.Pf = d.Pf_manual
-        d.Pf_calculation_method = "Valor manual"
+        d.Pf_calculation_method = METODOS_PF[1]
     elif getattr(d, 'usar_valores_opcionales', False) and getattr(d, 'Pf_opcional', 0):
         d.Pf = d.Pf_opcional
-        d.Pf_calculation_method = "Valor opcional de tabla"
+        d.Pf_calculation_method = METODOS_PF[2]
     else:
-        d.Pf = utils.get_specific_iron_loss(getattr(d, 'acero', None), getattr(d, 'B_kgauss', 0.0))
-        d.Pf_calculation_method = f"Valor de tabla para acero {getattr(d, 'acero', '?')}"
+        modelo = getattr(d, 'modelo_perdidas_hierro', 'tabla') or 'tabla'
+        if modelo not in MODELOS_PERDIDAS_HIERRO:
+            raise ValueError(f"Modelo de pérdidas en el hierro no válido: '{modelo}'. Opciones: {', '.join(MODELOS_PERDIDAS_HIERRO)}")
+        if modelo == 'tabla':
+            d.Pf = utils.get_specific_iron_loss(getattr(d, 'acero', None), getattr(d, 'B_kgauss', 0.0))
+        else:
+            try:
+                d.Pf = catalog.activo().perdida_especifica_curva(
+                    getattr(d, 'acero', None), getattr(d, 'B_kgauss', 0.0), getattr(d, 'f', None),
+                    steinmetz=modelo == 'steinmetz')
+            except KeyError:
+                raise ValueError(f"No se encontraron datos para el acero '{getattr(d, 'acero', None)}'") from None
+        d.Pf_calculation_method = METODOS_PF[_METODO_PF_POR_MODELO[modelo]].format(acero=getattr(d, 'acero', '?'))
 
     # CORREGIDO: Qf (masa de hierro aplicable a pérdidas)
     # - Si es monofásico, usar SIEMPRE el cálculo físico del peso del hierro
@@ -76,8 +114,8 @@ def run(d):
     if getattr(d, 'fases', 3) == 1:
         # Para monofásico: usar el peso del hierro calculado físicamente
         d.Qf_empirical = getattr(d, 'Qr', 0.0)  # Peso del hierro calculado
-        d.Kf_used_for_Qf = "N/A (cálculo manual)"
-        d.iron_calculation_method = "Cálculo manual (monofásico)"
+        d.Kf_used_for_Qf = KF_MONOFASICO
+        d.iron_calculation_method = METODOS_MASA[1]
     else:
         # Para trifásico: usar fórmula empírica
         kf_for_Qf = getattr(d, 'Kr_original', None)
@@ -94,7 +132,7 @@ def run(d):
         
         d.Qf_empirical = Qf_emp
         d.Kf_used_for_Qf = kf_for_Qf
-        d.iron_calculation_method = "Fórmula empírica (trifásico)"
+        d.iron_calculation_method = METODOS_MASA[3]
 
     # Pérdidas en W debidas al hierro
     d.Wf = d.Qf_empirical * d.Pf
@@ -53,7 +53,9 @@ def run(doc, d, add_step):
             elif getattr(d, 'usar_valores_opcionales', False) and getattr(d, 'Pf_opcional', 0):
                 doc.append(NoEscape(fr"Valor opcional de tabla: $P_f = {formatear_numero(getattr(d, 'Pf', 0.0), 3)}$ W/kg"))
             else:
-                doc.append(NoEscape(fr"Para acero \textbf{{{getattr(d, 'acero', '?')}}} a ${formatear_numero(getattr(d, 'B_kgauss', 0.0))}$ kGauss, el valor de tabla es:"))
+                origen = {'curva': "el valor interpolado en su curva de pérdidas es",
+                          'steinmetz': "el valor del ajuste de Steinmetz es"}.get(getattr(d, 'modelo_perdidas_hierro', 'tabla'), "el valor de tabla es")
+                doc.append(NoEscape(fr"Para acero \textbf{{{getattr(d, 'acero', '?')}}} a ${formatear_numero(getattr(d, 'B_kgauss', 0.0))}$ kGauss, {origen}:"))
                 doc.append(NoEscape(fr"$$ P_f = {formatear_numero(getattr(d, 'Pf', 0.0), 3)} \; \mathrm{{W/kg}} $$"))
             doc.append(Command('vspace', '0.5em'))
  
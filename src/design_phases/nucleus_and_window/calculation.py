@@ -3,24 +3,81 @@
 
 import math
 from core import database as db, utils
+from core import catalog
 from decimal import Decimal, ROUND_HALF_UP
 
 def _find_steel_data(steel_key):
     """
     Función auxiliar para encontrar los datos del acero de forma robusta.
-    Busca por la clave principal (ej: 'M-5') y por la designación antigua (ej: '30M5').
+    Busca por la clave principal (ej: 'M-5') y por la designación antigua (ej: '30M5')
+    en el índice del catálogo activo (core/catalog.py). Lanza KeyError si no existe.
     """
-    # 1. Intenta una búsqueda directa con la clave principal (ej: 'M-5')
-    if steel_key in db.acero_electrico_db:
-        return db.acero_electrico_db[steel_key]
-    
-    # 2. Si falla, itera y busca en la 'designacion_antigua' (ej: '30M5')
-    for data in db.acero_electrico_db.values():
-        if data.get('designacion_antigua') == steel_key:
-            return data
+    return catalog.activo().datos_acero(steel_key)
+
+def parsear_conexion(conn):
+    """
+    Interpreta el grupo de conexión trifásico (ej: 'Dyn5', 'Ynd11', 'D-Yn').
+    Devuelve la tupla (conn1, conn2, clock_index).
+    """
+    conn_str = (conn or '').upper()
+    
+    # Parsear conexiones del tipo "Dyn5", "D-Yn", etc.
+    if conn_str and len(conn_str) >= 3:
+        # Para conexiones tipo "Dyn5", "Ynd11", etc.
+        if conn_str[0] in ['D', 'Y'] and len(conn_str) > 2:
+            conn1 = conn_str[0]  # Primera letra (D o Y)
+            # Buscar la segunda conexión (después de la primera letra)
+            resto = conn_str[1:]
+            if resto.startswith('yn') or resto.startswith('YN'):
+                conn2 = 'YN'
+                # Extraer índice horario después de 'yn'
+                indice_str = resto[2:] if len(resto) > 2 else '0'
+            elif resto.startswith('y') or resto.startswith('Y'):
+                conn2 = 'Y'
+                # Extraer índice horario después de 'y'
+                indice_str = resto[1:] if len(resto) > 1 else '0'
+            elif resto.startswith('d') or resto.startswith('D'):
+                conn2 = 'D'
+                # Extraer índice horario después de 'd'
+                indice_str = resto[1:] if len(resto) > 1 else '0'
+            else:
+                conn2 = 'YN'  # Default
+                indice_str = '0'
             
-    # 3. Si no se encuentra de ninguna forma, lanza un error claro.
-    raise KeyError(f"No se encontraron datos para el tipo de acero '{steel_key}' en la base de datos.")
+            # Convertir índice horario a entero
+            try:
+                clock_index = int(indice_str)
+            except ValueError:
+                clock_index = 0
+                
+        elif '-' in conn_str:
+            parts = conn_str.split('-', 1)
+            conn1, conn2 = parts[0], parts[1]
+            clock_index = 0  # Default para formato con guión
+        else:
+            conn1 = conn2 = conn_str
+            clock_index = 0
+    else:
+        conn1, conn2 = 'D', 'YN'
+        clock_index = 0
+    return conn1, conn2, clock_index
+
+# Atributos del diseño que lee y escribe esta fase; core/engine.py los usa para
+# invalidar y recalcular sólo las fases afectadas por un cambio.
+LEE = (
+    'tipo', 'fases', 'S', 'E1_linea', 'E2_linea', 'f', 'acero', 'conn', 'rel_rw', 'refrig',
+    'material_conductor', 'B_man', 'C_man', 'Kc_man', 'B_opcional', 'C_opcional', 'Kc_opcional',
+    'J_opcional', 'fa_opcional', 'Kr_opcional', 'redondear_2_decimales',
+    'usar_valores_opcionales'
+)
+ESCRIBE = (
+    'B_kgauss', 'B_tesla', 'J', 'C', 'fa', 'fa_original', 'merma_id', 'E1_fase', 'E2_fase',
+    'conn1', 'conn2', 'clock_index', 'Kc', 'Kc_original', 'flujo', 'flujo_original',
+    'flujo_kilolineas', 'An', 'Ab', 'num_escalones', 'Kr', 'Kr_original', 'D', 'anchos',
+    'espesores', 'An_verificacion', 'constante_ventana', 'Aw', 'b', 'M', 'c', 'c_prima', 'g',
+    'L_monofasico', 'L_trifasico', 'b_por_escalon', 'c_prima_por_escalon', 'g_por_escalon',
+    'core_plot_paths', 'core_plot_path'
+)
 
 def run(d):
     """Realiza los cálculos del núcleo y la ventana."""
@@ -28,7 +85,7 @@ def run(d):
     if d.usar_valores_opcionales and d.B_opcional:
         d.B_kgauss = d.B_opcional
     else:
-        d.B_kgauss = d.B_man if d.B_man else utils.get_promedio(db.densidad_flujo_db[utils.sel_clave(db.densidad_flujo_db, d.S)])
+        d.B_kgauss = d.B_man if d.B_man else catalog.activo().densidad_flujo(d.S)
     
     d.B_tesla = d.B_kgauss / 10.0
     
@@ -67,53 +124,14 @@ def run(d):
     
     # Lógica de _calcular_tensiones_fase (robusta frente a entradas inválidas)
     if d.fases == 3:
-        conn_str = (d.conn or '').upper()
-        
-        # Parsear conexiones del tipo "Dyn5", "D-Yn", etc.
-        if conn_str and len(conn_str) >= 3:
-            # Para conexiones tipo "Dyn5", "Ynd11", etc.
-            if conn_str[0] in ['D', 'Y'] and len(conn_str) > 2:
-                d.conn1 = conn_str[0]  # Primera letra (D o Y)
-                # Buscar la segunda conexión (después de la primera letra)
-                resto = conn_str[1:]
-                if resto.startswith('yn') or resto.startswith('YN'):
-                    d.conn2 = 'YN'
-                    # Extraer índice horario después de 'yn'
-                    indice_str = resto[2:] if len(resto) > 2 else '0'
-                elif resto.startswith('y') or resto.startswith('Y'):
-                    d.conn2 = 'Y'
-                    # Extraer índice horario después de 'y'
-                    indice_str = resto[1:] if len(resto) > 1 else '0'
-                elif resto.startswith('d') or resto.startswith('D'):
-                    d.conn2 = 'D'
-                    # Extraer índice horario después de 'd'
-                    indice_str = resto[1:] if len(resto) > 1 else '0'
-                else:
-                    d.conn2 = 'YN'  # Default
-                    indice_str = '0'
-                
-                # Convertir índice horario a entero
-                try:
-                    d.clock_index = int(indice_str)
-                except ValueError:
-                    d.clock_index = 0
-                    
-            elif '-' in conn_str:
-                parts = conn_str.split('-', 1)
-                d.conn1, d.conn2 = parts[0], parts[1]
-                d.clock_index = 0  # Default para formato con guión
-            else:
-                d.conn1 = d.conn2 = conn_str
-                d.clock_index = 0
-        else:
-            d.conn1, d.conn2 = 'D', 'YN'
-            d.clock_index = 0
-            
+        d.conn1, d.conn2, d.clock_index = parsear_conexion(d.conn)
+
         # Calcular tensiones de fase correctamente
         d.E1_fase = d.E1_linea if 'D' in d.conn1 else d.E1_linea / math.sqrt(3)
         d.E2_fase = d.E2_linea if 'D' in d.conn2 else d.E2_linea / math.sqrt(3)
     else:
         d.conn1 = d.conn2 = "Monofasico"
+        d.clock_index = None  # sin índice horario en monofásico
         d.E1_fase = d.E1_linea
         d.E2_fase = d.E2_linea
 
@@ -153,9 +171,7 @@ def run(d):
     if d.usar_valores_opcionales and d.Kr_opcional:
         d.Kr_original = d.Kr_opcional
     else:
-        db_kr_acero = db.coeficiente_kr_db.get(d.merma_id, {})
-        db_kr_esc = db_kr_acero.get(d.num_escalones, {})
-        d.Kr_original = db_kr_esc[utils.sel_clave(db_kr_esc, d.S)]
+        d.Kr_original = catalog.activo().coeficiente_kr(d.merma_id, d.num_escalones, d.S)
     
     # CORREGIDO: Kr (Kf) NUNCA se redondea, independientemente del modo de redondeo
     # Se mantiene el valor original para mayor precisión en todos los cálculos
@@ -1,19 +1,22 @@
 # src/design_phases/nucleus_and_window/core_plotter.py
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from core.plotting import guardar_figura, nueva_figura
 import os
 
-def generate_core_plot(d, output_dir='temp'):
+def generate_core_plot(d, output_dir, formato='png', dpi=300, ancho_pulgadas=None):
     """
     Genera una visualización de la sección transversal del núcleo cruciforme
     y la guarda como una imagen. Devuelve la ruta absoluta en una lista.
+    Sólo usa d.D, d.anchos y d.espesores (ver ui.figures.GeometriaNucleo).
+    formato, dpi y ancho_pulgadas: ver core.plotting.guardar_figura.
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         
-    output_path = os.path.join(output_dir, 'core_plot.png')
+    ruta_base = os.path.join(output_dir, 'core_plot')
 
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig = nueva_figura((6, 6), formato)
+    ax = fig.subplots()
 
     # Dibuja el círculo circunscrito
     circulo = patches.Circle((0, 0), radius=d.D / 2, color='red', fill=False, linestyle='--', label='Diámetro Circunscrito (D)')
@@ -46,8 +49,5 @@ def generate_core_plot(d, output_dir='temp'):
     ax.grid(True)
     ax.legend()
 
-    plt.savefig(output_path, dpi=300)
-    plt.close(fig)
-    
     # Devolver una lista con la ruta ABSOLUTA para evitar problemas al compilar LaTeX
-    return [os.path.abspath(output_path)]
\ No newline at end of file
+    return [guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas)]
\ No newline at end of file
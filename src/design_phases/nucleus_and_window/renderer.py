@@ -4,9 +4,13 @@
 from pylatex import Section, Subsection, Math, Command, Figure, Itemize
 from pylatex.utils import NoEscape
 import os
+from core import tikz
 
-def run(doc, d, add_step):
-    """Añade la sección de reporte de esta fase al documento LaTeX."""
+def run(doc, d, add_step, espacio):
+    """
+    Añade la sección de reporte de esta fase al documento LaTeX. La figura del
+    núcleo se referencia relativa al directorio de 'espacio' (ui/workspace.py).
+    """
     with doc.create(Section('Cálculo del Núcleo y Ventana', numbering=False)):
         if d.fases == 3 and 'D' not in d.conn1:
             add_step(doc, r"Tensión Fase Primaria ($E_{1,fase}$)", r"E_{1,fase} = \frac{E_{1,linea}}{\sqrt{3}}", f"E_{{1,fase}} = \\frac{{{d.E1_linea:.0f}}}{{\\sqrt{{3}}}}", f"E_{{1,fase}} = {d.E1_fase:.2f}", "V")
@@ -69,10 +73,17 @@ def run(doc, d, add_step):
                         if os.path.isabs(core_full_path):
                             if not os.path.exists(core_full_path):
                                 use_path = None
+                            else:
+                                use_path = espacio.relativa(core_full_path)
                         if use_path:
                             safe_core_path = use_path.replace('\\', '/')
                             with doc.create(Figure(position='H')) as fig:
-                                fig.add_image(safe_core_path, width=NoEscape(r'0.5\textwidth'))
+                                if core_full_path.endswith('.' + tikz.EXTENSION):
+                                    # Figura TikZ: el código va dentro del propio .tex
+                                    fig.append(NoEscape(tikz.incluir(os.path.join(espacio.directorio, core_full_path),
+                                                                     r'0.5\textwidth')))
+                                else:
+                                    fig.add_image(safe_core_path, width=NoEscape(r'0.5\textwidth'))
                                 fig.add_caption('Sección transversal del núcleo.')
                         else:
                             # Escapar caracteres especiales de LaTeX en mensajes de error
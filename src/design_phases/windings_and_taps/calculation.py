@@ -4,6 +4,19 @@
 import math
 from core import utils
 
+# Atributos del diseño que lee y escribe esta fase; core/engine.py los usa para
+# invalidar y recalcular sólo las fases afectadas por un cambio.
+LEE = (
+    'fases', 'S', 'E1_linea', 'f', 'taps_pct', 'rho_cobre_opcional', 'redondear_2_decimales',
+    'usar_valores_opcionales', 'E1_fase', 'E2_fase', 'conn1', 'flujo', 'J', 'D', 'c'
+)
+ESCRIBE = (
+    'N2_fase', 'N1_fase', 'tap_data', 'tap_currents', 'tap_distribution', 'I1_fase_nom',
+    'I2_fase', 's1', 's2', 'awg1', 'awg2', 'peso_conductor_primario_kg_m',
+    'peso_conductor_secundario_kg_m', 'metodo_peso_primario', 'metodo_peso_secundario', 'rm',
+    'lm', 'Lb1', 'Qb1', 'Lb2', 'Qb2', 'Qc_por_bobinado', 'Qc_total'
+)
+
 def run(d):
     """Realiza los cálculos de devanados, corrientes, TAPs y peso del cobre por bobinado."""
     
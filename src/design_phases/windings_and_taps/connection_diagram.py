@@ -1,8 +1,8 @@
-from diagrams.generator import generate_connection_diagram as generate_connection_diagram_new
 
-def generate_connection_diagram(d, output_dir='temp'):
+def generate_connection_diagram(d, output_dir):
     """
     Wrapper de compatibilidad: delega en el nuevo paquete diagrams.
     Mantiene la API antigua para que llamadas existentes sigan funcionando.
     """
+    from diagrams.generator import generate_connection_diagram as generate_connection_diagram_new
     return generate_connection_diagram_new(d, output_dir=output_dir)
\ No newline at end of file
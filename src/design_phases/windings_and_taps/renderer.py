@@ -6,10 +6,12 @@
 from pylatex import Section, Subsection, Command, Math, Itemize, Figure
 from pylatex.utils import NoEscape, bold
 import os
-from diagrams.generator import generate_connection_diagram
 
-def run(doc, d, add_step):
-    """Añade la sección de reporte de devanados al documento LaTeX."""
+def run(doc, d, add_step, espacio):
+    """
+    Añade la sección de reporte de devanados al documento LaTeX. El diagrama de
+    conexionado se dibuja en el directorio de 'espacio' (ui/workspace.py).
+    """
     
     # Función auxiliar para formatear según configuración de redondeo
     def formatear_numero(valor, decimales_default=2):
@@ -57,10 +59,14 @@ def run(doc, d, add_step):
     # Agregar diagrama de conexionado
     with doc.create(Section('Diagrama de Conexionado', numbering=False)):
         try:
-            # Generar el diagrama (asumiendo que está en el directorio de trabajo actual)
-            connection_path = generate_connection_diagram(d, output_dir='.')
+            # Reutilizar el diagrama ya dibujado con las demás figuras o
+            # generarlo en el espacio de trabajo del reporte
+            connection_path = getattr(d, 'connection_diagram_path', None)
+            if not connection_path or not os.path.exists(connection_path):
+                from diagrams.generator import generate_connection_diagram  # carga matplotlib
+                connection_path = generate_connection_diagram(d, output_dir=espacio.directorio)
             if connection_path and os.path.exists(connection_path):
-                relative_path = os.path.relpath(connection_path).replace('\\', '/')
+                relative_path = espacio.relativa(connection_path)
                 with doc.create(Figure(position='H')) as fig:
                     fig.add_image(relative_path, width=NoEscape(r'0.7\textwidth'))
                     fig.add_caption('Diagrama de conexionado del transformador con espiras en bobinas.')
@@ -1,20 +1,24 @@
 # src/diagrams/generator.py
 # -*- coding: utf-8 -*-
 
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
+from core.plotting import guardar_figura
 from . import single_phase_drawer
 from . import three_phase_drawer
 
-def generate_connection_diagram(d, output_dir='temp'):
+def generate_connection_diagram(d, output_dir, formato='png', dpi=200, ancho_pulgadas=None):
     """
     Genera un diagrama de conexionado.
     Decide qué tipo de diagrama dibujar basado en el número de fases.
+    Sólo usa d.fases, d.conn, d.N1_fase y d.N2_fase (ver ui.figures.DatosConexionado).
+    formato, dpi y ancho_pulgadas: ver core.plotting.guardar_figura.
     """
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, 'connection_diagram.png')
+    ruta_base = os.path.join(output_dir, 'connection_diagram')
     
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     # Ampliar el límite inferior del eje Y para que elementos con y negativas sean visibles
     ax.set_ylim(-2, 8.5)  # antes (0, 8)
@@ -30,8 +34,5 @@ def generate_connection_diagram(d, output_dir='temp'):
     else:
         single_phase_drawer.draw(ax, d)
     
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    plt.savefig(output_path, dpi=200, bbox_inches='tight')
-    plt.close(fig)
-    
-    return output_path
\ No newline at end of file
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    return guardar_figura(fig, ruta_base, formato, dpi, ancho_pulgadas, bbox_inches='tight')
\ No newline at end of file
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import re
-import matplotlib.pyplot as plt
 from .utils import draw_winding_rect
 
 # -----------------------------------------------------------------------------
@@ -1,7 +1,6 @@
 # src/diagrams/utils.py
 # -*- coding: utf-8 -*-
 
-import matplotlib.pyplot as plt
 from matplotlib.path import Path
 from matplotlib.patches import PathPatch, Rectangle, Circle
 import numpy as np
@@ -1,4 +1,5 @@
 # src/main.py
+import multiprocessing
 import sys
 from setup.dependency_checker import ensure_tinytex_is_installed
 from ui.app_view import Application
@@ -17,6 +18,9 @@ def main():
     app.run()
 
 if __name__ == "__main__":
+    # Ejecutable de PyInstaller: los procesos de los pools de figuras y de
+    # rasterizado arrancan como trabajadores en lugar de volver a abrir la GUI.
+    multiprocessing.freeze_support()
     # Asegura que la UI se vea bien en diferentes DPIs (opcional pero recomendado)
     try:
         from ctypes import windll
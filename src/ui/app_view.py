@@ -4,34 +4,44 @@ import PySimpleGUI as sg
 import os
 import sys
 import traceback
-import tempfile
-from pylatex import Document
-import fitz  # PyMuPDF (motor de renderizado integrado)
-import pytinytex
-import io
-from PIL import Image
-import subprocess
 
 from core.engine import DisenoTransformador
-from core.database import acero_electrico_db, conexiones_normalizadas
-from ui.report_builder import generate_full_report_document
+from core import catalog
+from core import cache as cache_resultados
+from core.database import conexiones_normalizadas
+from core.entradas import parsear_ciclo_carga, parsear_taps
+from ui.report_viewer import VisorPDF
+from ui.report_worker import (EVENTO_ERROR, EVENTO_LISTO, EVENTO_PROGRESO, GeneradorReportes,
+                              resumen_diseno)
 
-# Plotters del módulo nucleus_and_window (se co-localizaron ahí)
-from design_phases.nucleus_and_window import core_plotter
-from design_phases.core_and_lamination_weights.lamination_plotters import generate_plot 
+# Tamaño en píxeles de la vista del reporte y paso de la rueda del ratón
+ANCHO_VISTA, ALTO_VISTA = 750, 600
+PASO_RUEDA = 120
+EVENTOS_VISOR = ('-DESPLAZAR-', '-DESPLAZAR-X-', '-ACERCAR-', '-ALEJAR-', '-IMAGE-RUEDA')
 
 class Application:
     def __init__(self):
         sg.theme('DarkBlue3')
         self.last_report_path = None
-        self.window = sg.Window('Calculadora de Diseño (v14.1 - Corrección Final)', self._crear_layout())
+        self.reporte_en_curso = None
+        self.visor = None
+        # Caché de resultados y reportes entre sesiones (TRAFOS_CACHE si está definida)
+        if cache_resultados.activa() is None:
+            cache_resultados.usar_cache(cache_resultados.directorio_por_defecto())
+        self.window = sg.Window('Calculadora de Diseño (v14.1 - Corrección Final)', self._crear_layout(),
+                                finalize=True)
+        # Rueda del ratón sobre el reporte: 'delta' en Windows/macOS, botones 4 y 5 en X11
+        for evento_rueda in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.window['-IMAGE-'].bind(evento_rueda, 'RUEDA')
+        # El reporte se genera en un hilo; sus avisos llegan como eventos de la ventana
+        self.reportes = GeneradorReportes(self.window.write_event_value)
 
     def _crear_container_datos_principales(self):
         # Crear mapeo de designaciones antiguas a claves de base de datos
         tipos_de_acero_display = []
         self.acero_map = {}  # mapeo de display -> clave de DB
-        for clave, datos in acero_electrico_db.items():
-            designacion = datos['designacion_antigua']
+        for clave, datos in catalog.activo().acero_electrico_db.items():
+            designacion = datos.get('designacion_antigua') or clave
             tipos_de_acero_display.append(designacion)
             self.acero_map[designacion] = clave
         
@@ -103,100 +113,36 @@ class Application:
             [sg.Button('Calcular Diseño', button_color=('white', 'green'), font=('Helvetica', 12)), sg.Button('Ver Archivo', key='-EXPORT-', disabled=True, font=('Helvetica', 12)), sg.Push(), sg.Button('Salir', font=('Helvetica', 12))]
         ]
         
-        image_element = [sg.Image(key='-IMAGE-')]
+        # Sólo se dibuja la parte visible del PDF (ui/report_viewer.py)
+        image_element = [sg.Image(key='-IMAGE-', size=(ANCHO_VISTA, ALTO_VISTA)),
+                         sg.Slider(range=(0, 0), default_value=0, orientation='v', size=(28, 15),
+                                   disable_number_display=True, enable_events=True, key='-DESPLAZAR-')]
 
         columna_resultados = [
             [sg.Text('Procedimiento de Cálculo', font=('Helvetica', 16))],
             [sg.HorizontalSeparator()],
-            [sg.Column(
-                [image_element],
-                size=(750, 600),
-                scrollable=True,
-                vertical_scroll_only=False,
-                key='-COL-IMAGE-'
-            )]
+            [sg.Text('', key='-RESUMEN-', font=('Courier', 10), size=(90, 5))],
+            [sg.Text('', key='-ESTADO-', size=(60, 1)),
+             sg.Push(), sg.Button('Cancelar Reporte', key='-CANCELAR-', disabled=True)],
+            image_element,
+            [sg.Slider(range=(0, 0), default_value=0, orientation='h', size=(60, 10),
+                       disable_number_display=True, enable_events=True, key='-DESPLAZAR-X-'),
+             sg.Push(), sg.Button('-', key='-ALEJAR-'), sg.Text('100%', key='-ZOOM-', size=(5, 1)),
+             sg.Button('+', key='-ACERCAR-')]
         ]
         return [[sg.Column(columna_entradas), sg.VSeperator(), sg.Column(columna_resultados)]]
 
-    def _render_latex_to_file(self, latex_doc, temp_dir, final_png_path, dpi=200):
-        """
-        Renderiza el documento LaTeX usando el directorio temp_dir como cwd para pdflatex.
-        Guarda el PNG resultante en final_png_path.
-        """
-        try:
-            pdf_basename = os.path.join(temp_dir, 'reporte')
-            
-            compiler_path = pytinytex.get_pdf_latex_engine()
-            if not compiler_path or not os.path.exists(compiler_path):
-                raise RuntimeError("El compilador de TinyTeX no fue encontrado. Intente reiniciar la aplicación.")
-
-            tex_path = f"{pdf_basename}.tex"
-            with open(tex_path, "w", encoding="utf-8") as f:
-                f.write(latex_doc.dumps())  # obtiene el contenido .tex
-
-            cmd = [compiler_path, "--interaction=nonstopmode", tex_path]
-            proc = subprocess.run(cmd, cwd=temp_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            output_bytes = proc.stdout or b""
-            output_text = output_bytes.decode("utf-8", errors="replace")
-
-            if proc.returncode != 0:
-                raise RuntimeError(f"pdflatex returned non-zero exit status {proc.returncode}.\nOutput:\n{output_text}")
-
-            pdf_path = f"{pdf_basename}.pdf"
-            if not os.path.exists(pdf_path):
-                raise RuntimeError(f"El archivo PDF no fue generado. Output:\n{output_text}")
-
-            # Renderizar todas las páginas y unirlas verticalmente
-            doc = fitz.open(pdf_path)
-            page_images = []
-            try:
-                for page_num in range(doc.page_count):
-                    page = doc.load_page(page_num)
-                    pix = page.get_pixmap(dpi=dpi)
-                    img = Image.open(io.BytesIO(pix.tobytes("png")))
-                    page_images.append(img)
-            finally:
-                doc.close()
-
-            if not page_images:
-                raise RuntimeError("No se encontraron páginas en el PDF para renderizar.")
-
-            total_height = sum(img.height for img in page_images)
-            max_width = max(img.width for img in page_images)
-            
-            stitched_image = Image.new('RGB', (max_width, total_height), 'white')
-            current_y = 0
-            for img in page_images:
-                stitched_image.paste(img, (0, current_y))
-                current_y += img.height
-
-            stitched_image.save(final_png_path, "PNG")
-
-            return final_png_path
-        except Exception as e:
-            print("Error al renderizar con PyLaTeX/TinyTeX:", file=sys.stderr)
-            traceback.print_exc()
-            print(f"Error de LaTeX: No se pudo compilar o renderizar el documento. Error: {e}", file=sys.stderr)
-            return None
-
     def _manejar_calculo(self, values):
         try:
             self.last_report_path = None
             self.window['-EXPORT-'].update(disabled=True)
-            self.window['-IMAGE-'].update(filename='')
+            self.reportes.cancelar()
+            self.reporte_en_curso = None
+            self.window['-RESUMEN-'].update('')
+            self._cerrar_visor()
 
-            # --- AÑADIR PARSEO DEL CICLO DE CARGA ---
-            ciclo_str = values.get('-CICLO_CARGA-', '') or ''
-            ciclo_carga = []
-            if ciclo_str.strip():
-                pares = [p for p in ciclo_str.split(';') if p.strip()]
-                for par in pares:
-                    try:
-                        carga, horas = par.split(',')
-                        ciclo_carga.append((float(carga.strip()), float(horas.strip())))
-                    except Exception:
-                        # ignorar pares mal formateados
-                        continue
+            # Ciclo de carga 'carga,horas; carga,horas' (los pares mal formados se ignoran)
+            ciclo_carga = parsear_ciclo_carga(values.get('-CICLO_CARGA-', '') or '')
 
             # Convertir la designación mostrada a la clave de base de datos
             acero_seleccionado = values['-ACERO-']
@@ -210,7 +156,7 @@ class Application:
                 'f': float(values['-FREQ-']),
                 'acero': acero_clave,
                 'conn': values['-CONN-'],
-                'taps': [float(t.strip()) for t in values['-TAPS-'].split(',')] if values['-TAPS-'].strip() else [],
+                'taps': parsear_taps(values['-TAPS-']),
                 'rel_rw': float(values['-RW-']),
                 'refrig': values.get('-REFRIG-', 'ONAN'),  # Añadir tipo de refrigeración
                 'material_conductor': values.get('-MATERIAL-', 'Cobre'),  # Añadir material conductor
@@ -236,57 +182,23 @@ class Application:
 
             diseno = DisenoTransformador(**params)
             diseno.ejecutar_calculo_completo()
-            
+
+            # Resultados numéricos al instante; el reporte sigue en segundo plano
+            lineas = resumen_diseno(diseno)
+            mitad = (len(lineas) + 1) // 2
+            self.window['-RESUMEN-'].update('\n'.join(
+                f'{izquierda:<36}{derecha}' for izquierda, derecha in
+                zip(lineas[:mitad], lineas[mitad:] + [''])))
+
             export_dir = "exports"
-            os.makedirs(export_dir, exist_ok=True)
             s_kva = values['-S_KVA-'].replace('.','p')
-            filename = f"Reporte_{s_kva}kVA.png"
+            filename = f"Reporte_{s_kva}kVA.pdf"
             filepath = os.path.join(export_dir, filename)
 
-            # Orquestar creación de archivos temporales (imágenes y .tex) en un único temp_dir
-            sg.popup_quick_message('Generando gráficos y compilando reporte...', background_color='blue', text_color='white')
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Generar imágenes en temp_dir y guardar nombres/rutas en el objeto diseno.
-                # Soportamos plotters que devuelvan una sola ruta (str) o una lista de rutas.
-                core_paths = core_plotter.generate_core_plot(diseno, output_dir=temp_dir)
-                if isinstance(core_paths, list):
-                    diseno.core_plot_paths = core_paths
-                    diseno.core_plot_path = core_paths[-1] if core_paths else None
-                    diseno.core_plot_filename = os.path.basename(diseno.core_plot_path) if diseno.core_plot_path else None
-                else:
-                    diseno.core_plot_paths = [core_paths] if core_paths else []
-                    diseno.core_plot_path = core_paths
-                    diseno.core_plot_filename = os.path.basename(core_paths) if core_paths else None
-
-                # Las imágenes de laminación ahora se generan en la fase de cálculo (calculation.run).
-                # Aquí solo recogemos las rutas que quedaron registradas en diseno.peso_por_escalon.
-                if hasattr(diseno, 'peso_por_escalon'):
-                    lam_paths = [s.get('plot_path') for s in diseno.peso_por_escalon if s.get('plot_path')]
-                    diseno.lamination_plot_paths = lam_paths
-                    diseno.lamination_plot_path = lam_paths[-1] if lam_paths else None
-                    diseno.lamination_plot_filename = os.path.basename(diseno.lamination_plot_path) if diseno.lamination_plot_path else None
-                else:
-                    diseno.lamination_plot_paths = []
-                    diseno.lamination_plot_path = None
-                    diseno.lamination_plot_filename = None
-    
-                # Generar el documento LaTeX (el renderer preferirá los nombres de archivo relativos)
-                # Pasar el directorio temporal para que los plotters escriban dentro de él
-                latex_doc = generate_full_report_document(diseno, work_dir=temp_dir)
-
-                # Renderizar usando temp_dir como cwd para pdflatex y guardar PNG final en exports
-                saved = self._render_latex_to_file(latex_doc, temp_dir, filepath)
-
-                if saved:
-                    # Cargar bytes de la imagen desde disco y actualizar el elemento Image de PySimpleGUI
-                    with open(saved, 'rb') as f:
-                        img_bytes = f.read()
-                    self.window['-IMAGE-'].update(data=img_bytes)
-                    self.window.refresh()
-                    self.window['-COL-IMAGE-'].contents_changed()
-                    
-                    self.last_report_path = saved
-                    self.window['-EXPORT-'].update(disabled=False, text="Ver Archivo")
+            # Un cálculo nuevo cancela el reporte anterior que siga en curso
+            self.reporte_en_curso = self.reportes.generar(diseno, filepath)
+            self.window['-ESTADO-'].update('Generando reporte...')
+            self.window['-CANCELAR-'].update(disabled=False)
 
         except ValueError as e:
             print("Error de Entrada: valores numéricos inválidos.", file=sys.stderr)
@@ -297,6 +209,67 @@ class Application:
             traceback.print_exc()
             print(f'Ocurrió un Error: No se pudo completar el proceso. Detalle: {e}', file=sys.stderr)
             
+    def _manejar_reporte(self, event, valor):
+        """Eventos de GeneradorReportes; se ignoran los de reportes ya reemplazados."""
+        id_reporte, dato = valor
+        if id_reporte != self.reporte_en_curso:
+            return
+        if event == EVENTO_PROGRESO:
+            self.window['-ESTADO-'].update(dato)
+            return
+        self.reporte_en_curso = None
+        self.window['-CANCELAR-'].update(disabled=True)
+        if event == EVENTO_ERROR:
+            self.window['-ESTADO-'].update('No se pudo generar el reporte (ver la terminal).')
+            print(f'Error de LaTeX: No se pudo compilar o renderizar el documento. Error: {dato}', file=sys.stderr)
+            return
+        self._cerrar_visor()
+        self.visor = VisorPDF(dato, ancho=ANCHO_VISTA, alto=ALTO_VISTA)
+        self._mostrar_vista()
+        self.window['-ESTADO-'].update('Reporte listo.')
+
+        self.last_report_path = dato
+        self.window['-EXPORT-'].update(disabled=False, text="Ver Archivo")
+
+    def _mostrar_vista(self):
+        """Dibuja la parte visible del reporte y ajusta las barras y el zoom."""
+        visor = self.visor
+        self.window['-IMAGE-'].update(data=visor.vista())
+        self.window['-DESPLAZAR-'].update(value=visor.y, range=(0, visor.y_maximo))
+        self.window['-DESPLAZAR-X-'].update(value=visor.x, range=(0, visor.x_maximo))
+        self.window['-ZOOM-'].update(f'{visor.zoom:.0%}')
+
+    def _cerrar_visor(self):
+        if self.visor is not None:
+            self.visor.cerrar()
+            self.visor = None
+        self.window['-IMAGE-'].update(filename='')
+
+    def _manejar_visor(self, event, values):
+        """Desplazamiento (barras y rueda del ratón) y zoom del reporte."""
+        visor = self.visor
+        if visor is None:
+            return
+        if event == '-DESPLAZAR-':
+            visor.ir_a(values['-DESPLAZAR-'])
+        elif event == '-DESPLAZAR-X-':
+            visor.ir_a(visor.y, values['-DESPLAZAR-X-'])
+        elif event == '-ACERCAR-':
+            visor.acercar()
+        elif event == '-ALEJAR-':
+            visor.alejar()
+        else:
+            rueda = self.window['-IMAGE-'].user_bind_event
+            arriba = getattr(rueda, 'delta', 0) > 0 or getattr(rueda, 'num', None) == 4
+            visor.desplazar(-PASO_RUEDA if arriba else PASO_RUEDA)
+        self._mostrar_vista()
+
+    def _cancelar_reporte(self):
+        self.reportes.cancelar()
+        self.reporte_en_curso = None
+        self.window['-CANCELAR-'].update(disabled=True)
+        self.window['-ESTADO-'].update('Reporte cancelado.')
+
     def _manejar_exportacion(self):
         if not self.last_report_path or not os.path.exists(self.last_report_path):
             print("Archivo de reporte no encontrado. Por favor, genere un cálculo primero.", file=sys.stderr)
@@ -313,8 +286,19 @@ class Application:
         while True:
             event, values = self.window.read()
             if event in (sg.WIN_CLOSED, 'Salir'):
+                self.reportes.cancelar()
+                if self.visor is not None:
+                    self.visor.cerrar()
                 break
 
+            if event in (EVENTO_PROGRESO, EVENTO_LISTO, EVENTO_ERROR):
+                self._manejar_reporte(event, values[event])
+                continue
+
+            if event in EVENTOS_VISOR:
+                self._manejar_visor(event, values)
+                continue
+
             if event == '-TIPO-':
                 es_trifasico = (values.get('-TIPO-') == 'trifasico')
                 try:
@@ -354,6 +338,9 @@ class Application:
                     values['-TAPS-'] = ''
                 self._manejar_calculo(values)
 
+            elif event == '-CANCELAR-':
+                self._cancelar_reporte()
+
             elif event == '-EXPORT-':
                 self._manejar_exportacion()
         self.window.close()
\ No newline at end of file
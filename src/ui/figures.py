@@ -0,0 +1,327 @@
+# src/ui/figures.py
+# -*- coding: utf-8 -*-
+"""
+Generación en paralelo de las figuras de un reporte.
+
+Cada figura (sección del núcleo, laminación de cada escalón, diagrama de
+conexionado) es un trabajo independiente que se ejecuta en un pool de procesos.
+Los plotters no reciben el diseño completo sino una geometría inmutable con
+sólo los datos que dibujan (GeometriaNucleo, GeometriaLaminacion,
+DatosConexionado), que es barata de enviar a otro proceso. Las rutas se
+devuelven en el orden de los trabajos, sea cual sea el orden en que terminen.
+
+El pool se crea la primera vez que hace falta y se reutiliza entre reportes,
+así que el arranque de los procesos (e importar matplotlib) se paga una vez.
+
+Cada figura tiene además una clave de contenido: el SHA-256 de lo que dibuja
+(para la laminación, los valores que lee su plotter, ver datos_laminacion;
+para el conexionado, la conexión y las espiras tal como se rotulan), VERSION_FIGURAS y la versión de
+matplotlib. Con una caché activa (core/cache.py) la imagen se copia de ella en
+lugar de dibujarse, entre reportes y entre sesiones; al cambiar un plotter hay
+que subir VERSION_FIGURAS para que las imágenes viejas dejen de coincidir.
+
+El perfil de calidad decide cómo se guardan (core/plotting.py):
+    borrador   PNG a 96 ppp del ancho impreso, para vistas previas interactivas
+    final      PDF vectorial (por defecto): pesa poco y escala sin pérdida
+    impresion  PNG a 300 ppp del ancho impreso, si se necesita un bitmap
+    tikz       núcleo y laminación como código TikZ dentro del .tex (sin
+               matplotlib ni imágenes); el conexionado, en PDF vectorial
+Los bitmaps se dimensionan para el ancho con que aparecen en el reporte
+(ANCHOS_REPORTE), no para el figsize del plotter.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple, dataclass, fields
+from importlib import metadata
+
+from core import cache as cache_resultados
+
+# Versión de los plotters: forma parte de la clave de cada figura en la caché.
+VERSION_FIGURAS = 2
+
+TIPO_ARTEFACTO = 'figura'
+
+# Ancho del texto del reporte (paperwidth 8.5in con márgenes de 0.8in, ver
+# ui/report_builder.py) y fracción que ocupa cada figura en los renderers.
+ANCHO_TEXTO_PULGADAS = 8.5 - 2 * 0.8
+ANCHOS_REPORTE = {'nucleo': 0.5, 'laminacion': 0.6, 'conexionado': 0.7}
+
+# Figuras que el backend TikZ (core/tikz.py) sabe escribir
+TIPOS_TIKZ = ('nucleo', 'laminacion')
+
+_pool = None
+_procesos_pool = 0
+_lock_pool = threading.Lock()
+
+
+def _tupla(valor):
+    if isinstance(valor, (list, tuple)):
+        return tuple(_tupla(v) for v in valor)
+    return valor
+
+def _desde_diseno(cls, d):
+    return cls(**{f.name: _tupla(getattr(d, f.name)) for f in fields(cls)})
+
+
+@dataclass(frozen=True, slots=True)
+class GeometriaNucleo:
+    """Datos de la sección transversal del núcleo (core_plotter)."""
+    D: float
+    anchos: tuple
+    espesores: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        return _desde_diseno(cls, d)
+
+
+@dataclass(frozen=True, slots=True)
+class GeometriaLaminacion:
+    """Datos de la ventana y de los escalones que usan los plotters de laminación."""
+    fases: int
+    cut_type: str
+    b: float
+    c: float
+    c_prima: float
+    g: float
+    anchos: tuple
+    espesores: tuple
+    b_por_escalon: tuple
+    c_prima_por_escalon: tuple
+
+    @classmethod
+    def desde_diseno(cls, d):
+        return _desde_diseno(cls, d)
+
+
+@dataclass(frozen=True, slots=True)
+class DatosConexionado:
+    """Datos del diagrama de conexionado (diagrams/generator.py)."""
+    fases: int
+    conn: str
+    N1_fase: float
+    N2_fase: float
+
+    @classmethod
+    def desde_diseno(cls, d):
+        return _desde_diseno(cls, d)
+
+
+@dataclass(frozen=True, slots=True)
+class PerfilCalidad:
+    """Formato de las figuras y puntos por pulgada del ancho impreso (None en PDF)."""
+    nombre: str
+    formato: str
+    ppp: int = None
+
+    def guardado(self, tipo):
+        """Argumentos de guardado (core.plotting.guardar_figura) para una figura 'tipo'."""
+        if self.formato == 'tikz' and tipo not in TIPOS_TIKZ:
+            return {'formato': 'pdf'}
+        if self.ppp is None:
+            return {'formato': self.formato}
+        return {'formato': self.formato, 'dpi': self.ppp,
+                'ancho_pulgadas': ANCHOS_REPORTE[tipo] * ANCHO_TEXTO_PULGADAS}
+
+
+PERFILES = {
+    'borrador': PerfilCalidad('borrador', 'png', 96),
+    'final': PerfilCalidad('final', 'pdf'),
+    'impresion': PerfilCalidad('impresion', 'png', 300),
+    'tikz': PerfilCalidad('tikz', 'tikz'),
+}
+PERFIL_DEFECTO = 'final'
+
+def perfil(calidad=None):
+    """PerfilCalidad por nombre (o el mismo perfil); None es PERFIL_DEFECTO."""
+    if isinstance(calidad, PerfilCalidad):
+        return calidad
+    try:
+        return PERFILES[calidad or PERFIL_DEFECTO]
+    except KeyError:
+        raise ValueError(f"Perfil de calidad desconocido: '{calidad}' (use {', '.join(PERFILES)})") from None
+
+
+@dataclass(frozen=True, slots=True)
+class TrabajoFigura:
+    """
+    Una figura a dibujar: funcion(*args) escribe en 'directorio' y devuelve la
+    ruta. Las 'locales' (TikZ: sólo escriben texto) no van al pool de procesos.
+    """
+    nombre: str
+    funcion: object
+    args: tuple
+    directorio: str
+    clave: str = None
+    local: bool = False
+
+
+# ----------------------------------------------------------------------
+# Claves de contenido
+# ----------------------------------------------------------------------
+
+def _version_matplotlib():
+    try:
+        return metadata.version('matplotlib')
+    except metadata.PackageNotFoundError:
+        return None
+
+def clave_figura(tipo, datos, calidad=None):
+    """Clave de caché de una figura 'tipo' que dibuja exactamente 'datos' con el perfil 'calidad'."""
+    contenido = {'tipo': tipo, 'datos': datos, 'guardado': perfil(calidad).guardado(tipo),
+                 'version': VERSION_FIGURAS, 'matplotlib': _version_matplotlib()}
+    texto = json.dumps(contenido, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def datos_laminacion(geometria, indice, detalles):
+    """
+    Exactamente lo que lee el plotter de laminación de (fases, corte) para el
+    escalón 'indice', con sus mismas reglas de respaldo. Casi todo es del propio
+    escalón; el trifásico a 45° usa además el ancho del primer escalón (base
+    menor de la pieza 2). Al cambiar lo que lee un plotter hay que cambiarlo
+    aquí y subir VERSION_FIGURAS.
+    """
+    plotter = (geometria.fases, geometria.cut_type)
+
+    def _en(lista, respaldo):
+        return lista[indice] if indice < len(lista) else respaldo
+    datos = {
+        'fases': geometria.fases,
+        'corte': geometria.cut_type,
+        'escalon': indice,
+        'a': _en(geometria.anchos, geometria.g if plotter == (3, 'Recto') else 0.0),
+        'b': _en(geometria.b_por_escalon, geometria.b),
+        'c_prima': _en(geometria.c_prima_por_escalon, geometria.c_prima),
+        'largos': [[str(p.get('numero', '')), p.get('largo_cm')] for p in detalles or []],
+    }
+    if plotter == (3, 'Diagonal'):
+        datos['a0'] = geometria.anchos[0] if geometria.anchos else 0.0
+    return datos
+
+def datos_conexionado(datos):
+    """Lo que muestra el diagrama: la conexión (sólo en trifásicos) y las espiras rotuladas."""
+    return {
+        'fases': datos.fases,
+        'conn': datos.conn.upper() if datos.fases == 3 else None,
+        'N1': f"{datos.N1_fase:.0f}",
+        'N2': f"{datos.N2_fase:.0f}",
+    }
+
+
+# ----------------------------------------------------------------------
+# Trabajos (funciones de módulo para poder enviarlas al pool)
+# ----------------------------------------------------------------------
+
+def dibujar_nucleo(geometria, directorio, guardado):
+    from design_phases.nucleus_and_window.core_plotter import generate_core_plot
+    rutas = generate_core_plot(geometria, output_dir=directorio, **guardado)
+    return rutas[-1] if isinstance(rutas, list) else rutas
+
+def dibujar_laminacion(geometria, directorio, guardado, indice, detalles):
+    from design_phases.core_and_lamination_weights.lamination_plotters import generate_plot
+    try:
+        return generate_plot(geometria, output_dir=os.path.join(directorio, 'temp', f'step_{indice + 1}'),
+                             step_index=indice, detalles=detalles, **guardado)
+    except Exception as e:
+        print(f"Advertencia: No se pudo generar el gráfico para el escalón {indice + 1}. Error: {e}")
+        return None
+
+def dibujar_conexionado(datos, directorio, guardado):
+    from diagrams.generator import generate_connection_diagram
+    return generate_connection_diagram(datos, output_dir=directorio, **guardado)
+
+
+def _es_local(guardado):
+    return guardado['formato'] == 'tikz'
+
+def trabajos_reporte(d, directorio, conexionado=True, calidad=None):
+    """
+    Lista ordenada de TrabajoFigura con las figuras del reporte de un diseño ya
+    calculado: núcleo, laminación por escalón y, si se pide, diagrama de
+    conexionado, guardadas según el perfil 'calidad' (PERFILES).
+    """
+    directorio = os.path.abspath(directorio)
+    calidad = perfil(calidad)
+    nucleo = GeometriaNucleo.desde_diseno(d)
+    guardado = calidad.guardado('nucleo')
+    trabajos = [TrabajoFigura('nucleo', dibujar_nucleo, (nucleo, directorio, guardado), directorio,
+                              clave_figura('nucleo', astuple(nucleo), calidad), _es_local(guardado))]
+    pasos = getattr(d, 'peso_por_escalon', None) or []
+    if pasos:
+        geometria = GeometriaLaminacion.desde_diseno(d)
+        guardado = calidad.guardado('laminacion')
+        for step_data in pasos:
+            indice, detalles = step_data['escalon'] - 1, step_data['detalles']
+            trabajos.append(TrabajoFigura('laminacion', dibujar_laminacion,
+                                          (geometria, directorio, guardado, indice, detalles), directorio,
+                                          clave_figura('laminacion', datos_laminacion(geometria, indice, detalles),
+                                                       calidad), _es_local(guardado)))
+    if conexionado:
+        datos = DatosConexionado.desde_diseno(d)
+        trabajos.append(TrabajoFigura('conexionado', dibujar_conexionado,
+                                      (datos, directorio, calidad.guardado('conexionado')), directorio,
+                                      clave_figura('conexionado', datos_conexionado(datos), calidad)))
+    return trabajos
+
+
+def _obtener_pool(procesos):
+    global _pool, _procesos_pool
+    with _lock_pool:
+        if _pool is None or _procesos_pool < procesos:
+            if _pool is not None:
+                _pool.shutdown(wait=False)  # termina lo que tenga en curso
+            _pool = ProcessPoolExecutor(max_workers=procesos)
+            _procesos_pool = procesos
+        return _pool
+
+def cerrar_pool():
+    """Detiene el pool de procesos de figuras (se vuelve a crear si hace falta)."""
+    global _pool, _procesos_pool
+    with _lock_pool:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _procesos_pool = 0
+
+atexit.register(cerrar_pool)
+
+
+def _desde_cache(cache, trabajo):
+    if cache is None or trabajo.clave is None:
+        return None
+    archivos = cache.restaurar_artefactos(trabajo.clave, TIPO_ARTEFACTO, trabajo.directorio)
+    return os.path.join(trabajo.directorio, archivos[0]) if archivos else None
+
+def _a_cache(cache, trabajo, ruta):
+    if cache is None or trabajo.clave is None or not ruta:
+        return
+    relativa = os.path.relpath(ruta, trabajo.directorio)
+    if not relativa.startswith(os.pardir):
+        cache.guardar_artefactos(trabajo.clave, TIPO_ARTEFACTO, trabajo.directorio, [relativa])
+
+
+def dibujar(trabajos, procesos=None):
+    """
+    Ejecuta los trabajos y devuelve sus resultados en el mismo orden. Las figuras
+    que ya están en la caché activa se copian de ella; el resto se dibuja (con
+    procesos=1, o si queda un solo trabajo, en el proceso actual) y se guarda.
+    """
+    cache = cache_resultados.activa()
+    rutas = [_desde_cache(cache, trabajo) for trabajo in trabajos]
+    pendientes = [i for i, ruta in enumerate(rutas) if ruta is None]
+    remotos = [i for i in pendientes if not trabajos[i].local]
+    procesos = min(procesos or os.cpu_count() or 1, len(remotos))
+    futuros = {}
+    if procesos > 1:
+        pool = _obtener_pool(procesos)
+        futuros = {i: pool.submit(trabajos[i].funcion, *trabajos[i].args) for i in remotos}
+    for i in pendientes:
+        rutas[i] = futuros[i].result() if i in futuros else trabajos[i].funcion(*trabajos[i].args)
+    for i in pendientes:
+        _a_cache(cache, trabajos[i], rutas[i])
+    return rutas
@@ -0,0 +1,76 @@
+# src/ui/latex_cache.py
+# -*- coding: utf-8 -*-
+"""
+Caché de compilaciones LaTeX.
+
+La clave de una compilación es el SHA-256 del .tex más el de cada imagen que
+incluye con \\includegraphics. Las rutas absolutas dentro del directorio del
+.tex se normalizan a relativas, así que el mismo reporte generado en otro
+directorio temporal produce la misma clave. Si la clave ya está en la caché, el
+PDF (o el PNG renderizado) se copia de ella sin lanzar pdflatex.
+
+Los archivos se guardan como artefactos de la caché de resultados activa
+(core/cache.py): comparten directorio, límite de tamaño y poda LRU. Sin caché
+activa no se guarda ni se busca nada.
+"""
+
+import hashlib
+import os
+import re
+
+from core import cache as cache_resultados
+
+_INCLUDEGRAPHICS = re.compile(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+# Extensiones que pdflatex prueba cuando \includegraphics no la indica
+_EXTENSIONES_IMAGEN = ('', '.pdf', '.png', '.jpg', '.jpeg', '.eps')
+
+# Aciertos y fallos de este proceso
+estadisticas = {'aciertos': 0, 'fallos': 0}
+
+
+def _hash_archivo(ruta):
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+def _buscar_imagen(ruta, directorio):
+    base = ruta if os.path.isabs(ruta) else os.path.join(directorio, ruta)
+    for extension in _EXTENSIONES_IMAGEN:
+        if os.path.isfile(base + extension):
+            return base + extension
+    return None
+
+
+def clave_tex(tex_path, variante=''):
+    """
+    Clave de compilación de 'tex_path': su contenido más el de sus imágenes.
+    'variante' distingue salidas distintas del mismo .tex (p. ej. 'png200').
+    """
+    directorio = os.path.dirname(os.path.abspath(tex_path))
+    with open(tex_path, encoding='utf-8') as f:
+        texto = f.read().replace(directorio + os.sep, '')
+    h = hashlib.sha256(texto.encode('utf-8'))
+    h.update(variante.encode('utf-8'))
+    for ruta in sorted(set(_INCLUDEGRAPHICS.findall(texto))):
+        imagen = _buscar_imagen(ruta.strip(), directorio)
+        h.update(b'\0' + ruta.encode('utf-8') + b'\0')
+        h.update(_hash_archivo(imagen).encode('ascii') if imagen else b'<falta>')
+    return h.hexdigest()
+
+
+def restaurar(clave, tipo, directorio):
+    """Copia en 'directorio' la salida 'tipo' guardada con 'clave'. Devuelve True si estaba."""
+    cache = cache_resultados.activa()
+    if cache is None:
+        return False
+    encontrado = bool(cache.restaurar_artefactos(clave, tipo, directorio))
+    estadisticas['aciertos' if encontrado else 'fallos'] += 1
+    return encontrado
+
+def guardar(clave, tipo, directorio, archivos):
+    """Guarda 'archivos' (relativos a 'directorio') como salida 'tipo' de 'clave'."""
+    cache = cache_resultados.activa()
+    if cache is not None:
+        cache.guardar_artefactos(clave, tipo, directorio, archivos=archivos)
@@ -0,0 +1,148 @@
+# src/ui/latex_format.py
+# -*- coding: utf-8 -*-
+"""
+Formato de pdflatex precompilado con el preámbulo del reporte.
+
+Todos los reportes comparten el mismo preámbulo (clase, geometry, graphicx,
+float, amsmath y los ajustes de penalizaciones de render_report_document), y
+cargarlo es buena parte del arranque de cada compilación. Aquí se vuelca ese
+preámbulo a un archivo de formato (pdflatex -ini ... \\dump) una sola vez y las
+compilaciones siguientes sólo procesan el cuerpo del documento:
+
+    pdflatex -fmt=trafos-<hash> -jobname=reporte reporte.cuerpo.tex
+
+El nombre del formato lleva el hash del preámbulo y del ejecutable de pdflatex
+(ruta, tamaño y fecha), así que un cambio en el preámbulo o una reinstalación de
+TinyTeX generan un formato nuevo automáticamente. Si el formato no se puede
+construir, compilar_pdf compila el documento completo como siempre.
+
+Hay un formato por preámbulo (con y sin tikz, por ejemplo), y varios procesos
+con perfiles distintos los comparten sin reconstruirlos. Cada uso actualiza la
+fecha del .fmt; al construir uno nuevo se borran los menos usados por encima de
+MAX_FORMATOS, salvo los usados en los últimos MINUTOS_EN_USO minutos (un
+pdflatex en marcha podría estar leyéndolos).
+"""
+
+import glob
+import hashlib
+import os
+import subprocess
+import tempfile
+import time
+
+from core import cache as cache_resultados
+
+_INICIO_CUERPO = r'\begin{document}'
+_PREFIJO = 'trafos-'
+MAX_FORMATOS = 8
+MINUTOS_EN_USO = 10
+
+
+def directorio_formatos():
+    """<caché activa o directorio de caché por defecto>/formatos."""
+    cache = cache_resultados.activa()
+    base = cache.directorio if cache is not None else cache_resultados.directorio_por_defecto()
+    return os.path.join(base, 'formatos')
+
+
+def dividir_documento(texto):
+    """Separa un .tex en (preámbulo, cuerpo). Si no hay \\begin{document}, (None, texto)."""
+    posicion = texto.find(_INICIO_CUERPO)
+    if posicion < 0:
+        return None, texto
+    return texto[:posicion], texto[posicion:]
+
+
+def nombre_formato(compilador, preambulo):
+    """Nombre del formato para este preámbulo y este ejecutable de pdflatex."""
+    ejecutable = os.path.realpath(compilador)
+    estado = os.stat(ejecutable)
+    h = hashlib.sha256(preambulo.encode('utf-8'))
+    h.update(f'\0{ejecutable}\0{estado.st_size}\0{estado.st_mtime_ns}'.encode('utf-8'))
+    return _PREFIJO + h.hexdigest()[:16]
+
+
+def asegurar_formato(compilador, preambulo):
+    """
+    Devuelve (directorio, nombre) del formato con 'preambulo' ya cargado,
+    construyéndolo si no existe, o None si no se pudo construir (el fallo queda
+    registrado para no reintentarlo en cada compilación).
+    """
+    directorio = directorio_formatos()
+    nombre = nombre_formato(compilador, preambulo)
+    ruta = os.path.join(directorio, f'{nombre}.fmt')
+    if os.path.exists(ruta):
+        try:
+            os.utime(ruta)  # uso reciente para _podar
+        except OSError:
+            pass
+        return directorio, nombre
+    if os.path.exists(os.path.join(directorio, f'{nombre}.fallo')):
+        return None
+    os.makedirs(directorio, exist_ok=True)
+
+    # Se construye en un directorio propio y se publica con os.replace, por si
+    # otro proceso construye el mismo formato a la vez.
+    with tempfile.TemporaryDirectory(dir=directorio) as trabajo:
+        with open(os.path.join(trabajo, 'preambulo.tex'), 'w', encoding='utf-8') as f:
+            f.write(preambulo)
+            f.write('\n\\dump\n')
+        base = os.path.splitext(os.path.basename(compilador))[0]  # 'pdflatex'
+        cmd = [compilador, '-ini', '-interaction=nonstopmode', f'-jobname={nombre}', f'&{base}', 'preambulo.tex']
+        proc = subprocess.run(cmd, cwd=trabajo, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        formato = os.path.join(trabajo, f'{nombre}.fmt')
+        if proc.returncode != 0 or not os.path.exists(formato):
+            with open(os.path.join(directorio, f'{nombre}.fallo'), 'wb') as f:
+                f.write((proc.stdout or b'')[-4000:])
+            return None
+        os.replace(formato, ruta)
+
+    _podar(directorio)
+    return directorio, nombre
+
+
+def _podar(directorio):
+    """Deja como mucho MAX_FORMATOS formatos, borrando los de uso más antiguo."""
+    formatos = []
+    for ruta in glob.glob(os.path.join(directorio, f'{_PREFIJO}*.fmt')):
+        try:
+            formatos.append((os.path.getmtime(ruta), ruta))
+        except OSError:
+            pass
+    limite = time.time() - MINUTOS_EN_USO * 60
+    formatos.sort(reverse=True)
+    for usado, ruta in formatos[MAX_FORMATOS:]:
+        if usado < limite:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+def comando_con_formato(compilador, tex_path, directorio_cuerpo=None, opciones=()):
+    """
+    Prepara la compilación de 'tex_path' con el formato precompilado: escribe
+    '<nombre>.cuerpo.tex' junto al .tex (o en 'directorio_cuerpo') y devuelve
+    (cmd, env), o None si el documento no tiene preámbulo o no hay formato
+    disponible. 'opciones' se añaden a la línea de pdflatex.
+    """
+    with open(tex_path, encoding='utf-8') as f:
+        preambulo, cuerpo = dividir_documento(f.read())
+    if not preambulo:
+        return None
+    formato = asegurar_formato(compilador, preambulo)
+    if formato is None:
+        return None
+    directorio_fmt, nombre_fmt = formato
+
+    directorio_tex = os.path.dirname(os.path.abspath(tex_path))
+    nombre = os.path.splitext(os.path.basename(tex_path))[0]
+    cuerpo_path = os.path.join(directorio_cuerpo or directorio_tex, f'{nombre}.cuerpo.tex')
+    with open(cuerpo_path, 'w', encoding='utf-8') as f:
+        f.write(cuerpo)
+    env = dict(os.environ)
+    # El ':' final conserva las rutas de formatos por defecto de la instalación
+    env['TEXFORMATS'] = directorio_fmt + os.pathsep + env.get('TEXFORMATS', '')
+    entrada = os.path.basename(cuerpo_path) if directorio_cuerpo is None else cuerpo_path
+    cmd = [compilador, f'-fmt={nombre_fmt}', '--interaction=nonstopmode', *opciones, f'-jobname={nombre}', entrada]
+    return cmd, env
@@ -0,0 +1,182 @@
+# src/ui/pdf_raster.py
+# -*- coding: utf-8 -*-
+"""
+Exportación de un PDF a una sola imagen (PNG o WebP) con las páginas apiladas.
+
+Las franjas que rasteriza PyMuPDF pasan de su buffer de muestras al lienzo sin
+codificar nada: en este proceso, PIL envuelve las muestras (Image.frombuffer)
+y las pega en la imagen final; con varios procesos, cada uno las copia a un
+lienzo RGB en memoria compartida que PIL lee al final. La imagen se codifica
+una sola vez, en streaming hacia el archivo. Antes cada página hacía
+pixmap -> PNG en memoria -> PIL -> lienzo.
+
+Con documentos grandes (más de UMBRAL_PARALELO píxeles) y más de un proceso, el
+documento se divide en franjas de ALTO_FRANJA filas que rasterizan en paralelo
+los procesos de un pool persistente; cada uno abre el PDF y escribe su franja
+en el lienzo compartido. PyMuPDF no admite hilos, por eso son procesos.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+FORMATOS = {'.png': 'PNG', '.webp': 'WEBP'}
+# Opciones de codificación: PNG sin la búsqueda lenta de optimize, WebP sin pérdidas
+OPCIONES = {
+    'PNG': {'compress_level': 6},
+    'WEBP': {'lossless': True, 'method': 4},
+}
+MAX_LADO_WEBP = 16383
+ALTO_FRANJA = 1024
+UMBRAL_PARALELO = 8_000_000
+BLANCO = 255
+
+_pool = None
+_procesos_pool = 0
+_lock_pool = threading.Lock()
+
+
+def _obtener_pool(procesos):
+    global _pool, _procesos_pool
+    with _lock_pool:
+        if _pool is None or _procesos_pool < procesos:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=procesos)
+            _procesos_pool = procesos
+        return _pool
+
+
+def cerrar_pool():
+    """Detiene el pool de procesos de rasterizado (se vuelve a crear si hace falta)."""
+    global _pool, _procesos_pool
+    with _lock_pool:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _procesos_pool = 0
+
+
+def _franjas(pdf_path, dpi):
+    """
+    Divide el documento apilado en franjas: (página, fila inicial en la página,
+    filas, fila inicial en el lienzo). Devuelve (franjas, ancho, alto) del lienzo.
+    """
+    import fitz  # PyMuPDF
+
+    escala = fitz.Matrix(dpi / 72, dpi / 72)
+    franjas, ancho, alto = [], 0, 0
+    with fitz.open(pdf_path) as doc:
+        for numero, pagina in enumerate(doc):
+            marco = (pagina.rect * escala).irect
+            ancho = max(ancho, marco.width)
+            for fila in range(0, marco.height, ALTO_FRANJA):
+                franjas.append((numero, fila, min(ALTO_FRANJA, marco.height - fila), alto + fila))
+            alto += marco.height
+    return franjas, ancho, alto
+
+
+def _rasterizar_franjas(pdf_path, dpi, franjas, escribir):
+    """Rasteriza 'franjas' del PDF y entrega cada una a escribir(pix, filas, fila_destino)."""
+    import fitz  # PyMuPDF
+
+    escala = dpi / 72
+    matriz = fitz.Matrix(escala, escala)
+    with fitz.open(pdf_path) as doc:
+        for numero, fila, filas, destino in franjas:
+            pagina = doc[numero]
+            rect = pagina.rect
+            recorte = fitz.Rect(rect.x0, rect.y0 + fila / escala, rect.x1, rect.y0 + (fila + filas) / escala)
+            pix = pagina.get_pixmap(matrix=matriz, clip=recorte, alpha=False)
+            escribir(pix, min(filas, pix.height), destino)
+
+
+def _pegar_en_imagen(imagen):
+    """escribir() que pega cada franja en la imagen PIL 'imagen'."""
+    from PIL import Image
+
+    def escribir(pix, filas, destino):
+        franja = Image.frombuffer('RGB', (pix.width, filas), pix.samples_mv, 'raw', 'RGB', pix.stride, 1)
+        imagen.paste(franja, (0, destino))
+    return escribir
+
+
+def _copiar_en_buffer(lienzo, ancho):
+    """escribir() que copia cada franja en 'lienzo', un buffer RGB de 'ancho' píxeles por fila."""
+    fila_lienzo = ancho * 3
+
+    def escribir(pix, filas, destino):
+        muestras = pix.samples_mv
+        columnas = min(pix.width, ancho) * 3
+        inicio = destino * fila_lienzo
+        if pix.stride == fila_lienzo and columnas == fila_lienzo:
+            # Franja del ancho del lienzo: una sola copia contigua
+            lienzo[inicio:inicio + filas * fila_lienzo] = muestras[:filas * fila_lienzo]
+            return
+        for i in range(filas):
+            # Página más angosta que el lienzo: fila a fila, el resto en blanco
+            fila_destino = inicio + i * fila_lienzo
+            lienzo[fila_destino:fila_destino + columnas] = muestras[i * pix.stride:i * pix.stride + columnas]
+            lienzo[fila_destino + columnas:fila_destino + fila_lienzo] = bytes([BLANCO]) * (fila_lienzo - columnas)
+    return escribir
+
+
+def _rasterizar_en_memoria_compartida(pdf_path, dpi, franjas, nombre, ancho):
+    memoria = shared_memory.SharedMemory(name=nombre)
+    try:
+        _rasterizar_franjas(pdf_path, dpi, franjas, _copiar_en_buffer(memoria.buf, ancho))
+    finally:
+        memoria.close()
+
+
+def _procesos_para(pixeles, procesos):
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    return procesos if pixeles > UMBRAL_PARALELO else 1
+
+
+def pdf_a_imagen(pdf_path, ruta_imagen, dpi=200, procesos=None):
+    """
+    Rasteriza todas las páginas del PDF a 'dpi' y las guarda apiladas en
+    'ruta_imagen' (PNG o WebP según la extensión). 'procesos' limita los
+    procesos que rasterizan en paralelo (por defecto uno por CPU; 1 = en este
+    proceso). Devuelve 'ruta_imagen'.
+    """
+    from PIL import Image
+
+    formato = FORMATOS.get(os.path.splitext(ruta_imagen)[1].lower())
+    if formato is None:
+        raise ValueError(f"Formato de imagen no soportado: '{ruta_imagen}' (use {', '.join(FORMATOS)})")
+    franjas, ancho, alto = _franjas(pdf_path, dpi)
+    if not franjas:
+        raise RuntimeError("No se encontraron páginas en el PDF para renderizar.")
+    if formato == 'WEBP' and max(ancho, alto) > MAX_LADO_WEBP:
+        raise ValueError(f"La imagen ({ancho}x{alto}) excede el máximo de WebP ({MAX_LADO_WEBP} px por lado)")
+
+    procesos = min(_procesos_para(ancho * alto, procesos), len(franjas))
+    if procesos <= 1:
+        imagen = Image.new('RGB', (ancho, alto), (BLANCO,) * 3)
+        _rasterizar_franjas(pdf_path, dpi, franjas, _pegar_en_imagen(imagen))
+    else:
+        memoria = shared_memory.SharedMemory(create=True, size=ancho * alto * 3)
+        try:
+            pool = _obtener_pool(procesos)
+            ruta_pdf = os.path.abspath(pdf_path)
+            futuros = [pool.submit(_rasterizar_en_memoria_compartida, ruta_pdf, dpi, franjas[i::procesos],
+                                   memoria.name, ancho)
+                       for i in range(procesos)]
+            for futuro in futuros:
+                futuro.result()
+            # Única copia del lienzo compartido, a la disposición interna de PIL
+            imagen = Image.frombuffer('RGB', (ancho, alto), memoria.buf, 'raw', 'RGB', 0, 1)
+            imagen.load()
+        finally:
+            memoria.close()
+            memoria.unlink()
+    try:
+        with open(ruta_imagen, 'wb') as f:
+            imagen.save(f, formato, **OPCIONES[formato])
+    finally:
+        imagen.close()
+    return ruta_imagen
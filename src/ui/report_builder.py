@@ -22,86 +22,93 @@ def add_calculation_step(doc, titulo, formula, valores, resultado, unidad):
     doc.append(Command('newline'))
     doc.append(Command('vspace', '0.3em'))
 
-def generate_full_report_document(diseno, work_dir=None):
-    """Orquesta la construcción de un documento LaTeX, manejando cálculos y renderizado.
-    Si work_dir se proporciona, cambia temporalmente el cwd a ese directorio para que
-    los plotters escriban sus archivos donde pdflatex los encontrará.
+def _usa_tikz(diseno):
+    """True si alguna figura del núcleo o de laminación es código TikZ."""
+    rutas = [getattr(diseno, 'core_plot_path', None)]
+    rutas += [paso.get('plot_path') for paso in getattr(diseno, 'peso_por_escalon', None) or []]
+    return any(ruta and ruta.endswith('.tikz') for ruta in rutas)
+
+def generate_full_report_document(diseno, work_dir=None, espacio=None):
+    """Construye el documento LaTeX de un diseño.
+
+    Acepta un DisenoTransformador o un ResultadoDiseno. Si el diseño tiene fases
+    pendientes se completan (sólo las pendientes); después se toma una instantánea
+    inmutable y se delega en render_report_document, que nunca recalcula.
     """
+    from core.results import ResultadoDiseno
+    if not isinstance(diseno, ResultadoDiseno):
+        if hasattr(diseno, 'fases_pendientes') and diseno.fases_pendientes():
+            diseno.ejecutar_calculo_completo()
+        diseno = ResultadoDiseno.desde_diseno(diseno)
+    return render_report_document(diseno, work_dir=work_dir, espacio=espacio)
+
+def render_report_document(resultado, work_dir=None, espacio=None):
+    """Renderiza el documento LaTeX a partir de un resultado ya calculado.
+
+    'resultado' puede ser un ResultadoDiseno (p. ej. cargado con
+    ResultadoDiseno.cargar) o cualquier objeto con los mismos atributos; aquí no se
+    ejecuta ninguna fase de cálculo. Los archivos que genera el reporte (diagrama
+    de conexionado) se escriben en 'espacio' (ui/workspace.py) o en 'work_dir',
+    uno de los dos obligatorio, y las figuras se referencian con rutas relativas
+    a ese directorio, que es donde debe compilarse el .tex. La limpieza del
+    directorio corresponde a quien lo creó. Nunca se escribe en el directorio
+    actual ni se cambia el cwd del proceso, así que es seguro llamarla desde
+    varios hilos.
+    """
+    from ui.workspace import EspacioReporte
+    diseno = resultado
+    if espacio is None:
+        if work_dir is None:
+            raise ValueError("render_report_document necesita 'espacio' o 'work_dir'.")
+        espacio = EspacioReporte(work_dir)
+    geometry_options = {
+        "paperheight": "50in",  # Página muy larga para evitar saltos
+        "paperwidth": "8.5in",
+        "margin": "0.8in",
+        "top": "1in",
+        "bottom": "1in"
+    }
     
-    import os
-    prev_cwd = None
-    try:
-        if work_dir:
-            prev_cwd = os.getcwd()
-            os.makedirs(work_dir, exist_ok=True)
-            os.chdir(work_dir)
-    
-        geometry_options = {
-            "paperheight": "50in",  # Página muy larga para evitar saltos
-            "paperwidth": "8.5in",
-            "margin": "0.8in",
-            "top": "1in",
-            "bottom": "1in"
-        }
-        
-        doc = Document(geometry_options=geometry_options)
-        doc.packages.append(Package('graphicx'))
-        doc.packages.append(Package('float'))  # Para mejor control de figuras
-        doc.preamble.append(Command('pagestyle', 'empty'))
-        # Configurar formato para una sola página continua
-        doc.preamble.append(NoEscape(r'\tolerance=1414'))
-        doc.preamble.append(NoEscape(r'\hbadness=1414'))
-        doc.preamble.append(NoEscape(r'\emergencystretch=1.5em'))
-        doc.preamble.append(NoEscape(r'\hfuzz=0.3pt'))
-        doc.preamble.append(NoEscape(r'\widowpenalty=10000'))
-        doc.preamble.append(NoEscape(r'\vfuzz=\hfuzz'))
-        # Evitar saltos de página automáticos
-        doc.preamble.append(NoEscape(r'\raggedbottom'))
-        doc.preamble.append(NoEscape(r'\setlength{\parskip}{0.5em}'))
-        doc.preamble.append(NoEscape(r'\setlength{\parindent}{0pt}'))
-        # Configurar flotantes para que no causen saltos de página
-        doc.preamble.append(NoEscape(r'\renewcommand{\topfraction}{0.85}'))
-        doc.preamble.append(NoEscape(r'\renewcommand{\bottomfraction}{0.85}'))
-        doc.preamble.append(NoEscape(r'\renewcommand{\textfraction}{0.1}'))
-        doc.preamble.append(NoEscape(r'\renewcommand{\floatpagefraction}{0.75}'))
-     
-        # --- 1. FASE DE CÁLCULO ---
-        # Importar los módulos de CÁLCULO
-        from design_phases.nucleus_and_window import calculation as nucleus_calc
-        from design_phases.core_and_lamination_weights import calculation as core_weights_calc
-        # (Aquí irían otros módulos de cálculo como windings, losses, etc.)
-        # from design_phases.windings_and_taps import calculation as windings_calc
-        
-        # Ejecutar los cálculos en el orden de dependencia correcto.
-        # El objeto 'diseno' se enriquece en cada paso.
-        doc.append(NoEscape('% Fase de Cálculo: Poblando el objeto de diseño'))
-        nucleus_calc.run(diseno)           # Calcula 'a' y 'e', necesarios para el siguiente paso
-        core_weights_calc.run(diseno)      # Calcula el peso de laminaciones usando 'a' y 'e'
-        # windings_calc.run(diseno)
-     
-        # --- 2. FASE DE RENDERIZADO ---
-        # Importar los módulos de RENDERIZADO
-        from design_phases.input_data import renderer as input_renderer
-        from design_phases.nucleus_and_window import renderer as nucleus_renderer
-        from design_phases.windings_and_taps import renderer as windings_renderer
-        from design_phases.core_and_lamination_weights import renderer as core_weights_renderer
-        from design_phases.losses_and_performance import renderer as losses_perf_renderer
-        from design_phases.daily_performance import renderer as daily_perf_renderer
-     
-        # Ahora que 'diseno' está completo, renderizar cada sección.
-        # Los renderizadores solo leen el objeto 'diseno' y escriben en 'doc'.
-        doc.append(NoEscape('% Fase de Renderizado: Construyendo el documento'))
-        input_renderer.run(doc, diseno)
-        nucleus_renderer.run(doc, diseno, add_calculation_step)
-        windings_renderer.run(doc, diseno, add_calculation_step)
-        core_weights_renderer.run(doc, diseno, add_calculation_step) # Ahora tendrá los datos que necesita
-        losses_perf_renderer.run(doc, diseno, add_calculation_step)
-        daily_perf_renderer.run(doc, diseno)
-     
-        return doc
-    finally:
-        if prev_cwd:
-            try:
-                os.chdir(prev_cwd)
-            except Exception:
-                pass
\ No newline at end of file
+    doc = Document(geometry_options=geometry_options)
+    doc.packages.append(Package('graphicx'))
+    doc.packages.append(Package('float'))  # Para mejor control de figuras
+    if _usa_tikz(diseno):
+        doc.packages.append(Package('tikz'))  # figuras del perfil 'tikz' (core/tikz.py)
+    doc.preamble.append(Command('pagestyle', 'empty'))
+    # Configurar formato para una sola página continua
+    doc.preamble.append(NoEscape(r'\tolerance=1414'))
+    doc.preamble.append(NoEscape(r'\hbadness=1414'))
+    doc.preamble.append(NoEscape(r'\emergencystretch=1.5em'))
+    doc.preamble.append(NoEscape(r'\hfuzz=0.3pt'))
+    doc.preamble.append(NoEscape(r'\widowpenalty=10000'))
+    doc.preamble.append(NoEscape(r'\vfuzz=\hfuzz'))
+    # Evitar saltos de página automáticos
+    doc.preamble.append(NoEscape(r'\raggedbottom'))
+    doc.preamble.append(NoEscape(r'\setlength{\parskip}{0.5em}'))
+    doc.preamble.append(NoEscape(r'\setlength{\parindent}{0pt}'))
+    # Configurar flotantes para que no causen saltos de página
+    doc.preamble.append(NoEscape(r'\renewcommand{\topfraction}{0.85}'))
+    doc.preamble.append(NoEscape(r'\renewcommand{\bottomfraction}{0.85}'))
+    doc.preamble.append(NoEscape(r'\renewcommand{\textfraction}{0.1}'))
+    doc.preamble.append(NoEscape(r'\renewcommand{\floatpagefraction}{0.75}'))
+ 
+    # --- FASE DE RENDERIZADO ---
+    # Importar los módulos de RENDERIZADO
+    from design_phases.input_data import renderer as input_renderer
+    from design_phases.nucleus_and_window import renderer as nucleus_renderer
+    from design_phases.windings_and_taps import renderer as windings_renderer
+    from design_phases.core_and_lamination_weights import renderer as core_weights_renderer
+    from design_phases.losses_and_performance import renderer as losses_perf_renderer
+    from design_phases.daily_performance import renderer as daily_perf_renderer
+ 
+    # 'diseno' ya está completo: renderizar cada sección.
+    # Los renderizadores solo leen el objeto 'diseno' y escriben en 'doc'.
+    doc.append(NoEscape('% Fase de Renderizado: Construyendo el documento'))
+    input_renderer.run(doc, diseno)
+    nucleus_renderer.run(doc, diseno, add_calculation_step, espacio=espacio)
+    windings_renderer.run(doc, diseno, add_calculation_step, espacio=espacio)
+    core_weights_renderer.run(doc, diseno, add_calculation_step, espacio=espacio) # Ahora tendrá los datos que necesita
+    losses_perf_renderer.run(doc, diseno, add_calculation_step)
+    daily_perf_renderer.run(doc, diseno)
+ 
+    return doc
@@ -0,0 +1,198 @@
+# src/ui/report_export.py
+# -*- coding: utf-8 -*-
+"""
+Exportación del reporte de un diseño a disco (figuras, .tex y, opcionalmente, PDF).
+
+Es la misma secuencia que sigue la GUI (figuras del núcleo y de laminación,
+documento LaTeX, pdflatex), sin interfaz: la usan la GUI y cli.py. Con una
+caché de resultados activa (core/cache.py), los reportes ya generados para los
+mismos parámetros se copian de ella en lugar de volver a dibujarse y compilarse.
+
+Esos artefactos se guardan con la clave del diseño, que no cambia al modificar
+los renderers: por eso su tipo lleva VERSION_REPORTE (y VERSION_FIGURAS), que hay
+que subir al cambiar el contenido del reporte para no servir reportes viejos.
+"""
+
+import os
+import shutil
+import subprocess
+
+from core import cache as cache_resultados
+from ui import figures, latex_cache, latex_format, pdf_raster
+from ui.workspace import EspacioReporte
+
+VERSION_REPORTE = 1
+
+
+class ReporteCancelado(Exception):
+    """La generación del reporte se canceló (ver el argumento 'cancelado')."""
+
+
+def tipo_artefacto(nombre):
+    """Tipo de artefacto de caché de 'nombre', ligado a la versión de los renderers."""
+    return f'{nombre}-r{VERSION_REPORTE}f{figures.VERSION_FIGURAS}'
+
+
+def generar_figuras(diseno, directorio, procesos=None, calidad=None):
+    """
+    Dibuja las figuras del núcleo, de laminación y el diagrama de conexionado en
+    'directorio', en paralelo (ui/figures.py, 'procesos' trabajadores; por
+    defecto uno por CPU), y registra sus rutas en el diseño (core_plot_*,
+    lamination_plot_*, connection_diagram_path y plot_path de cada escalón).
+    'calidad' es el perfil de figures.PERFILES (por defecto, PDF vectorial).
+    """
+    trabajos = figures.trabajos_reporte(diseno, directorio, calidad=calidad)
+    rutas = figures.dibujar(trabajos, procesos=procesos)
+
+    core_path = rutas[0]
+    diseno.core_plot_paths = [core_path] if core_path else []
+    diseno.core_plot_path = core_path
+    diseno.core_plot_filename = os.path.basename(core_path) if core_path else None
+
+    # Las imágenes de laminación son una etapa aparte del cálculo: quedan
+    # registradas en diseno.peso_por_escalon.
+    lam_paths = []
+    for step_data, ruta in zip(diseno.peso_por_escalon or [], rutas[1:-1]):
+        step_data['plot_path'] = ruta
+        if ruta:
+            lam_paths.append(ruta)
+    diseno.lamination_plot_paths = lam_paths
+    diseno.lamination_plot_path = lam_paths[-1] if lam_paths else None
+    diseno.lamination_plot_filename = os.path.basename(diseno.lamination_plot_path) if diseno.lamination_plot_path else None
+    diseno.connection_diagram_path = rutas[-1]
+    return diseno
+
+
+def compilador_pdflatex():
+    """Ruta de pdflatex: el de TinyTeX si está instalado, si no el del PATH (None si no hay)."""
+    try:
+        import pytinytex
+        ruta = pytinytex.get_pdf_latex_engine()
+        if ruta and os.path.exists(ruta):
+            return ruta
+    except Exception:
+        pass
+    return shutil.which('pdflatex')
+
+
+def _ejecutar(cmd, cwd, env=None, cancelado=None):
+    """
+    subprocess.run(cmd) con la salida unida. Si 'cancelado' (threading.Event) se
+    activa mientras corre, mata el proceso y lanza ReporteCancelado.
+    """
+    if cancelado is None:
+        return subprocess.run(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if cancelado.is_set():
+        raise ReporteCancelado()
+    with subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        while True:
+            try:
+                stdout, _ = proc.communicate(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                if cancelado.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    raise ReporteCancelado()
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout)
+
+
+def compilar_pdf(tex_path, directorio_trabajo=None, cancelado=None):
+    """
+    Compila 'tex_path' con pdflatex y devuelve la ruta del PDF (junto al .tex).
+    Los archivos auxiliares (.aux, .log) quedan en el directorio del .tex o, si se
+    indica, en 'directorio_trabajo'. Si el mismo .tex con las mismas imágenes ya
+    se compiló, el PDF sale de la caché de compilaciones (ui/latex_cache.py) sin
+    lanzar pdflatex. Si se pasa 'cancelado' (threading.Event) y se activa
+    durante la compilación, pdflatex se detiene y se lanza ReporteCancelado.
+    """
+    directorio = os.path.dirname(os.path.abspath(tex_path))
+    nombre = os.path.splitext(os.path.basename(tex_path))[0]
+    pdf_path = os.path.join(directorio, f'{nombre}.pdf')
+    clave = latex_cache.clave_tex(tex_path)
+    if latex_cache.restaurar(clave, f'pdf-{nombre}', directorio):
+        return pdf_path
+
+    compilador = compilador_pdflatex()
+    if not compilador:
+        raise RuntimeError("No se encontró pdflatex (TinyTeX o PATH).")
+    salida = os.path.abspath(directorio_trabajo) if directorio_trabajo else directorio
+    opciones = [f'-output-directory={salida}'] if directorio_trabajo else []
+    pdf_salida = os.path.join(salida, f'{nombre}.pdf')
+    # Primero con el formato precompilado del preámbulo (ui/latex_format.py); si
+    # no hay formato o esa compilación falla, se compila el documento completo.
+    proc = None
+    con_formato = latex_format.comando_con_formato(compilador, tex_path, directorio_trabajo and salida, opciones)
+    if con_formato is not None:
+        cmd, env = con_formato
+        proc = _ejecutar(cmd, directorio, env, cancelado)
+    if proc is None or proc.returncode != 0 or not os.path.exists(pdf_salida):
+        cmd = [compilador, "--interaction=nonstopmode", *opciones, os.path.basename(tex_path)]
+        proc = _ejecutar(cmd, directorio, cancelado=cancelado)
+    if proc.returncode != 0 or not os.path.exists(pdf_salida):
+        salida_texto = (proc.stdout or b"").decode("utf-8", errors="replace")
+        raise RuntimeError(f"pdflatex returned non-zero exit status {proc.returncode}.\nOutput:\n{salida_texto[-2000:]}")
+    if pdf_salida != pdf_path:
+        shutil.move(pdf_salida, pdf_path)
+    latex_cache.guardar(clave, f'pdf-{nombre}', directorio, [f'{nombre}.pdf'])
+    return pdf_path
+
+
+def pdf_a_png(pdf_path, png_path, dpi=200, procesos=None):
+    """
+    Renderiza todas las páginas del PDF y las une verticalmente en un PNG (o
+    WebP, si 'png_path' termina en .webp). Ver ui/pdf_raster.py.
+    """
+    return pdf_raster.pdf_a_imagen(pdf_path, png_path, dpi=dpi, procesos=procesos)
+
+
+def compilar_png(tex_path, png_path, dpi=200, cancelado=None):
+    """
+    Compila 'tex_path' y guarda sus páginas como un único PNG en 'png_path'. Con
+    la caché de compilaciones, un .tex ya visto no lanza pdflatex ni renderiza.
+    'cancelado' se pasa a compilar_pdf.
+    """
+    directorio = os.path.dirname(os.path.abspath(tex_path))
+    nombre = os.path.splitext(os.path.basename(tex_path))[0]
+    png_local = os.path.join(directorio, f'{nombre}.png')
+    clave = latex_cache.clave_tex(tex_path, variante=f'png{dpi}')
+    if not latex_cache.restaurar(clave, f'png-{nombre}', directorio):
+        pdf_a_png(compilar_pdf(tex_path, cancelado=cancelado), png_local, dpi=dpi)
+        latex_cache.guardar(clave, f'png-{nombre}', directorio, [f'{nombre}.png'])
+    if os.path.abspath(png_path) != png_local:
+        shutil.copyfile(png_local, png_path)
+    return png_path
+
+
+def exportar_reporte(diseno, directorio, pdf=False, nombre='reporte', procesos=None, calidad=None):
+    """
+    Escribe en 'directorio' las figuras y el .tex del reporte de un diseño ya
+    calculado y, si pdf=True, lo compila. 'directorio' puede ser una ruta o un
+    EspacioReporte (ui/workspace.py); todas las rutas se derivan de él.
+    'procesos' y 'calidad' se pasan a generar_figuras (procesos=1 dibuja en
+    este proceso).
+
+    Returns:
+        dict: {'tex': ruta del .tex, 'pdf': ruta del PDF o None}
+    """
+    espacio = directorio if isinstance(directorio, EspacioReporte) else EspacioReporte(directorio)
+    tex_path = espacio.ruta(f'{nombre}.tex')
+    pdf_path = os.path.splitext(tex_path)[0] + '.pdf' if pdf else None
+
+    cache = cache_resultados.activa()
+    calidad = figures.perfil(calidad)
+    tipo = tipo_artefacto(f'{nombre}-{calidad.nombre}' + ('-pdf' if pdf else ''))
+    clave = cache_resultados.clave_diseno(diseno) if cache is not None else None
+    if cache is not None and cache.restaurar_artefactos(clave, tipo, espacio.directorio):
+        return {'tex': tex_path, 'pdf': pdf_path}
+
+    from ui.report_builder import generate_full_report_document  # carga PyLaTeX
+    generar_figuras(diseno, espacio.directorio, procesos=procesos, calidad=calidad)
+    latex_doc = generate_full_report_document(diseno, espacio=espacio)
+    with open(tex_path, 'w', encoding='utf-8') as f:
+        f.write(latex_doc.dumps())
+    if pdf:
+        compilar_pdf(tex_path)
+    if cache is not None:
+        cache.guardar_artefactos(clave, tipo, espacio.directorio)
+    return {'tex': tex_path, 'pdf': pdf_path}
@@ -0,0 +1,148 @@
+# src/ui/report_service.py
+# -*- coding: utf-8 -*-
+"""
+Servicio de compilación de reportes con un pool acotado de trabajadores.
+
+Cada trabajador es un hilo que toma trabajos de una cola y lanza pdflatex (el
+trabajo real ocurre en el subproceso, así que los hilos compilan en paralelo de
+verdad). Cada trabajador tiene su propio directorio temporal, que se vacía entre
+trabajos: allí quedan .aux, .log y el cuerpo del documento, y el PDF se mueve
+junto al .tex al terminar. La cola es acotada, de modo que enviar() bloquea
+cuando hay demasiados trabajos pendientes.
+
+Uso:
+    with ServicioReportes() as servicio:
+        trabajos = [servicio.enviar(ruta_tex) for ruta_tex in rutas]
+        for trabajo in servicio.completados(trabajos):
+            print(trabajo.tex, trabajo.estado, trabajo.duracion_s)
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+
+from ui.report_export import compilar_pdf, pdf_a_png
+
+EN_COLA = 'en_cola'
+COMPILANDO = 'compilando'
+OK = 'ok'
+ERROR = 'error'
+
+_FIN = object()
+
+
+@dataclass(eq=False)
+class TrabajoReporte:
+    """Estado de un trabajo de compilación y sus tiempos (segundos)."""
+    id: int
+    tex: str
+    png: str = None
+    dpi: int = 200
+    estado: str = EN_COLA
+    pdf: str = None
+    error: str = None
+    trabajador: int = None
+    enviado: float = field(default_factory=time.perf_counter)
+    espera_s: float = None
+    duracion_s: float = None
+    _terminado: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def terminado(self):
+        return self._terminado.is_set()
+
+    def esperar(self, timeout=None):
+        """Espera a que termine el trabajo. Devuelve True si terminó."""
+        return self._terminado.wait(timeout)
+
+
+class ServicioReportes:
+    """Compila reportes .tex en paralelo con 'trabajadores' hilos (uno por CPU por defecto)."""
+
+    def __init__(self, trabajadores=None, max_en_cola=None):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self._cola = queue.Queue(maxsize=max_en_cola or 4 * self.trabajadores)
+        self._hecho = threading.Condition()
+        self._trabajos = {}
+        self._siguiente_id = 0
+        self._lock = threading.Lock()
+        self._dir_base = tempfile.mkdtemp(prefix='trafos_reportes_')
+        self._hilos = [threading.Thread(target=self._trabajar, args=(i,), daemon=True, name=f'reporte-{i}')
+                       for i in range(self.trabajadores)]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def enviar(self, tex_path, png_path=None, dpi=200):
+        """
+        Encola la compilación de 'tex_path' (y, si se indica, su PNG en 'png_path').
+        Bloquea mientras la cola está llena. Devuelve el TrabajoReporte.
+        """
+        with self._lock:
+            self._siguiente_id += 1
+            trabajo = TrabajoReporte(self._siguiente_id, os.path.abspath(tex_path), png_path, dpi)
+            self._trabajos[trabajo.id] = trabajo
+        self._cola.put(trabajo)
+        return trabajo
+
+    def estado(self, id_trabajo):
+        return self._trabajos[id_trabajo]
+
+    def completados(self, trabajos=None):
+        """Entrega 'trabajos' (por defecto, todos los enviados) a medida que terminan."""
+        restantes = {t.id: t for t in (trabajos if trabajos is not None else list(self._trabajos.values()))}
+        while restantes:
+            with self._hecho:
+                listos = [t for t in restantes.values() if t.terminado()]
+                if not listos:
+                    self._hecho.wait()
+                    continue
+            for trabajo in listos:
+                del restantes[trabajo.id]
+                yield trabajo
+
+    def esperar(self, trabajos=None):
+        """Espera a que terminen 'trabajos' (por defecto, todos los enviados)."""
+        for trabajo in (trabajos if trabajos is not None else list(self._trabajos.values())):
+            trabajo.esperar()
+
+    def cerrar(self):
+        """Termina los trabajos encolados, detiene los hilos y borra los directorios temporales."""
+        for _ in self._hilos:
+            self._cola.put(_FIN)
+        for hilo in self._hilos:
+            hilo.join()
+        shutil.rmtree(self._dir_base, ignore_errors=True)
+
+    def _trabajar(self, indice):
+        directorio = os.path.join(self._dir_base, f'trabajador_{indice}')
+        while True:
+            trabajo = self._cola.get()
+            if trabajo is _FIN:
+                return
+            trabajo.trabajador = indice
+            trabajo.estado = COMPILANDO
+            inicio = time.perf_counter()
+            trabajo.espera_s = inicio - trabajo.enviado
+            shutil.rmtree(directorio, ignore_errors=True)
+            os.makedirs(directorio)
+            try:
+                trabajo.pdf = compilar_pdf(trabajo.tex, directorio_trabajo=directorio)
+                if trabajo.png:
+                    pdf_a_png(trabajo.pdf, trabajo.png, dpi=trabajo.dpi)
+                trabajo.estado = OK
+            except Exception as e:
+                trabajo.estado = ERROR
+                trabajo.error = f"{type(e).__name__}: {e}"
+            trabajo.duracion_s = time.perf_counter() - inicio
+            with self._hecho:
+                trabajo._terminado.set()
+                self._hecho.notify_all()
@@ -0,0 +1,179 @@
+# src/ui/report_viewer.py
+# -*- coding: utf-8 -*-
+"""
+Visor del reporte PDF por ventana visible, para la GUI.
+
+En lugar de rasterizar todo el documento en un único PNG (un reporte de 6
+escalones mide decenas de pulgadas de alto), VisorPDF mantiene el PDF abierto y
+sólo dibuja la franja que se ve, a resolución de pantalla. Las páginas se
+apilan una debajo de otra (como el PNG de pdf_a_png) y se dividen en teselas
+horizontales de ALTO_TESELA píxeles; cada tesela se rasteriza con PyMuPDF
+recortando la página (clip) al zoom actual y se guarda en una caché LRU, así
+desplazarse por lo ya visto no vuelve a rasterizar nada.
+
+Uso:
+    visor = VisorPDF('reporte.pdf')
+    png = visor.vista(y=0, alto=600)      # bytes PNG para sg.Image
+    visor.acercar(); visor.desplazar(120)
+"""
+
+from collections import OrderedDict
+
+# Escala de un punto PDF (1/72 in) a un píxel de pantalla (1/96 in) con zoom 1
+PIXELES_POR_PUNTO = 96 / 72
+ZOOMS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+ALTO_TESELA = 256
+MAX_TESELAS = 96
+
+
+class VisorPDF:
+    """PDF abierto que se dibuja por franjas visibles, con zoom y caché de teselas."""
+
+    def __init__(self, pdf_path, ancho=750, alto=600, zoom=1.0, max_teselas=MAX_TESELAS):
+        import fitz  # PyMuPDF
+
+        self._fitz = fitz
+        # Se lee a memoria: el archivo queda libre para que el siguiente
+        # reporte lo sobrescriba mientras éste sigue en pantalla.
+        with open(pdf_path, 'rb') as f:
+            self.doc = fitz.open(stream=f.read(), filetype='pdf')
+        self.ancho = ancho
+        self.alto = alto
+        self.x = self.y = 0
+        self.max_teselas = max_teselas
+        self._teselas = OrderedDict()
+        self._nivel = min(range(len(ZOOMS)), key=lambda i: abs(ZOOMS[i] - zoom))
+        # Tamaño de cada página en puntos y su inicio en el documento apilado
+        self._paginas = [self.doc[i].rect for i in range(self.doc.page_count)]
+        self._inicios = []
+        inicio = 0.0
+        for rect in self._paginas:
+            self._inicios.append(inicio)
+            inicio += rect.height
+        self._alto_puntos = inicio
+        if not self._paginas:
+            self.doc.close()
+            raise ValueError(f"El PDF no tiene páginas: {pdf_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self._teselas.clear()
+        self.doc.close()
+
+    @property
+    def zoom(self):
+        return ZOOMS[self._nivel]
+
+    @property
+    def escala(self):
+        """Píxeles por punto PDF con el zoom actual."""
+        return self.zoom * PIXELES_POR_PUNTO
+
+    @property
+    def alto_total(self):
+        """Alto en píxeles del documento completo con el zoom actual."""
+        return int(round(self._alto_puntos * self.escala))
+
+    @property
+    def ancho_total(self):
+        return int(round(max(rect.width for rect in self._paginas) * self.escala))
+
+    @property
+    def y_maximo(self):
+        return max(0, self.alto_total - self.alto)
+
+    @property
+    def x_maximo(self):
+        return max(0, self.ancho_total - self.ancho)
+
+    def ir_a(self, y, x=None):
+        """Mueve la vista a 'y' (y 'x') píxeles del inicio, acotados; devuelve la nueva y."""
+        self.y = int(min(max(0, y), self.y_maximo))
+        if x is not None:
+            self.x = int(min(max(0, x), self.x_maximo))
+        return self.y
+
+    def desplazar(self, dy, dx=0):
+        return self.ir_a(self.y + dy, self.x + dx)
+
+    def fijar_zoom(self, nivel):
+        """Pasa al nivel 'nivel' de ZOOMS manteniendo centrado lo que se veía."""
+        nivel = min(max(0, nivel), len(ZOOMS) - 1)
+        if nivel != self._nivel:
+            centro_y = (self.y + self.alto / 2) / self.escala
+            centro_x = (self.x + self.ancho / 2) / self.escala
+            self._nivel = nivel
+            self.ir_a(centro_y * self.escala - self.alto / 2, centro_x * self.escala - self.ancho / 2)
+        return self.zoom
+
+    def acercar(self):
+        return self.fijar_zoom(self._nivel + 1)
+
+    def alejar(self):
+        return self.fijar_zoom(self._nivel - 1)
+
+    def vista(self, y=None, alto=None, formato='png'):
+        """
+        Imagen (bytes 'png' o 'ppm') de la franja [y, y + alto) del documento con
+        el zoom actual, del ancho de la vista a partir de self.x. Por defecto, la
+        posición actual.
+        """
+        fitz = self._fitz
+        if y is not None:
+            self.ir_a(y)
+        alto = min(alto or self.alto, max(1, self.alto_total))
+        ancho = min(self.ancho, self.ancho_total)
+        destino = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, ancho, alto), False)
+        destino.clear_with(255)
+        primera, ultima = self.y // ALTO_TESELA, (self.y + alto - 1) // ALTO_TESELA
+        for indice in range(primera, ultima + 1):
+            tesela = self._tesela(indice)
+            if tesela is None:
+                continue
+            # Las teselas llevan su posición en el documento como origen; se
+            # corren a coordenadas de la vista para copiarlas en su sitio.
+            tesela.set_origin(-self.x, indice * ALTO_TESELA - self.y)
+            destino.copy(tesela, tesela.irect)
+        return destino.tobytes(formato)
+
+    def _tesela(self, indice):
+        clave = (self._nivel, indice)
+        tesela = self._teselas.get(clave)
+        if tesela is not None:
+            self._teselas.move_to_end(clave)
+            return tesela
+        tesela = self._rasterizar(indice)
+        self._teselas[clave] = tesela
+        while len(self._teselas) > self.max_teselas:
+            self._teselas.popitem(last=False)
+        return tesela
+
+    def _rasterizar(self, indice):
+        """
+        Tesela 'indice' del documento apilado (ALTO_TESELA píxeles de alto y el
+        ancho completo del documento), o None si cae fuera.
+        """
+        fitz = self._fitz
+        escala = self.escala
+        arriba, abajo = indice * ALTO_TESELA / escala, (indice + 1) * ALTO_TESELA / escala
+        if arriba >= self._alto_puntos:
+            return None
+        alto = ALTO_TESELA if abajo <= self._alto_puntos else self.alto_total - indice * ALTO_TESELA
+        tesela = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, self.ancho_total, max(1, alto)), False)
+        tesela.clear_with(255)
+        matriz = fitz.Matrix(escala, escala)
+        for numero, (rect, inicio) in enumerate(zip(self._paginas, self._inicios)):
+            if inicio >= abajo or inicio + rect.height <= arriba:
+                continue
+            # Parte de la página dentro de la tesela, en coordenadas de la página
+            recorte = fitz.Rect(rect.x0, rect.y0 + max(0.0, arriba - inicio),
+                                rect.x1, rect.y0 + min(rect.height, abajo - inicio))
+            pix = self.doc[numero].get_pixmap(matrix=matriz, clip=recorte, alpha=False)
+            pix.set_origin(0, int(round((inicio + recorte.y0 - rect.y0 - arriba) * escala)))
+            tesela.copy(pix, pix.irect)
+        return tesela
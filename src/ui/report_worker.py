@@ -0,0 +1,134 @@
+# src/ui/report_worker.py
+# -*- coding: utf-8 -*-
+"""
+Generación del reporte PDF de la GUI en segundo plano.
+
+La ventana muestra los resultados numéricos en cuanto termina el cálculo y
+pide el reporte a GeneradorReportes, que lo arma en un hilo (figuras, .tex,
+pdflatex) y avisa de su avance con notificar(evento, valor); en la GUI,
+notificar es window.write_event_value, así los eventos llegan al bucle de
+window.read() como los de cualquier otro elemento. El valor de cada evento es
+(id, dato), con el id que devolvió generar().
+
+Sólo interesa el último diseño: generar() cancela el reporte en curso, que se
+detiene en la siguiente etapa (o mata pdflatex si está compilando) y no emite
+más eventos. El PDF se copia a su destino bajo el mismo lock que la
+cancelación, de modo que un reporte cancelado nunca pisa al siguiente.
+"""
+
+import os
+import shutil
+import sys
+import threading
+import traceback
+
+from core import cache as cache_resultados
+from ui.report_export import ReporteCancelado, compilar_pdf, generar_figuras, tipo_artefacto
+from ui.workspace import EspacioReporte
+
+EVENTO_PROGRESO = '-REPORTE-PROGRESO-'
+EVENTO_LISTO = '-REPORTE-LISTO-'
+EVENTO_ERROR = '-REPORTE-ERROR-'
+
+# Resultados que la GUI muestra antes del reporte: (etiqueta, atributo, formato, unidad)
+RESUMEN = (
+    ('D', 'D', '.2f', 'cm'),
+    ('An', 'An', '.2f', 'cm²'),
+    ('Aw', 'Aw', '.2f', 'cm²'),
+    ('N1', 'N1_fase', 'd', 'espiras'),
+    ('N2', 'N2_fase', 'd', 'espiras'),
+    ('Wc', 'Wc', '.1f', 'W'),
+    ('Wf', 'Wf', '.1f', 'W'),
+    ('Rendimiento', 'rendimiento', '.2f', '%'),
+    ('Rendimiento diario', 'rendimiento_diario', '.2f', '%'),
+)
+
+
+def resumen_diseno(diseno):
+    """Líneas 'etiqueta = valor unidad' de RESUMEN para un diseño ya calculado."""
+    lineas = []
+    for etiqueta, atributo, formato, unidad in RESUMEN:
+        valor = getattr(diseno, atributo, None)
+        texto = format(valor, formato) if valor is not None else '-'
+        lineas.append(f'{etiqueta} = {texto} {unidad}')
+    return lineas
+
+
+class GeneradorReportes:
+    """Genera en un hilo el reporte del último diseño pedido y cancela los anteriores."""
+
+    def __init__(self, notificar):
+        self._notificar = notificar
+        self._lock = threading.Lock()
+        self._id = 0
+        self._cancelado = None
+
+    def generar(self, diseno, pdf_path):
+        """
+        Cancela el reporte en curso y empieza el de 'diseno' (ya calculado), que
+        terminará en 'pdf_path'. Devuelve el id de sus eventos.
+        """
+        with self._lock:
+            if self._cancelado is not None:
+                self._cancelado.set()
+            self._id += 1
+            id_reporte, cancelado = self._id, threading.Event()
+            self._cancelado = cancelado
+        threading.Thread(target=self._trabajar, args=(id_reporte, cancelado, diseno, pdf_path),
+                         daemon=True, name=f'reporte-gui-{id_reporte}').start()
+        return id_reporte
+
+    def cancelar(self):
+        """Cancela el reporte en curso, si lo hay."""
+        with self._lock:
+            if self._cancelado is not None:
+                self._cancelado.set()
+                self._cancelado = None
+
+    def _avisar(self, cancelado, evento, id_reporte, dato):
+        if cancelado.is_set():
+            raise ReporteCancelado()
+        self._notificar(evento, (id_reporte, dato))
+
+    def _trabajar(self, id_reporte, cancelado, diseno, pdf_path):
+        try:
+            with EspacioReporte() as espacio:
+                pdf_local = self._generar(id_reporte, cancelado, diseno, espacio)
+                with self._lock:
+                    if cancelado.is_set():
+                        raise ReporteCancelado()
+                    os.makedirs(os.path.dirname(os.path.abspath(pdf_path)), exist_ok=True)
+                    shutil.copyfile(pdf_local, pdf_path)
+            self._avisar(cancelado, EVENTO_LISTO, id_reporte, pdf_path)
+        except ReporteCancelado:
+            pass
+        except Exception as e:
+            print("Error al generar el reporte:", file=sys.stderr)
+            traceback.print_exc()
+            try:
+                self._avisar(cancelado, EVENTO_ERROR, id_reporte, str(e))
+            except ReporteCancelado:
+                pass
+
+    def _generar(self, id_reporte, cancelado, diseno, espacio):
+        """Deja el PDF del reporte en el espacio de trabajo y devuelve su ruta."""
+        from ui.report_builder import generate_full_report_document  # carga PyLaTeX
+        pdf_local = espacio.ruta('reporte.pdf')
+        cache = cache_resultados.activa()
+        clave = cache_resultados.clave_diseno(diseno) if cache is not None else None
+        tipo = tipo_artefacto('pdf')
+        if cache is not None and cache.restaurar_artefactos(clave, tipo, espacio.directorio):
+            # Mismo diseño ya compilado en otra sesión: se reutiliza el PDF
+            return pdf_local
+
+        self._avisar(cancelado, EVENTO_PROGRESO, id_reporte, 'Generando gráficos...')
+        generar_figuras(diseno, espacio.directorio)
+        self._avisar(cancelado, EVENTO_PROGRESO, id_reporte, 'Armando el documento...')
+        tex_path = espacio.ruta('reporte.tex')
+        with open(tex_path, 'w', encoding='utf-8') as f:
+            f.write(generate_full_report_document(diseno, espacio=espacio).dumps())
+        self._avisar(cancelado, EVENTO_PROGRESO, id_reporte, 'Compilando el reporte...')
+        compilar_pdf(tex_path, cancelado=cancelado)
+        if cache is not None and not cancelado.is_set():
+            cache.guardar_artefactos(clave, tipo, espacio.directorio, archivos=['reporte.pdf'])
+        return pdf_local
@@ -0,0 +1,72 @@
+# src/ui/workspace.py
+# -*- coding: utf-8 -*-
+"""
+Espacio de trabajo de un reporte.
+
+Cada reporte escribe sus figuras, su .tex y los archivos de pdflatex en un
+directorio propio, y todas las rutas se construyen a partir de él: nada depende
+del directorio actual del proceso ni se cambia con os.chdir. Así varios
+reportes pueden generarse a la vez (en hilos, en un servidor asyncio, en el
+servicio de ui/report_service.py) sin pisarse.
+
+    with EspacioReporte() as espacio:            # directorio temporal propio
+        generar_figuras(diseno, espacio.directorio)
+        doc = generate_full_report_document(diseno, espacio=espacio)
+    # al salir se borra el directorio temporal
+
+Con un directorio explícito (EspacioReporte('salida/fila_3')) los archivos se
+conservan al salir.
+"""
+
+import os
+import shutil
+import tempfile
+
+
+class EspacioReporte:
+    """Directorio de trabajo de un reporte, con rutas explícitas y limpieza."""
+
+    def __init__(self, directorio=None, prefijo='trafos_reporte_'):
+        self.temporal = directorio is None
+        self.directorio = tempfile.mkdtemp(prefix=prefijo) if self.temporal else os.path.abspath(directorio)
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.limpiar()
+
+    def __repr__(self):
+        return f"EspacioReporte({self.directorio!r})"
+
+    def ruta(self, *partes):
+        """Ruta absoluta dentro del espacio; crea los directorios intermedios."""
+        ruta = os.path.join(self.directorio, *partes)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        return ruta
+
+    def subdirectorio(self, *partes):
+        """Directorio dentro del espacio (se crea si no existe)."""
+        ruta = os.path.join(self.directorio, *partes)
+        os.makedirs(ruta, exist_ok=True)
+        return ruta
+
+    def relativa(self, ruta):
+        """
+        Ruta para \\includegraphics: relativa al espacio (pdflatex compila aquí)
+        si el archivo está dentro, absoluta si no. Siempre con '/'.
+        """
+        absoluta = os.path.abspath(ruta)
+        try:
+            relativa = os.path.relpath(absoluta, self.directorio)
+        except ValueError:  # otra unidad en Windows
+            relativa = None
+        if relativa is None or relativa.startswith(os.pardir):
+            relativa = absoluta
+        return relativa.replace('\\', '/')
+
+    def limpiar(self):
+        """Borra el directorio si es temporal; un directorio explícito se conserva."""
+        if self.temporal:
+            shutil.rmtree(self.directorio, ignore_errors=True)